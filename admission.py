@@ -0,0 +1,308 @@
+"""
+Processing-time estimates and admission control for ASR jobs
+Predicts how long a recording will take from measured real-time factors and gates jobs on CPU and memory headroom
+"""
+import os
+import json
+import time
+import logging
+import threading
+from typing import Dict, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Real-time factor (processing seconds per audio second) of openai-whisper on
+# CPU with the balanced preset, used until a model has been measured here
+DEFAULT_RTF = {'tiny': 0.05, 'base': 0.1, 'small': 0.3, 'medium': 0.8, 'large': 1.6}
+BACKEND_RTF_SCALE = {'whisper': 1.0, 'faster_whisper': 0.35, 'null': 0.0}
+PRESET_RTF_SCALE = {'fast': 0.6, 'balanced': 1.0, 'accurate': 1.8}
+
+# Resident memory of loaded model weights in MB (fp32)
+MODEL_MEMORY_MB = {'tiny': 300, 'base': 500, 'small': 1000, 'medium': 2600, 'large': 5000}
+
+# Smaller models a job can be moved to when the box is saturated, largest first
+MODEL_TIERS = ['large', 'medium', 'small', 'base', 'tiny']
+
+# Only jobs expected to take longer than this are moved to a smaller model
+DOWN_TIER_MIN_SECONDS = 60.0
+
+# Weight of the newest measurement in the moving average
+RTF_SMOOTHING = 0.3
+
+
+class AdmissionError(RuntimeError):
+    """Raised when a job cannot be admitted before its wait limit"""
+
+
+def model_family(model_size: str) -> str:
+    """Size family of a model name ('large-v3' -> 'large', 'base.en' -> 'base')"""
+    for family in MODEL_TIERS:
+        if model_size.startswith(family):
+            return family
+    return model_size
+
+
+def system_load() -> Dict[str, Optional[float]]:
+    """
+    CPU load and free memory of this machine
+
+    Returns:
+        Dictionary with 'load_per_core' (1-minute load average / cores) and
+        'available_memory_mb' (None where the platform does not report them)
+    """
+    cores = os.cpu_count() or 1
+    try:
+        load_per_core = os.getloadavg()[0] / cores
+    except (AttributeError, OSError):
+        load_per_core = None
+    available_memory_mb = None
+    try:
+        with open('/proc/meminfo') as meminfo:
+            for line in meminfo:
+                if line.startswith('MemAvailable:'):
+                    available_memory_mb = int(line.split()[1]) / 1024
+                    break
+    except OSError:
+        pass
+    return {'load_per_core': load_per_core, 'available_memory_mb': available_memory_mb}
+
+
+class ProcessingEstimator:
+    """
+    Predicts processing time from measured real-time factors
+
+    Every finished job updates a moving average of its end-to-end real-time
+    factor per model/preset, persisted so estimates survive restarts.
+    """
+
+    def __init__(self, stats_path: Optional[str] = None):
+        """
+        Initialize the estimator
+
+        Args:
+            stats_path: JSON file of measured real-time factors (defaults to $RTF_STATS_PATH or 'rtf_stats.json')
+        """
+        self.stats_path = stats_path or os.getenv('RTF_STATS_PATH', 'rtf_stats.json')
+        self._lock = threading.Lock()
+        self.measured: Dict[str, Dict] = {}
+        try:
+            with open(self.stats_path) as stats_file:
+                self.measured = json.load(stats_file)
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def _key(asr_backend, preset: Optional[str]) -> str:
+        return f"{asr_backend.describe()}:{preset or 'default'}"
+
+    def default_rtf(self, asr_backend, preset: Optional[str]) -> float:
+        """Real-time factor assumed for a model that has not been measured yet"""
+        rtf = DEFAULT_RTF.get(model_family(asr_backend.model_size), DEFAULT_RTF['large'])
+        return rtf * BACKEND_RTF_SCALE.get(asr_backend.name, 1.0) * PRESET_RTF_SCALE.get(preset, 1.0)
+
+    def estimate(self, duration: Optional[float], asr_backend, preset: Optional[str] = None) -> Dict:
+        """
+        Estimate how long a recording will take to process
+
+        Args:
+            duration: Recording length in seconds (None if unknown)
+            asr_backend: Backend that will run the job
+            preset: Speed preset in use
+
+        Returns:
+            Dictionary with 'duration_seconds', 'rtf', 'rtf_source' ('measured'
+            or 'default'), 'estimated_seconds' (None if duration is unknown) and 'model'
+        """
+        measured = self.measured.get(self._key(asr_backend, preset))
+        rtf = measured['rtf'] if measured else self.default_rtf(asr_backend, preset)
+        return {
+            'duration_seconds': duration,
+            'rtf': round(rtf, 4),
+            'rtf_source': 'measured' if measured else 'default',
+            'estimated_seconds': round(duration * rtf, 1) if duration else None,
+            'model': asr_backend.describe()
+        }
+
+    def record(self, asr_backend, preset: Optional[str], duration: Optional[float], elapsed_seconds: float):
+        """
+        Fold a finished job into the measured real-time factor
+
+        Args:
+            asr_backend: Backend that ran the job
+            preset: Speed preset in use
+            duration: Recording length in seconds
+            elapsed_seconds: Wall-clock processing time
+        """
+        if not duration:
+            return
+        rtf = elapsed_seconds / duration
+        key = self._key(asr_backend, preset)
+        with self._lock:
+            previous = self.measured.get(key)
+            if previous:
+                rtf = RTF_SMOOTHING * rtf + (1 - RTF_SMOOTHING) * previous['rtf']
+            self.measured[key] = {'rtf': rtf, 'jobs': (previous or {}).get('jobs', 0) + 1}
+            try:
+                with open(self.stats_path, 'w') as stats_file:
+                    json.dump(self.measured, stats_file, indent=2)
+            except OSError as e:
+                logger.warning(f"Could not save real-time factors: {e}")
+
+
+class Admission:
+    """A granted job slot; release it when the job finishes"""
+
+    def __init__(self, controller: 'AdmissionController', model_size: str, requested_model_size: str,
+                 waited_seconds: float, reason: Optional[str]):
+        self.controller = controller
+        self.model_size = model_size
+        self.requested_model_size = requested_model_size
+        self.waited_seconds = waited_seconds
+        self.reason = reason
+        self._released = False
+
+    @property
+    def down_tiered(self) -> bool:
+        return self.model_size != self.requested_model_size
+
+    def release(self):
+        if not self._released:
+            self._released = True
+            self.controller._release()
+
+    def to_dict(self) -> Dict:
+        return {
+            'model_size': self.model_size,
+            'requested_model_size': self.requested_model_size,
+            'waited_seconds': round(self.waited_seconds, 2),
+            'reason': self.reason
+        }
+
+
+class AdmissionController:
+    """
+    CPU- and memory-aware gate in front of ASR jobs
+
+    At most `max_jobs` run at once; others queue up to `max_wait_seconds`.
+    An admitted job waits for enough free memory, and a long job on a box
+    whose load exceeds `max_load_per_core` runs on the next smaller model.
+    """
+
+    def __init__(self, max_jobs: Optional[int] = None, max_load_per_core: Optional[float] = None,
+                 job_memory_mb: Optional[float] = None, max_wait_seconds: Optional[float] = None):
+        """
+        Initialize the controller
+
+        Args:
+            max_jobs: Concurrent jobs (defaults to $ASR_MAX_JOBS or one per 4 cores)
+            max_load_per_core: Load average per core treated as saturated (defaults to $ASR_MAX_LOAD or 1.0)
+            job_memory_mb: Working memory a job needs besides the model (defaults to $ASR_JOB_MEMORY_MB or 300)
+            max_wait_seconds: How long a job may queue (defaults to $ASR_MAX_WAIT_SECONDS or 600)
+        """
+        self.max_jobs = max_jobs or int(os.getenv('ASR_MAX_JOBS', max((os.cpu_count() or 1) // 4, 1)))
+        self.max_load_per_core = max_load_per_core or float(os.getenv('ASR_MAX_LOAD', '1.0'))
+        self.job_memory_mb = job_memory_mb or float(os.getenv('ASR_JOB_MEMORY_MB', '300'))
+        self.max_wait_seconds = max_wait_seconds if max_wait_seconds is not None else float(os.getenv('ASR_MAX_WAIT_SECONDS', '600'))
+        self._slots = threading.Semaphore(self.max_jobs)
+        self._lock = threading.Lock()
+        self.active = 0
+        self.queued = 0
+
+    def get_status(self) -> Dict:
+        """Running and queued jobs plus current machine load"""
+        return {'active': self.active, 'queued': self.queued, 'max_jobs': self.max_jobs, **system_load()}
+
+    def admit(self, model_size: str, estimated_seconds: Optional[float] = None,
+              loaded_models=()) -> Admission:
+        """
+        Wait for a job slot and pick the model the job should run on
+
+        Args:
+            model_size: Model the job asked for
+            estimated_seconds: Predicted processing time on that model
+            loaded_models: Size families already in memory (they need no extra memory)
+
+        Returns:
+            Admission to release when the job finishes
+
+        Raises:
+            AdmissionError: If no slot or memory frees up within the wait limit
+        """
+        started = time.perf_counter()
+        deadline = started + self.max_wait_seconds
+        with self._lock:
+            self.queued += 1
+        try:
+            if not self._slots.acquire(timeout=self.max_wait_seconds):
+                raise AdmissionError(
+                    f"Transcription queue is full ({self.active} jobs running); please try again later"
+                )
+        finally:
+            with self._lock:
+                self.queued -= 1
+        with self._lock:
+            self.active += 1
+        admission = Admission(self, model_size, model_size, 0.0, None)
+
+        family = model_family(model_size)
+        try:
+            # Wait until this job's working memory (and model, if not loaded) fits
+            while True:
+                load = system_load()
+                needed = self.job_memory_mb
+                if family not in loaded_models:
+                    needed += MODEL_MEMORY_MB.get(family, 0)
+                if load['available_memory_mb'] is None or load['available_memory_mb'] >= needed:
+                    break
+                if time.perf_counter() >= deadline:
+                    raise AdmissionError(
+                        f"Not enough free memory for transcription ({load['available_memory_mb']:.0f} MB free, "
+                        f"{needed:.0f} MB needed); please try again later"
+                    )
+                time.sleep(1.0)
+
+            saturated = load['load_per_core'] is not None and load['load_per_core'] > self.max_load_per_core
+            if saturated and (estimated_seconds or 0) > DOWN_TIER_MIN_SECONDS and family in MODEL_TIERS[:-1]:
+                smaller = MODEL_TIERS[MODEL_TIERS.index(family) + 1]
+                if smaller in loaded_models or (load['available_memory_mb'] or 0) >= needed + MODEL_MEMORY_MB[smaller]:
+                    admission.model_size = smaller
+                    admission.reason = f"CPU saturated (load {load['load_per_core']:.2f}/core)"
+                    logger.info(f"Down-tiering job from {model_size} to {smaller}: {admission.reason}")
+        except Exception:
+            admission.release()
+            raise
+
+        admission.waited_seconds = time.perf_counter() - started
+        return admission
+
+    def _release(self):
+        with self._lock:
+            self.active -= 1
+        self._slots.release()
+
+
+# Global admission controller and estimator, created on first use
+_admission_controller: Optional[AdmissionController] = None
+_processing_estimator: Optional[ProcessingEstimator] = None
+# Concurrent first calls must share one controller (and so one set of slots)
+_globals_lock = threading.Lock()
+
+
+def get_admission_controller() -> AdmissionController:
+    """Get the global admission controller"""
+    global _admission_controller
+    with _globals_lock:
+        if _admission_controller is None:
+            _admission_controller = AdmissionController()
+        return _admission_controller
+
+
+def get_processing_estimator() -> ProcessingEstimator:
+    """Get the global processing-time estimator"""
+    global _processing_estimator
+    with _globals_lock:
+        if _processing_estimator is None:
+            _processing_estimator = ProcessingEstimator()
+        return _processing_estimator
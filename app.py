@@ -3,6 +3,7 @@ AI-Driven Meeting Summarizer - Main Streamlit Application
 Complete solution for meeting transcription, summarization, and task management
 """
 import os
+import re
 import tempfile
 import logging
 from datetime import datetime
@@ -11,22 +12,28 @@ import streamlit as st
 import pandas as pd
 from dotenv import load_dotenv
 
+# Load environment variables before the modules below read their settings
+load_dotenv()
+
 # Import our modules
 from db import get_db_manager
 from transcript_loader import get_transcript_loader
+from asr_backends import SPEED_PRESETS
+from admission import AdmissionError, get_admission_controller
 from ollama_nlp import get_ollama_processor
 from task_manager import get_task_manager
 from exports import get_export_manager
 
-# Load environment variables
-load_dotenv()
-
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Display names of the storage backends
+STORAGE_LABELS = {'mongo': 'MongoDB', 'sqlite': 'SQLite'}
+
 # Initialize database connection
 db_manager = get_db_manager()
+storage_label = STORAGE_LABELS.get(db_manager.name, db_manager.name)
 try:
     db_manager.connect()
     st.session_state.db_connected = True
@@ -118,15 +125,14 @@ def check_system_status():
         'whisper': False
     }
     
-    # Check MongoDB connection status
+    # Check database connection status
     if st.session_state.get('db_connected', False):
-        try:
-            db_manager.get_database_stats()
+        if db_manager.ping():
             status['mongodb'] = True
-        except Exception as e:
-            st.error(f"MongoDB connection failed: {e}")
+        else:
+            st.error(f"{storage_label} connection failed: database did not answer")
     else:
-        st.error(f"MongoDB connection failed: {st.session_state.get('db_error', 'Unknown error')}")
+        st.error(f"{storage_label} connection failed: {st.session_state.get('db_error', 'Unknown error')}")
     
     try:
         # Check Ollama
@@ -160,6 +166,16 @@ def upload_page():
         # Display file info
         st.info(f"📄 **File:** {uploaded_file.name} ({uploaded_file.size:,} bytes)")
         
+        # Predicted processing time and current queue for audio/video
+        estimate = get_transcript_loader().estimate_streamlit_upload(uploaded_file)
+        if estimate and estimate['estimated_seconds'] is not None:
+            queue = get_admission_controller().get_status()
+            st.caption(
+                f"⏱️ Estimated processing time: ~{max(estimate['estimated_seconds'], 1):.0f}s "
+                f"for {estimate['duration_seconds'] / 60:.1f} min of audio "
+                f"({queue['active']}/{queue['max_jobs']} jobs running, {queue['queued']} queued)"
+            )
+        
         # Meeting title input
         meeting_title = st.text_input(
             "Meeting Title (Optional)",
@@ -179,7 +195,10 @@ def upload_page():
                 with st.spinner("Processing file..."):
                     # Load transcript
                     transcript_loader = get_transcript_loader()
-                    transcript_data = transcript_loader.process_streamlit_upload(uploaded_file)
+                    
+                    # Keep the original so it can be reprocessed with a better model later
+                    media_id = transcript_loader.store_streamlit_upload(uploaded_file)
+                    transcript_data = transcript_loader.process_stored_media(media_id)
                     
                     # Save transcript to database
                     db_manager = get_db_manager()
@@ -189,18 +208,35 @@ def upload_page():
                         'file_type': transcript_data['file_type'],
                         'processing_method': transcript_data['processing_method'],
                         'text': transcript_data['text'],
-                        'meeting_title': meeting_title or uploaded_file.name
+                        'meeting_title': meeting_title or uploaded_file.name,
+                        'language': transcript_data.get('language'),
+                        'media_id': media_id,
+                        'media_store': transcript_data['media_store']
                     })
                     
+                    # Keep ASR timings so they never have to be re-derived
+                    segment_store = transcript_data.get('segment_store')
+                    if segment_store is not None and segment_store.has_timing:
+                        db_manager.save_transcript_segments(transcript_id, segment_store)
+                    
                     st.session_state.uploaded_file_info = {
                         'transcript_id': transcript_id,
                         'meeting_title': meeting_title or uploaded_file.name,
-                        'text': transcript_data['text']
+                        'text': transcript_data['text'],
+                        'segment_store': transcript_data.get('segment_store'),
+                        'vad': transcript_data.get('vad')
                     }
                     
+                    admission = transcript_data.get('admission')
+                    if admission and admission['model_size'] != admission['requested_model_size']:
+                        st.info(f"ℹ️ Server busy: transcribed with the {admission['model_size']} model")
+                    
                     st.success("✅ File processed successfully!")
                     st.session_state.processing_status = 'completed'
                     
+            except AdmissionError as e:
+                st.warning(f"⏳ {e}")
+                st.session_state.processing_status = 'error'
             except Exception as e:
                 st.error(f"❌ Error processing file: {e}")
                 st.session_state.processing_status = 'error'
@@ -212,11 +248,20 @@ def upload_page():
         st.write(f"📝 **Meeting:** {st.session_state.uploaded_file_info['meeting_title']}")
         st.write(f"📊 **Text Length:** {len(st.session_state.uploaded_file_info['text']):,} characters")
         st.write(f"🆔 **Transcript ID:** {st.session_state.uploaded_file_info['transcript_id']}")
+        vad_report = st.session_state.uploaded_file_info.get('vad')
+        if vad_report:
+            st.write(f"🔇 **Silence Skipped:** {vad_report['skipped_seconds']:.0f}s of {vad_report['original_seconds']:.0f}s (~{vad_report['estimated_seconds_saved']:.0f}s faster)")
         st.markdown('</div>', unsafe_allow_html=True)
         
         # Show preview of transcript
         with st.expander("📖 Preview Transcript"):
-            preview_text = st.session_state.uploaded_file_info['text'][:1000]
+            segment_store = st.session_state.uploaded_file_info.get('segment_store')
+            if segment_store is not None and len(segment_store) > 0:
+                # Cut the preview at a speaker-turn boundary
+                preview_text = segment_store.preview(1000)
+                st.caption(f"{len(segment_store):,} segments · {len(segment_store.speakers)} speakers")
+            else:
+                preview_text = st.session_state.uploaded_file_info['text'][:1000]
             st.text(preview_text)
             if len(st.session_state.uploaded_file_info['text']) > 1000:
                 st.write("... (truncated)")
@@ -333,7 +378,7 @@ def tasks_page():
     with col3:
         assignee_filter = st.selectbox(
             "Filter by Assignee",
-            ["All", "TBD"] + list(set([task['assignee'] for task in task_manager.get_tasks() if task['assignee'] != 'TBD']))
+            ["All", "TBD"] + [row['assignee'] for row in task_manager.get_assignee_workload() if row['assignee'] != 'TBD']
         )
     
     # Apply filters
@@ -345,8 +390,14 @@ def tasks_page():
     if assignee_filter != "All":
         filters['assignee'] = assignee_filter
     
+    # Keyset pagination: tokens of the pages visited so far, reset when filters change
+    if st.session_state.get('task_page_filters') != filters:
+        st.session_state.task_page_filters = filters
+        st.session_state.task_page_tokens = [None]
+    
     # Get tasks
-    tasks = task_manager.get_tasks(filters)
+    page = task_manager.get_tasks_page(filters, page_token=st.session_state.task_page_tokens[-1])
+    tasks = page['items']
     
     if not tasks:
         st.info("No tasks found with the current filters.")
@@ -405,6 +456,85 @@ def tasks_page():
                 st.rerun()
         
         st.markdown('</div>', unsafe_allow_html=True)
+    
+    # Page navigation
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if len(st.session_state.task_page_tokens) > 1 and st.button("⬅️ Previous"):
+            st.session_state.task_page_tokens.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"Page {len(st.session_state.task_page_tokens)}")
+    with col3:
+        if page['next_page_token'] and st.button("Next ➡️"):
+            st.session_state.task_page_tokens.append(page['next_page_token'])
+            st.rerun()
+
+# Characters Markdown would interpret in search snippets
+MARKDOWN_SPECIAL = re.compile(r'([\\`*_\[\]<>#|~$])')
+
+def escape_markdown(text: str) -> str:
+    """Escape characters Markdown would interpret"""
+    return MARKDOWN_SPECIAL.sub(r'\\\1', text)
+
+def highlighted_markdown(snippet: str, highlights: List) -> str:
+    """Markdown for a search snippet with its matched words in bold"""
+    parts, position = [], 0
+    for start, end in highlights:
+        parts.append(escape_markdown(snippet[position:start]))
+        parts.append(f"**{escape_markdown(snippet[start:end])}**")
+        position = end
+    parts.append(escape_markdown(snippet[position:]))
+    return ''.join(parts)
+
+def search_page():
+    """Full-text search across transcripts, summaries and tasks"""
+    st.markdown('<div class="section-header">🔎 Search</div>', unsafe_allow_html=True)
+    
+    db_manager = get_db_manager()
+    
+    col1, col2 = st.columns([3, 1])
+    with col1:
+        query = st.text_input("Search meetings", placeholder="e.g. payment API deadline")
+    with col2:
+        kind_labels = {"Transcripts": 'transcript', "Summaries": 'summary', "Tasks": 'task'}
+        kinds = st.multiselect("In", list(kind_labels), default=list(kind_labels))
+    
+    if not query.strip() or not kinds:
+        st.info("Enter words to search for in transcripts, summaries and tasks.")
+        return
+    
+    # Ranked pages: tokens of the pages visited so far, reset when the search changes
+    search_key = (query, tuple(kinds))
+    if st.session_state.get('search_key') != search_key:
+        st.session_state.search_key = search_key
+        st.session_state.search_page_tokens = [None]
+    
+    page = db_manager.search(query, [kind_labels[kind] for kind in kinds],
+                             page_token=st.session_state.search_page_tokens[-1])
+    if not page['items']:
+        st.info("No matches found.")
+        return
+    
+    kind_icons = {'transcript': '📄', 'summary': '🤖', 'task': '📝'}
+    for hit in page['items']:
+        created_at = hit['created_at'].strftime('%Y-%m-%d %H:%M') if hit.get('created_at') else ''
+        st.write(f"{kind_icons[hit['kind']]} **{hit['title'] or 'Untitled'}** | {hit['kind'].title()} | 📅 {created_at}")
+        st.markdown(highlighted_markdown(hit['snippet'], hit['highlights']))
+        st.caption(f"🆔 {hit['id']}")
+    
+    # Page navigation
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        if len(st.session_state.search_page_tokens) > 1 and st.button("⬅️ Previous"):
+            st.session_state.search_page_tokens.pop()
+            st.rerun()
+    with col2:
+        st.caption(f"Page {len(st.session_state.search_page_tokens)}")
+    with col3:
+        if page['next_page_token'] and st.button("Next ➡️"):
+            st.session_state.search_page_tokens.append(page['next_page_token'])
+            st.rerun()
 
 def export_page():
     """Export page for downloading results"""
@@ -529,7 +659,7 @@ def dashboard_page():
     
     col1, col2, col3 = st.columns(3)
     with col1:
-        st.metric("MongoDB", "✅ Connected" if status['mongodb'] else "❌ Disconnected")
+        st.metric(storage_label, "✅ Connected" if status['mongodb'] else "❌ Disconnected")
     with col2:
         st.metric("Ollama", "✅ Connected" if status['ollama'] else "❌ Disconnected")
     with col3:
@@ -552,11 +682,33 @@ def dashboard_page():
             st.metric("Pending Tasks", db_stats['pending_tasks'])
         with col5:
             st.metric("Completed Tasks", db_stats['completed_tasks'])
+        
+        pool = db_manager.get_pool_metrics()
+        if pool:
+            st.caption(
+                f"🔌 Connection pool: {pool['checked_out']} in use, checkout wait "
+                f"p50 {pool['wait_p50_ms']:.1f} ms / p95 {pool['wait_p95_ms']:.1f} ms, "
+                f"{pool['checkout_failures']} timeouts"
+            )
+        cache = db_manager.get_cache_stats()
+        st.caption(
+            f"🗃️ Document cache: {cache['hit_rate']:.0%} hit rate "
+            f"({cache['hits']} hits, {cache['misses']} misses), {cache['entries']} entries"
+        )
+        
+        workload = db_manager.get_assignee_workload(operation='dashboard')
+        if workload:
+            st.write("**👥 Workload by Assignee**")
+            st.dataframe(
+                pd.DataFrame(workload, columns=['assignee', 'pending', 'in_progress', 'completed', 'total']),
+                use_container_width=True,
+                hide_index=True
+            )
     
     # Recent meetings
     if status['mongodb']:
         st.write("**📅 Recent Meetings**")
-        recent_meetings = db_manager.get_recent_meetings(5)
+        recent_meetings = db_manager.get_recent_meetings(5, operation='dashboard')
         
         if recent_meetings:
             for meeting in recent_meetings:
@@ -589,7 +741,7 @@ def main():
     st.sidebar.title("🧭 Navigation")
     page = st.sidebar.selectbox(
         "Choose a page",
-        ["📁 Upload", "🤖 Summary", "📋 Tasks", "📤 Export", "📊 Dashboard"]
+        ["📁 Upload", "🤖 Summary", "📋 Tasks", "🔎 Search", "📤 Export", "📊 Dashboard"]
     )
     
     # Sidebar info
@@ -603,15 +755,27 @@ def main():
     - **Streamlit** for the interface
     """)
     
+    # Transcription speed preset (shared by every session on this server)
+    st.sidebar.markdown("---")
+    transcript_loader = get_transcript_loader()
+    presets = list(SPEED_PRESETS)
+    speed_preset = st.sidebar.selectbox(
+        "⚡ Transcription speed",
+        presets,
+        index=presets.index(transcript_loader.speed_preset)
+    )
+    if speed_preset != transcript_loader.speed_preset:
+        transcript_loader.set_speed_preset(speed_preset)
+    
     # Sidebar system status
     st.sidebar.markdown("---")
     st.sidebar.markdown("**🔧 System Status**")
     status = check_system_status()
     
     if status['mongodb']:
-        st.sidebar.success("✅ MongoDB Connected")
+        st.sidebar.success(f"✅ {storage_label} Connected")
     else:
-        st.sidebar.error("❌ MongoDB Disconnected")
+        st.sidebar.error(f"❌ {storage_label} Disconnected")
     
     if status['ollama']:
         st.sidebar.success("✅ Ollama Connected")
@@ -630,6 +794,8 @@ def main():
         summary_page()
     elif page == "📋 Tasks":
         tasks_page()
+    elif page == "🔎 Search":
+        search_page()
     elif page == "📤 Export":
         export_page()
     elif page == "📊 Dashboard":
@@ -0,0 +1,417 @@
+"""
+Pluggable speech-to-text backends for the transcript loader
+Supports openai-whisper (PyTorch), faster-whisper (CTranslate2, int8 on CPU) and a null backend for tests
+"""
+import os
+import logging
+from typing import Dict, List, Optional, Union
+
+import numpy as np
+
+try:
+    import whisper
+except ImportError:  # pragma: no cover - optional at import time
+    whisper = None
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:  # pragma: no cover - optional dependency
+    WhisperModel = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Sample rate every backend expects for in-memory PCM input
+SAMPLE_RATE = 16000
+
+# Whisper decodes fixed 30-second windows; timestamp tokens step by 20 ms
+WINDOW_SECONDS = 30
+TIMESTAMP_STEP = 0.02
+
+# Named CPU speed/accuracy trade-offs. 'precision' needs a model reload; the
+# decode options are passed to every transcribe call. threads=0 keeps the
+# backend's default (one per physical core) unless $ASR_THREADS is set.
+SPEED_PRESETS = {
+    'fast': {
+        'threads': 0,
+        'precision': 'int8',
+        'beam_size': 1,
+        'best_of': 1,
+        'temperature': (0.0,),
+        'condition_on_previous_text': False
+    },
+    'balanced': {
+        'threads': 0,
+        'precision': 'int8',
+        'beam_size': 3,
+        'best_of': 3,
+        'temperature': (0.0, 0.4, 0.8),
+        'condition_on_previous_text': True
+    },
+    'accurate': {
+        'threads': 0,
+        'precision': 'fp32',
+        'beam_size': 5,
+        'best_of': 5,
+        'temperature': (0.0, 0.2, 0.4, 0.6, 0.8, 1.0),
+        'condition_on_previous_text': True
+    }
+}
+DEFAULT_PRESET = 'balanced'
+
+
+class ASRBackend:
+    """
+    Base class for speech recognition backends
+
+    Backends accept either a path to an audio file or mono float32 PCM at
+    16 kHz, and return a dictionary with 'text', 'segments' (each with
+    'start', 'end' and 'text') and 'language'.
+    """
+
+    name = 'base'
+
+    def __init__(self, model_size: str = "base"):
+        """
+        Initialize the backend without loading weights
+
+        Args:
+            model_size: Model size name (tiny, base, small, medium, large-v3, ...)
+        """
+        self.model_size = model_size
+        self.model = None
+        self.preset = None
+        self.precision = 'fp32'
+        self.threads = 0
+        self.decode_options: Dict = {}
+
+    def apply_preset(self, preset: str, threads: Optional[int] = None):
+        """
+        Apply a named speed preset
+
+        Call before load(); a different precision only takes effect on the next load.
+
+        Args:
+            preset: 'fast', 'balanced' or 'accurate'
+            threads: Intra-op thread count overriding the preset (0 = backend default)
+        """
+        if preset not in SPEED_PRESETS:
+            raise ValueError(f"Unknown speed preset: {preset}. Available: {', '.join(SPEED_PRESETS)}")
+        settings = dict(SPEED_PRESETS[preset])
+        self.preset = preset
+        self.precision = settings.pop('precision')
+        preset_threads = settings.pop('threads')
+        self.threads = threads if threads is not None else int(os.getenv('ASR_THREADS', preset_threads))
+        self.decode_options = settings
+
+    @property
+    def is_loaded(self) -> bool:
+        """True once the model weights are in memory"""
+        return self.model is not None
+
+    def load(self):
+        """Load model weights"""
+        raise NotImplementedError
+
+    def transcribe(self, audio: Union[str, np.ndarray], language: Optional[str] = None, **options) -> Dict:
+        """
+        Transcribe audio
+
+        Args:
+            audio: Path to an audio file or 16 kHz mono float32 PCM
+            language: Optional language code; detected automatically when None
+            **options: Backend-specific decoding options
+
+        Returns:
+            Dictionary with 'text', 'segments' and 'language'
+        """
+        raise NotImplementedError
+
+    def transcribe_batch(self, windows: List[np.ndarray], language: Optional[str] = None) -> List[Dict]:
+        """
+        Transcribe several independent windows of at most 30 seconds
+
+        The default runs them one after another; backends that can decode a
+        batch in a single forward pass override this.
+
+        Args:
+            windows: 16 kHz mono float32 PCM windows
+            language: Optional language code shared by all windows
+
+        Returns:
+            One result dictionary per window, with segment times relative to the window
+        """
+        return [self.transcribe(window, language=language) for window in windows]
+
+    def detect_language(self, audio: np.ndarray) -> str:
+        """
+        Detect the spoken language of a short PCM sample
+
+        Args:
+            audio: 16 kHz mono float32 PCM (only the first 30 seconds are used)
+
+        Returns:
+            Language code such as 'en'
+        """
+        raise NotImplementedError
+
+    def describe(self) -> str:
+        """Human-readable backend/model label"""
+        return f"{self.name}:{self.model_size}:{self.precision}"
+
+
+class WhisperBackend(ASRBackend):
+    """openai-whisper running on PyTorch"""
+
+    name = 'whisper'
+
+    def load(self):
+        if whisper is None:
+            raise RuntimeError("openai-whisper is not installed. Run: pip install openai-whisper")
+        model = whisper.load_model(self.model_size)
+        if self.precision == 'int8' and model.device.type == 'cpu':
+            model = self._quantize_int8(model)
+        self.model = model
+        logger.info(f"Loaded Whisper model: {self.model_size} ({self.precision})")
+
+    @staticmethod
+    def _quantize_int8(model):
+        """Dynamic int8 quantization of every linear layer (CPU only)"""
+        import torch
+        for module in model.modules():
+            # Whisper's Linear only adds a dtype cast, which is a no-op in fp32
+            if isinstance(module, torch.nn.Linear):
+                module.__class__ = torch.nn.Linear
+        return torch.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+    def _set_threads(self):
+        if self.threads:
+            import torch
+            torch.set_num_threads(self.threads)
+
+    def transcribe(self, audio, language: Optional[str] = None, **options) -> Dict:
+        if not self.is_loaded:
+            self.load()
+        self._set_threads()
+        options = {**self.decode_options, **options}
+        if options.get('beam_size') == 1:
+            # A single beam is greedy decoding, which Whisper runs faster without a beam decoder
+            options['beam_size'] = None
+        # Avoid the FP16-on-CPU warning on every call
+        options.setdefault('fp16', self.model.device.type == 'cuda')
+        if language:
+            options['language'] = language
+        result = self.model.transcribe(audio, **options)
+        return {
+            'text': result['text'],
+            'segments': result.get('segments', []),
+            'language': result.get('language', language or 'unknown')
+        }
+
+    def transcribe_batch(self, windows, language: Optional[str] = None) -> List[Dict]:
+        if not self.is_loaded:
+            self.load()
+        import torch
+        mel = torch.stack([
+            whisper.log_mel_spectrogram(whisper.pad_or_trim(torch.from_numpy(window)), n_mels=self.model.dims.n_mels)
+            for window in windows
+        ]).to(self.model.device)
+        self._set_threads()
+        beam_size = self.decode_options.get('beam_size')
+        options = whisper.DecodingOptions(
+            language=language,
+            beam_size=beam_size if beam_size and beam_size > 1 else None,
+            fp16=self.model.device.type == 'cuda'
+        )
+        # One encoder and decoder pass for the whole batch
+        decoded = whisper.decode(self.model, mel, options)
+        tokenizer = whisper.tokenizer.get_tokenizer(
+            self.model.is_multilingual, num_languages=getattr(self.model, 'num_languages', 99), task='transcribe'
+        )
+        results = []
+        for window, result in zip(windows, decoded):
+            # Same silence rule as whisper.transcribe
+            if result.no_speech_prob > 0.6 and result.avg_logprob < -1.0:
+                segments = []
+            else:
+                segments = self._segments_from_tokens(result.tokens, tokenizer, len(window) / SAMPLE_RATE)
+            results.append({
+                'text': ''.join(segment['text'] for segment in segments),
+                'segments': segments,
+                'language': result.language
+            })
+        return results
+
+    @staticmethod
+    def _segments_from_tokens(tokens: List[int], tokenizer, duration: float) -> List[Dict]:
+        """Split decoded tokens into segments at timestamp token pairs"""
+        segments = []
+        start = None
+        text_tokens = []
+        for token in tokens:
+            if token < tokenizer.timestamp_begin:
+                text_tokens.append(token)
+                continue
+            timestamp = min((token - tokenizer.timestamp_begin) * TIMESTAMP_STEP, duration)
+            if start is None:
+                start = timestamp
+                continue
+            if text_tokens:
+                segments.append({'id': len(segments), 'start': start, 'end': timestamp, 'text': tokenizer.decode(text_tokens)})
+            start = None
+            text_tokens = []
+        if text_tokens:
+            segments.append({'id': len(segments), 'start': start or 0.0, 'end': duration, 'text': tokenizer.decode(text_tokens)})
+        return segments
+
+    def detect_language(self, audio) -> str:
+        if not self.is_loaded:
+            self.load()
+        # One encoder pass over a single 30-second mel window
+        sample = whisper.pad_or_trim(audio)
+        mel = whisper.log_mel_spectrogram(sample, n_mels=self.model.dims.n_mels).to(self.model.device)
+        _, probs = self.model.detect_language(mel)
+        return max(probs, key=probs.get)
+
+
+class FasterWhisperBackend(ASRBackend):
+    """faster-whisper (CTranslate2) backend, int8-quantized on CPU by default"""
+
+    name = 'faster_whisper'
+
+    def __init__(self, model_size: str = "base", device: str = "cpu",
+                 compute_type: str = "int8", cpu_threads: int = 0):
+        """
+        Initialize the backend without loading weights
+
+        Args:
+            model_size: Model size name
+            device: 'cpu' or 'cuda'
+            compute_type: CTranslate2 compute type ('int8', 'int8_float32', 'float32', ...)
+            cpu_threads: Intra-op threads (0 lets CTranslate2 decide)
+        """
+        super().__init__(model_size)
+        self.device = device
+        self.compute_type = compute_type
+        self.cpu_threads = cpu_threads
+        self.precision = 'int8' if compute_type.startswith('int8') else 'fp32'
+
+    def apply_preset(self, preset: str, threads: Optional[int] = None):
+        super().apply_preset(preset, threads)
+        self.compute_type = 'int8' if self.precision == 'int8' else 'float32'
+        self.cpu_threads = self.threads
+
+    def load(self):
+        if WhisperModel is None:
+            raise RuntimeError("faster-whisper is not installed. Run: pip install faster-whisper")
+        self.model = WhisperModel(
+            self.model_size,
+            device=self.device,
+            compute_type=self.compute_type,
+            cpu_threads=self.cpu_threads
+        )
+        logger.info(f"Loaded faster-whisper model: {self.model_size} ({self.compute_type})")
+
+    def transcribe(self, audio, language: Optional[str] = None, **options) -> Dict:
+        if not self.is_loaded:
+            self.load()
+        options = {**self.decode_options, **options}
+        segments_iter, info = self.model.transcribe(audio, language=language, **options)
+        segments = [
+            {'id': index, 'start': segment.start, 'end': segment.end, 'text': segment.text}
+            for index, segment in enumerate(segments_iter)
+        ]
+        return {
+            'text': ''.join(segment['text'] for segment in segments),
+            'segments': segments,
+            'language': info.language
+        }
+
+    def detect_language(self, audio) -> str:
+        if not self.is_loaded:
+            self.load()
+        # Segments are generated lazily, so only language detection runs here
+        _, info = self.model.transcribe(audio[:SAMPLE_RATE * 30])
+        return info.language
+
+    def describe(self) -> str:
+        return f"{self.name}:{self.model_size}:{self.compute_type}"
+
+
+class NullBackend(ASRBackend):
+    """
+    Deterministic backend for tests and pipeline benchmarks
+
+    Returns scripted segments (or one placeholder segment per window) without
+    loading any model, so the surrounding pipeline can run offline.
+    """
+
+    name = 'null'
+
+    def __init__(self, model_size: str = "none", segments: Optional[List[Dict]] = None,
+                 language: str = "en", window_seconds: float = 30.0):
+        """
+        Initialize the null backend
+
+        Args:
+            model_size: Ignored, kept for interface compatibility
+            segments: Optional scripted segments returned for every call
+            language: Language reported in results
+            window_seconds: Placeholder segment length when no script is given
+        """
+        super().__init__(model_size)
+        self.segments = segments
+        self.language = language
+        self.window_seconds = window_seconds
+        self.calls = 0
+
+    def load(self):
+        self.model = object()
+
+    def transcribe(self, audio, language: Optional[str] = None, **options) -> Dict:
+        self.calls += 1
+        if self.segments is not None:
+            segments = [dict(segment) for segment in self.segments]
+        else:
+            duration = len(audio) / SAMPLE_RATE if hasattr(audio, '__len__') and not isinstance(audio, str) else self.window_seconds
+            segments = []
+            start = 0.0
+            while start < duration:
+                end = min(start + self.window_seconds, duration)
+                segments.append({'id': len(segments), 'start': start, 'end': end, 'text': f" [speech {start:.0f}-{end:.0f}s]"})
+                start = end
+        return {
+            'text': ''.join(segment['text'] for segment in segments),
+            'segments': segments,
+            'language': language or self.language
+        }
+
+    def detect_language(self, audio) -> str:
+        return self.language
+
+
+# Registry of available backends by name
+ASR_BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend,
+    NullBackend.name: NullBackend
+}
+
+
+def get_asr_backend(name: Optional[str] = None, model_size: str = "base", **kwargs) -> ASRBackend:
+    """
+    Create an ASR backend by name
+
+    Args:
+        name: Backend name ('whisper', 'faster_whisper', 'null'); defaults to $ASR_BACKEND or 'whisper'
+        model_size: Model size to load
+        **kwargs: Backend-specific constructor arguments
+
+    Returns:
+        ASRBackend instance (weights not yet loaded)
+    """
+    name = name or os.getenv('ASR_BACKEND', WhisperBackend.name)
+    if name not in ASR_BACKENDS:
+        raise ValueError(f"Unknown ASR backend: {name}. Available: {', '.join(ASR_BACKENDS)}")
+    return ASR_BACKENDS[name](model_size, **kwargs)
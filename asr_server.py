@@ -0,0 +1,186 @@
+"""
+In-process batched ASR inference server
+Collects 30-second windows from concurrent transcription jobs into shared batched forward passes
+"""
+import os
+import time
+import queue
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from asr_backends import ASRBackend, SAMPLE_RATE, WINDOW_SECONDS
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class BatchedASRServer:
+    """
+    Micro-batching front end for one ASR backend
+
+    Jobs submit windows from any thread; a single inference thread waits up
+    to `max_wait_ms` for more windows with the same language, runs them as
+    one batch and resolves each window's future. Jobs never call the backend
+    themselves, and each batch holds the inference lock, so the model is never
+    used from two threads at once.
+    """
+
+    def __init__(self, asr_backend: ASRBackend, max_batch_size: Optional[int] = None,
+                 max_wait_ms: Optional[float] = None, inference_lock: Optional[threading.Lock] = None):
+        """
+        Initialize the server
+
+        Args:
+            asr_backend: Loaded backend used for every batch
+            max_batch_size: Windows per forward pass (defaults to $ASR_BATCH_SIZE or 8)
+            max_wait_ms: How long to wait for a batch to fill (defaults to $ASR_BATCH_WAIT_MS or 50)
+            inference_lock: Lock held around each batch, shared with other direct users of the model
+        """
+        self.asr_backend = asr_backend
+        self.max_batch_size = max_batch_size or int(os.getenv('ASR_BATCH_SIZE', '8'))
+        self.max_wait = (max_wait_ms if max_wait_ms is not None else float(os.getenv('ASR_BATCH_WAIT_MS', '50'))) / 1000
+        self._inference_lock = inference_lock or threading.Lock()
+        self._queue = queue.Queue()
+        # Windows taken off the queue that did not match the language of the batch being built
+        self._deferred = deque()
+        self._thread = None
+        self._running = False
+        self._start_lock = threading.Lock()
+        self.batches = 0
+        self.windows = 0
+        self.busy_seconds = 0.0
+
+    def start(self):
+        """Start the inference thread"""
+        with self._start_lock:
+            if self._running:
+                return
+            self._running = True
+            self._thread = threading.Thread(target=self._run, name='asr-batcher', daemon=True)
+            self._thread.start()
+
+    def stop(self):
+        """Stop the inference thread after the current batch"""
+        if not self._running:
+            return
+        self._running = False
+        self._queue.put(None)
+        self._thread.join()
+
+    def submit_window(self, window: np.ndarray, language: Optional[str] = None) -> Future:
+        """
+        Queue one window of at most 30 seconds
+
+        Args:
+            window: 16 kHz mono float32 PCM
+            language: Optional language code to pin
+
+        Returns:
+            Future resolving to the backend's result for the window
+        """
+        if not self._running:
+            self.start()
+        future = Future()
+        self._queue.put((window, language, future))
+        return future
+
+    def transcribe(self, audio: np.ndarray, language: Optional[str] = None) -> Dict:
+        """
+        Transcribe PCM of any length through the shared batches
+
+        The audio is cut into 30-second windows that are decoded
+        independently, so windows from other jobs can fill the same batch.
+
+        Args:
+            audio: 16 kHz mono float32 PCM
+            language: Optional language code to pin
+
+        Returns:
+            Dictionary with 'text', 'segments' and 'language'
+        """
+        window_length = WINDOW_SECONDS * SAMPLE_RATE
+        futures = [
+            (start / SAMPLE_RATE, self.submit_window(audio[start:start + window_length], language))
+            for start in range(0, len(audio), window_length)
+        ]
+        segments = []
+        text_parts = []
+        detected = language
+        for offset, future in futures:
+            result = future.result()
+            detected = detected or result.get('language')
+            for segment in result['segments']:
+                segments.append({**segment, 'id': len(segments), 'start': segment['start'] + offset, 'end': segment['end'] + offset})
+            text_parts.append(result['text'])
+        return {'text': ''.join(text_parts), 'segments': segments, 'language': detected or 'unknown'}
+
+    def _next_item(self, timeout: Optional[float]):
+        """Next queued window, deferred ones first"""
+        if self._deferred:
+            return self._deferred.popleft()
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def _collect_batch(self) -> List:
+        """Block for one window, then gather more with the same language until full or timed out"""
+        first = self._next_item(timeout=None)
+        if first is None:
+            return []
+        batch = [first]
+        language = first[1]
+        skipped = []
+        deadline = time.perf_counter() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.perf_counter()
+            if remaining <= 0 and not self._deferred:
+                break
+            item = self._next_item(timeout=max(remaining, 0))
+            if item is None:
+                if not self._running:
+                    break
+                continue
+            if item[1] == language:
+                batch.append(item)
+            else:
+                skipped.append(item)
+        self._deferred.extendleft(reversed(skipped))
+        return batch
+
+    def _run(self):
+        """Inference loop"""
+        while self._running or self._deferred:
+            batch = self._collect_batch()
+            if not batch:
+                continue
+            windows = [window for window, _, _ in batch]
+            started = time.perf_counter()
+            try:
+                with self._inference_lock:
+                    results = self.asr_backend.transcribe_batch(windows, language=batch[0][1])
+            except Exception as e:
+                logger.error(f"Batched transcription failed: {e}")
+                for _, _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.busy_seconds += time.perf_counter() - started
+            self.batches += 1
+            self.windows += len(batch)
+            for (_, _, future), result in zip(batch, results):
+                future.set_result(result)
+
+    def get_stats(self) -> Dict:
+        """Batch count, mean batch size and inference time"""
+        return {
+            'batches': self.batches,
+            'windows': self.windows,
+            'mean_batch_size': self.windows / self.batches if self.batches else 0.0,
+            'busy_seconds': round(self.busy_seconds, 2)
+        }
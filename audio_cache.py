@@ -0,0 +1,222 @@
+"""
+Cache of decoded 16 kHz PCM for re-transcription and benchmarking
+Stores .npy files keyed by media content hash, evicting least recently used entries under a disk quota
+"""
+import os
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+import numpy as np
+
+from audio_utils import SAMPLE_RATE, PCMScratchFile, decode_audio_to_scratch
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Bytes reserved for the .npy header; NumPy pads 1-D headers to this size
+NPY_HEADER_SIZE = 128
+
+# Bytes read per step while hashing media
+HASH_BLOCK_SIZE = 1024 * 1024
+
+DEFAULT_QUOTA_MB = 2048
+
+
+def content_hash(source: Union[str, Path, Iterable[bytes]]) -> str:
+    """
+    SHA-256 of media content, read in fixed-size blocks
+
+    Args:
+        source: File path or iterable of bytes chunks
+
+    Returns:
+        Hex digest
+    """
+    digest = hashlib.sha256()
+    if isinstance(source, (str, Path)):
+        with open(source, 'rb') as file:
+            for block in iter(lambda: file.read(HASH_BLOCK_SIZE), b''):
+                digest.update(block)
+    else:
+        for chunk in source:
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class DecodedAudioCache:
+    """
+    Disk cache of decoded PCM keyed by media content hash
+
+    Entries are int16 .npy files read back through PCMScratchFile, so a hit
+    costs no decoding and no more memory than a fresh decode. File
+    modification times record recency, which keeps LRU order across
+    processes sharing the directory.
+    """
+
+    def __init__(self, root: Optional[str] = None, quota_bytes: Optional[int] = None):
+        """
+        Initialize the cache
+
+        Args:
+            root: Cache directory (defaults to $AUDIO_CACHE_DIR or 'audio_cache')
+            quota_bytes: Disk quota (defaults to $AUDIO_CACHE_QUOTA_MB, 2048 MB)
+        """
+        self.root = Path(root or os.getenv('AUDIO_CACHE_DIR', 'audio_cache'))
+        if quota_bytes is None:
+            quota_bytes = int(float(os.getenv('AUDIO_CACHE_QUOTA_MB', DEFAULT_QUOTA_MB)) * 1024 * 1024)
+        self.quota_bytes = quota_bytes
+        self.root.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def _entry_path(self, key: str, sample_rate: int) -> Path:
+        return self.root / f"{key}-{sample_rate}.npy"
+
+    def get(self, key: str, sample_rate: int = SAMPLE_RATE) -> Optional[PCMScratchFile]:
+        """
+        Open a cached entry
+
+        Args:
+            key: Content hash
+            sample_rate: Sample rate the audio was decoded at
+
+        Returns:
+            PCMScratchFile (closing it keeps the entry), or None on a miss
+        """
+        path = self._entry_path(key, sample_rate)
+        try:
+            with open(path, 'rb') as file:
+                np.lib.format.read_magic(file)
+                shape, _, dtype = np.lib.format.read_array_header_1_0(file)
+                offset = file.tell()
+            pcm = PCMScratchFile(path, sample_rate, offset=offset, delete_on_close=False)
+        except (FileNotFoundError, ValueError):
+            return None
+        if dtype != np.dtype('<i2') or len(pcm) != shape[0]:
+            pcm.close()
+            return None
+        # Mark as recently used
+        os.utime(path)
+        return pcm
+
+    def put(self, key: str, source: Union[str, Path, Iterable[bytes]],
+            sample_rate: int = SAMPLE_RATE) -> PCMScratchFile:
+        """
+        Decode media into the cache
+
+        The samples are decoded straight into the cache directory behind a
+        reserved header, so storing an entry needs no extra copy.
+
+        Args:
+            key: Content hash
+            source: Media file path or iterable of encoded bytes
+            sample_rate: Target sample rate
+
+        Returns:
+            PCMScratchFile for the new entry
+        """
+        path = self._entry_path(key, sample_rate)
+        scratch = decode_audio_to_scratch(source, sample_rate, scratch_dir=str(self.root), header_bytes=NPY_HEADER_SIZE)
+        try:
+            with open(scratch.path, 'r+b') as file:
+                np.lib.format.write_array_header_1_0(
+                    file, {'descr': '<i2', 'fortran_order': False, 'shape': (len(scratch),)}
+                )
+                if file.tell() != NPY_HEADER_SIZE:
+                    raise RuntimeError(f"Unexpected .npy header size: {file.tell()}")
+            os.replace(scratch.path, path)
+        finally:
+            scratch.close()
+        self.evict(keep=path)
+        return self.get(key, sample_rate)
+
+    def get_or_decode(self, source: Union[str, Path, Iterable[bytes]], key: Optional[str] = None,
+                      sample_rate: int = SAMPLE_RATE) -> PCMScratchFile:
+        """
+        Decoded PCM for media, decoding only on a cache miss
+
+        Args:
+            source: Media file path, or iterable of encoded bytes (then `key` is required)
+            key: Content hash; computed from a file path when omitted
+            sample_rate: Target sample rate
+
+        Returns:
+            PCMScratchFile (closing it keeps the cache entry)
+        """
+        if key is None:
+            if not isinstance(source, (str, Path)):
+                raise ValueError("A content hash key is required for streamed sources")
+            key = content_hash(source)
+        pcm = self.get(key, sample_rate)
+        if pcm is not None:
+            self.hits += 1
+            logger.info(f"Decoded audio cache hit: {key[:12]} ({pcm.duration:.1f}s)")
+            return pcm
+        self.misses += 1
+        return self.put(key, source, sample_rate)
+
+    def evict(self, keep: Optional[Path] = None) -> int:
+        """
+        Delete least recently used entries until the cache fits its quota
+
+        Args:
+            keep: Entry that must survive (the one just stored)
+
+        Returns:
+            int: Number of entries deleted
+        """
+        with self._lock:
+            entries = []
+            for path in self.root.glob('*.npy'):
+                try:
+                    stat = path.stat()
+                except FileNotFoundError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, path))
+            entries.sort()
+            total = sum(size for _, size, _ in entries)
+            deleted = 0
+            for _, size, path in entries:
+                if total <= self.quota_bytes:
+                    break
+                if path == keep:
+                    continue
+                try:
+                    os.unlink(path)
+                except OSError:
+                    continue  # Still open on platforms that lock mapped files
+                total -= size
+                deleted += 1
+            if deleted:
+                logger.info(f"Evicted {deleted} decoded audio entries ({total / 1024 / 1024:.0f} MB in use)")
+            return deleted
+
+    def get_stats(self) -> Dict:
+        """Entry count, disk usage and hit rate"""
+        sizes = [path.stat().st_size for path in self.root.glob('*.npy')]
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(sizes),
+            'bytes': sum(sizes),
+            'quota_bytes': self.quota_bytes,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+
+# Global decoded-audio cache, created on first use
+_audio_cache: Optional[DecodedAudioCache] = None
+
+
+def get_audio_cache() -> DecodedAudioCache:
+    """Get the global decoded-audio cache"""
+    global _audio_cache
+    if _audio_cache is None:
+        _audio_cache = DecodedAudioCache()
+    return _audio_cache
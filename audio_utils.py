@@ -0,0 +1,320 @@
+"""
+Audio decoding helpers shared by the transcription pipeline
+Decodes any FFmpeg-readable media to 16 kHz mono float32 PCM, in memory or
+spilled to a memory-mapped scratch file for multi-hour recordings
+"""
+import os
+import re
+import json
+import shutil
+import logging
+import tempfile
+import threading
+import subprocess
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Union
+
+import numpy as np
+from pydub import AudioSegment
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+# Bytes copied from FFmpeg's stdout to the scratch file per read
+SCRATCH_BLOCK_SIZE = 1024 * 1024
+
+
+def get_ffmpeg_binary() -> str:
+    """Return the FFmpeg executable configured for pydub, or the one on PATH"""
+    converter = getattr(AudioSegment, 'converter', None)
+    if converter and (os.path.exists(converter) or shutil.which(converter)):
+        return converter
+    return 'ffmpeg'
+
+
+def get_ffprobe_binary() -> Optional[str]:
+    """Return the FFprobe executable configured for pydub or on PATH, if any"""
+    for candidate in (getattr(AudioSegment, 'ffprobe', None), 'ffprobe'):
+        if candidate and (os.path.exists(candidate) or shutil.which(candidate)):
+            return candidate
+    return None
+
+
+def probe_media(file_path: Union[str, Path]) -> Dict:
+    """
+    Read audio stream properties from the container headers without decoding
+
+    Uses FFprobe when available and falls back to parsing `ffmpeg -i` output.
+
+    Args:
+        file_path: Audio or video file
+
+    Returns:
+        Dictionary with 'duration' (seconds or None), 'channels', 'codec',
+        'sample_rate', 'bit_rate' (bits per second or None) and 'format'
+    """
+    ffprobe = get_ffprobe_binary()
+    if ffprobe:
+        command = [
+            ffprobe, '-v', 'error', '-select_streams', 'a:0', '-print_format', 'json',
+            '-show_entries', 'stream=codec_name,channels,sample_rate,duration,bit_rate:format=format_name,duration,bit_rate',
+            str(file_path)
+        ]
+        output = subprocess.run(command, capture_output=True)
+        if output.returncode == 0:
+            probe = json.loads(output.stdout or b'{}')
+            stream = (probe.get('streams') or [{}])[0]
+            container = probe.get('format', {})
+            duration = stream.get('duration') or container.get('duration')
+            bit_rate = stream.get('bit_rate') or container.get('bit_rate')
+            return {
+                'duration': float(duration) if duration not in (None, 'N/A') else None,
+                'channels': int(stream.get('channels', 0)),
+                'codec': stream.get('codec_name'),
+                'sample_rate': int(stream.get('sample_rate', 0)),
+                'bit_rate': int(bit_rate) if bit_rate not in (None, 'N/A') else None,
+                'format': container.get('format_name')
+            }
+
+    # FFmpeg prints the stream summary on stderr and exits with an error when given no output
+    try:
+        stderr = subprocess.run(
+            [get_ffmpeg_binary(), '-hide_banner', '-nostdin', '-i', str(file_path)], capture_output=True
+        ).stderr.decode(errors='ignore')
+    except FileNotFoundError:
+        raise RuntimeError("FFmpeg is not installed or not on PATH")
+    stream = re.search(r"Stream #0:\d+.*?: Audio: (\w+)[^,]*, (\d+) Hz, ([^,]+)", stderr)
+    if stream is None:
+        raise RuntimeError(f"No audio stream found in {file_path}")
+    duration = re.search(r"Duration: (\d+):(\d+):(\d+(?:\.\d+)?)", stderr)
+    bit_rate = re.search(r"bitrate: (\d+) kb/s", stderr)
+    container = re.search(r"Input #0, (.+), from", stderr)
+    return {
+        'duration': (int(duration.group(1)) * 3600 + int(duration.group(2)) * 60 + float(duration.group(3))) if duration else None,
+        'channels': _layout_channels(stream.group(3).strip()),
+        'codec': stream.group(1),
+        'sample_rate': int(stream.group(2)),
+        'bit_rate': int(bit_rate.group(1)) * 1000 if bit_rate else None,
+        'format': container.group(1) if container else None
+    }
+
+
+def _layout_channels(layout: str) -> int:
+    """Channel count of an FFmpeg channel layout name ('mono', 'stereo', '5.1', '4 channels', ...)"""
+    named = {'mono': 1, 'stereo': 2, 'quad': 4}
+    if layout in named:
+        return named[layout]
+    match = re.match(r"(\d+) channels", layout)
+    if match:
+        return int(match.group(1))
+    match = re.match(r"(\d+)\.(\d+)", layout)
+    if match:
+        return int(match.group(1)) + int(match.group(2))
+    return 1
+
+
+def decode_audio(file_path: Union[str, Path], sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    """
+    Decode a media file to mono float32 PCM
+
+    Args:
+        file_path: Audio or video file readable by FFmpeg
+        sample_rate: Target sample rate
+
+    Returns:
+        1-D float32 array with samples in [-1, 1]
+    """
+    command = [
+        get_ffmpeg_binary(), '-nostdin', '-threads', '0', '-i', str(file_path),
+        '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(sample_rate), '-'
+    ]
+    try:
+        output = subprocess.run(command, capture_output=True, check=True).stdout
+    except FileNotFoundError:
+        raise RuntimeError("FFmpeg is not installed or not on PATH")
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"Failed to decode audio: {e.stderr.decode(errors='ignore')[-500:]}")
+    return np.frombuffer(output, np.int16).astype(np.float32) / 32768.0
+
+
+class PCMScratchFile:
+    """
+    Decoded 16-bit PCM spilled to disk and read back in memory-mapped windows
+
+    Slicing returns float32 samples in [-1, 1] like an in-memory array. Each
+    slice maps only the requested range and unmaps it again, so resident
+    memory stays bounded by the window size rather than the recording length.
+    """
+
+    def __init__(self, path: Union[str, Path], sample_rate: int = SAMPLE_RATE,
+                 offset: int = 0, delete_on_close: bool = True):
+        """
+        Open a PCM file for windowed reads
+
+        Args:
+            path: File of little-endian int16 samples
+            sample_rate: Sample rate of the samples
+            offset: Bytes to skip before the first sample (e.g. an .npy header)
+            delete_on_close: Delete the file when closed (False for cached files)
+        """
+        self.path = Path(path)
+        self.sample_rate = sample_rate
+        self.offset = offset
+        self.delete_on_close = delete_on_close
+        # Keep a handle so reads still work if the file is unlinked (e.g. evicted from a cache)
+        self._file = open(self.path, 'rb')
+        self.samples = (os.fstat(self._file.fileno()).st_size - offset) // 2
+
+    def __len__(self) -> int:
+        return self.samples
+
+    @property
+    def duration(self) -> float:
+        """Length in seconds"""
+        return self.samples / self.sample_rate
+
+    def __getitem__(self, index: slice) -> np.ndarray:
+        if not isinstance(index, slice):
+            raise TypeError("PCMScratchFile only supports slicing")
+        start, stop, step = index.indices(self.samples)
+        if stop <= start:
+            return np.empty(0, dtype=np.float32)
+        window = np.memmap(self._file, dtype=np.int16, mode='r', offset=self.offset + start * 2, shape=(stop - start,))
+        try:
+            return window[::step].astype(np.float32) / 32768.0
+        finally:
+            # Unmap so pages already read do not count towards this process any more
+            del window
+
+    def close(self):
+        """Close the file, deleting it unless it is owned by someone else"""
+        self._file.close()
+        if not self.delete_on_close:
+            return
+        try:
+            os.unlink(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self) -> 'PCMScratchFile':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def decode_audio_to_scratch(source: Union[str, Path, Iterable[bytes]], sample_rate: int = SAMPLE_RATE,
+                            scratch_dir: Optional[str] = None, header_bytes: int = 0) -> PCMScratchFile:
+    """
+    Decode media to a 16-bit PCM scratch file without holding it in memory
+
+    FFmpeg's output is copied to disk in fixed-size blocks, so peak memory is
+    the same for a one-minute clip and an eight-hour recording.
+
+    Args:
+        source: Media file path, or an iterable of encoded bytes fed through stdin
+        sample_rate: Target sample rate
+        scratch_dir: Directory for the scratch file (defaults to $PCM_SCRATCH_DIR or the system temp dir)
+        header_bytes: Zero bytes reserved before the samples for a header written later
+
+    Returns:
+        PCMScratchFile (caller closes it to delete the file)
+    """
+    from_file = isinstance(source, (str, Path))
+    command = [
+        get_ffmpeg_binary(), '-hide_banner', '-loglevel', 'error', '-threads', '0',
+        '-i', str(source) if from_file else 'pipe:0',
+        '-f', 's16le', '-ac', '1', '-acodec', 'pcm_s16le', '-ar', str(sample_rate), '-'
+    ]
+    scratch_dir = scratch_dir or os.getenv('PCM_SCRATCH_DIR') or None
+    scratch = tempfile.NamedTemporaryFile(delete=False, suffix='.pcm', dir=scratch_dir)
+    try:
+        try:
+            process = subprocess.Popen(
+                command,
+                stdin=subprocess.DEVNULL if from_file else subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE
+            )
+        except FileNotFoundError:
+            raise RuntimeError("FFmpeg is not installed or not on PATH")
+
+        stderr_chunks = []
+        threads = [threading.Thread(target=lambda: stderr_chunks.append(process.stderr.read()), daemon=True)]
+        if not from_file:
+            def feed():
+                try:
+                    for chunk in source:
+                        process.stdin.write(chunk)
+                except BrokenPipeError:
+                    pass  # FFmpeg stopped reading; its exit code reports why
+                finally:
+                    process.stdin.close()
+            threads.append(threading.Thread(target=feed, daemon=True))
+        for thread in threads:
+            thread.start()
+
+        with scratch:
+            scratch.write(b'\0' * header_bytes)
+            while True:
+                block = process.stdout.read(SCRATCH_BLOCK_SIZE)
+                if not block:
+                    break
+                scratch.write(block)
+        for thread in threads:
+            thread.join()
+        if process.wait() != 0:
+            stderr = b''.join(stderr_chunks)
+            raise RuntimeError(f"Failed to decode audio: {stderr.decode(errors='ignore')[-500:]}")
+
+        pcm = PCMScratchFile(scratch.name, sample_rate, offset=header_bytes)
+        logger.info(f"Decoded {pcm.duration:.1f}s of audio to scratch file {scratch.name}")
+        return pcm
+    except Exception:
+        os.unlink(scratch.name)
+        raise
+
+
+def decode_channels_to_scratch(file_path: Union[str, Path], channels: int, sample_rate: int = SAMPLE_RATE,
+                               scratch_dir: Optional[str] = None) -> List[PCMScratchFile]:
+    """
+    Decode each channel of a multi-channel file to its own PCM scratch file
+
+    A single FFmpeg pass splits the channels, so the file is read once.
+
+    Args:
+        file_path: Multi-channel audio or video file
+        channels: Number of channels to extract
+        sample_rate: Target sample rate
+        scratch_dir: Directory for the scratch files (defaults to $PCM_SCRATCH_DIR or the system temp dir)
+
+    Returns:
+        One PCMScratchFile per channel (caller closes them)
+    """
+    scratch_dir = scratch_dir or os.getenv('PCM_SCRATCH_DIR') or None
+    paths = []
+    for channel in range(channels):
+        with tempfile.NamedTemporaryFile(delete=False, suffix=f'.ch{channel}.pcm', dir=scratch_dir) as scratch:
+            paths.append(scratch.name)
+
+    split = f"[0:a]asplit={channels}" + ''.join(f"[s{channel}]" for channel in range(channels))
+    pans = [f"[s{channel}]pan=mono|c0=c{channel}[ch{channel}]" for channel in range(channels)]
+    command = [
+        get_ffmpeg_binary(), '-hide_banner', '-loglevel', 'error', '-nostdin', '-y', '-threads', '0',
+        '-i', str(file_path), '-filter_complex', ';'.join([split] + pans)
+    ]
+    for channel, path in enumerate(paths):
+        command += ['-map', f"[ch{channel}]", '-f', 's16le', '-acodec', 'pcm_s16le', '-ar', str(sample_rate), path]
+
+    try:
+        subprocess.run(command, capture_output=True, check=True)
+    except FileNotFoundError:
+        raise RuntimeError("FFmpeg is not installed or not on PATH")
+    except subprocess.CalledProcessError as e:
+        for path in paths:
+            os.unlink(path)
+        raise RuntimeError(f"Failed to split channels: {e.stderr.decode(errors='ignore')[-500:]}")
+    return [PCMScratchFile(path, sample_rate) for path in paths]
@@ -0,0 +1,630 @@
+"""
+Benchmark script for the AI-Driven Meeting Summarizer
+Measures transcription speed (real-time factor) and memory on CPU, task persistence time, transcript storage size
+and search latency
+
+Usage:
+    python benchmark.py asr [audio_file] [--backends whisper,faster_whisper] [--sizes tiny,base]
+    python benchmark.py stream [audio_file] [--backend whisper] [--size base]
+    python benchmark.py language [audio_file] [--backend whisper] [--size base]
+    python benchmark.py batch [audio_file] [--backend whisper] [--size base] [--jobs 4]
+    python benchmark.py presets [audio_files...] [--backend whisper] [--size base]
+    python benchmark.py tasks [--counts 50,10000]
+    python benchmark.py bodies [--count 200] [--minutes 60]
+    python benchmark.py search [--meetings 100000] [--minutes 5] [--queries 500] [--backend sqlite]
+"""
+import os
+import sys
+import time
+import argparse
+import logging
+import functools
+import multiprocessing
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Add current directory to path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Configure logging
+logging.basicConfig(level=logging.WARNING)
+logger = logging.getLogger(__name__)
+
+DEFAULT_AUDIO = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'test.mp4')
+
+
+def peak_rss_mb() -> Optional[float]:
+    """Peak resident set size of the current process in MB"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KB on Linux and bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def audio_duration_seconds(audio_path: str) -> float:
+    """Duration of an audio or video file in seconds"""
+    from pydub import AudioSegment
+    return AudioSegment.from_file(audio_path).duration_seconds
+
+
+def _run_asr_case(backend_name: str, model_size: str, audio_path: str, options: Dict, queue,
+                  preset: Optional[str] = None):
+    """Child-process body: load one backend, transcribe once, report metrics"""
+    try:
+        from asr_backends import get_asr_backend
+        from audio_cache import get_audio_cache
+        rss_before = peak_rss_mb()
+        # Only the first case decodes; the rest read the cached PCM
+        decode_start = time.perf_counter()
+        with get_audio_cache().get_or_decode(audio_path) as pcm:
+            audio = pcm[:]
+        decode_seconds = time.perf_counter() - decode_start
+        backend = get_asr_backend(backend_name, model_size, **options)
+        if preset:
+            backend.apply_preset(preset)
+        load_start = time.perf_counter()
+        backend.load()
+        load_seconds = time.perf_counter() - load_start
+        start = time.perf_counter()
+        result = backend.transcribe(audio)
+        transcribe_seconds = time.perf_counter() - start
+        queue.put({
+            'decode_seconds': decode_seconds,
+            'load_seconds': load_seconds,
+            'transcribe_seconds': transcribe_seconds,
+            'peak_rss_mb': peak_rss_mb(),
+            'baseline_rss_mb': rss_before,
+            'characters': len(result['text'])
+        })
+    except Exception as e:
+        queue.put({'error': str(e)})
+
+
+def benchmark_asr_backends(audio_path: str, backends: List[str], model_sizes: List[str]) -> List[Dict]:
+    """
+    Compare ASR backends and model sizes on CPU
+
+    Each case runs in a fresh process so peak memory is not shared between cases.
+
+    Args:
+        audio_path: Audio or video file to transcribe
+        backends: Backend names to compare
+        model_sizes: Model sizes to compare
+
+    Returns:
+        List of result dictionaries with real-time factor and peak RSS
+    """
+    duration = audio_duration_seconds(audio_path)
+    print(f"🎧 Audio: {os.path.basename(audio_path)} ({duration:.1f}s)")
+    context = multiprocessing.get_context('spawn')
+    results = []
+
+    for backend_name in backends:
+        for model_size in model_sizes:
+            queue = context.Queue()
+            process = context.Process(target=_run_asr_case, args=(backend_name, model_size, audio_path, {}, queue))
+            process.start()
+            metrics = queue.get()
+            process.join()
+
+            metrics.update({'backend': backend_name, 'model_size': model_size, 'audio_seconds': duration})
+            if 'error' in metrics:
+                print(f"❌ {backend_name}:{model_size} failed: {metrics['error']}")
+            else:
+                metrics['rtf'] = metrics['transcribe_seconds'] / duration if duration else None
+                print(
+                    f"✅ {backend_name}:{model_size} - RTF {metrics['rtf']:.3f}, "
+                    f"decode {metrics['decode_seconds']:.2f}s, load {metrics['load_seconds']:.1f}s, peak RSS {metrics['peak_rss_mb'] or 0:.0f} MB"
+                )
+            results.append(metrics)
+
+    return results
+
+
+def benchmark_speed_presets(audio_paths: List[str], backend_name: str, model_size: str) -> List[Dict]:
+    """
+    Real-time factor of each speed preset on the sample recordings
+
+    Args:
+        audio_paths: Recordings to transcribe
+        backend_name: ASR backend name
+        model_size: Model size to load
+
+    Returns:
+        List of result dictionaries, one per preset and recording
+    """
+    from asr_backends import SPEED_PRESETS
+
+    context = multiprocessing.get_context('spawn')
+    results = []
+    for audio_path in audio_paths:
+        duration = audio_duration_seconds(audio_path)
+        print(f"🎧 Audio: {os.path.basename(audio_path)} ({duration:.1f}s)")
+        for preset in SPEED_PRESETS:
+            queue = context.Queue()
+            process = context.Process(
+                target=_run_asr_case,
+                args=(backend_name, model_size, audio_path, {}, queue, preset)
+            )
+            process.start()
+            metrics = queue.get()
+            process.join()
+
+            metrics.update({'preset': preset, 'audio': os.path.basename(audio_path), 'audio_seconds': duration})
+            if 'error' in metrics:
+                print(f"❌ {preset} failed: {metrics['error']}")
+            else:
+                metrics['rtf'] = metrics['transcribe_seconds'] / duration if duration else None
+                print(
+                    f"✅ {preset:<9} - RTF {metrics['rtf']:.3f}, "
+                    f"peak RSS {metrics['peak_rss_mb'] or 0:.0f} MB, {metrics['characters']} characters"
+                )
+            results.append(metrics)
+    return results
+
+
+def benchmark_streaming_lag(audio_path: str, backend_name: str, model_size: str, speed: float = 1.0) -> Dict:
+    """
+    Measure end-to-end commit lag of live transcription
+
+    The file is replayed at real-time speed so each chunk arrives when it
+    would have been spoken; lag is the delay between a segment being spoken
+    and being committed.
+
+    Args:
+        audio_path: Recording to replay
+        backend_name: ASR backend name
+        model_size: Model size to load
+        speed: Replay speed (1.0 = real time)
+
+    Returns:
+        Lag statistics in seconds
+    """
+    from asr_backends import get_asr_backend
+    from streaming import StreamingTranscriber, replay_file
+
+    backend = get_asr_backend(backend_name, model_size)
+    backend.load()
+    transcriber = StreamingTranscriber(backend)
+    started = time.perf_counter()
+    transcriber.run(replay_file(audio_path, speed=speed))
+    wall_seconds = time.perf_counter() - started
+
+    stats = transcriber.lag_stats()
+    stats['wall_seconds'] = round(wall_seconds, 2)
+    stats['stream_seconds'] = round(transcriber.stream_seconds, 2)
+    print(
+        f"✅ {backend.describe()} streaming - {stats.get('segments', 0)} segments, "
+        f"lag p50 {stats.get('p50', 0):.2f}s, p95 {stats.get('p95', 0):.2f}s, max {stats.get('max', 0):.2f}s"
+    )
+    return stats
+
+
+def benchmark_language_pinning(audio_path: str, backend_name: str, model_size: str,
+                               window_seconds: float = 30.0) -> Dict:
+    """
+    Compare transcription latency with per-window language detection and with a pinned language
+
+    The recording is split into fixed windows, as long files and live streams
+    are; without pinning every window pays for its own detection pass.
+
+    Args:
+        audio_path: Recording to transcribe
+        backend_name: ASR backend name
+        model_size: Model size to load
+        window_seconds: Window length in seconds
+
+    Returns:
+        Dictionary with total seconds per mode and the detected language
+    """
+    from asr_backends import get_asr_backend
+    from audio_utils import SAMPLE_RATE, decode_audio
+
+    backend = get_asr_backend(backend_name, model_size)
+    backend.load()
+    pcm = decode_audio(audio_path)
+    window = int(window_seconds * SAMPLE_RATE)
+    windows = [pcm[start:start + window] for start in range(0, len(pcm), window)]
+
+    start = time.perf_counter()
+    language = backend.detect_language(pcm[:window])
+    detect_seconds = time.perf_counter() - start
+
+    timings = {}
+    for mode, pinned in (('auto', None), ('pinned', language)):
+        start = time.perf_counter()
+        for samples in windows:
+            backend.transcribe(samples, language=pinned)
+        timings[mode] = time.perf_counter() - start
+
+    stats = {
+        'language': language,
+        'windows': len(windows),
+        'detect_seconds': round(detect_seconds, 2),
+        'auto_seconds': round(timings['auto'], 2),
+        'pinned_seconds': round(timings['pinned'] + detect_seconds, 2)
+    }
+    print(
+        f"✅ {backend.describe()} language '{language}' - {len(windows)} windows, "
+        f"auto {stats['auto_seconds']:.1f}s vs pinned {stats['pinned_seconds']:.1f}s "
+        f"(including one {stats['detect_seconds']:.2f}s detection)"
+    )
+    return stats
+
+
+def benchmark_batched_throughput(audio_path: str, backend_name: str, model_size: str,
+                                 jobs: int = 4, batch_size: int = 8) -> Dict:
+    """
+    Compare aggregate throughput of concurrent jobs with and without micro-batching
+
+    Each job transcribes the same recording from its own thread. Without
+    batching the jobs take turns on the model; with batching their 30-second
+    windows share forward passes.
+
+    Args:
+        audio_path: Recording each job transcribes
+        backend_name: ASR backend name
+        model_size: Model size to load
+        jobs: Number of concurrent jobs
+        batch_size: Maximum windows per batch
+
+    Returns:
+        Dictionary with audio seconds processed per wall second for each mode
+    """
+    import threading
+    from concurrent.futures import ThreadPoolExecutor
+    from asr_backends import get_asr_backend
+    from asr_server import BatchedASRServer
+    from audio_utils import SAMPLE_RATE, decode_audio
+
+    backend = get_asr_backend(backend_name, model_size)
+    backend.load()
+    pcm = decode_audio(audio_path)
+    audio_seconds = len(pcm) / SAMPLE_RATE * jobs
+    lock = threading.Lock()
+
+    def serial_job(_):
+        with lock:
+            return backend.transcribe(pcm)
+
+    server = BatchedASRServer(backend, max_batch_size=batch_size)
+    modes = {'serial': serial_job, 'batched': lambda _: server.transcribe(pcm)}
+
+    stats = {'jobs': jobs, 'audio_seconds': round(audio_seconds, 1)}
+    for mode, job in modes.items():
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=jobs) as executor:
+            list(executor.map(job, range(jobs)))
+        wall_seconds = time.perf_counter() - start
+        stats[f'{mode}_seconds'] = round(wall_seconds, 2)
+        stats[f'{mode}_throughput'] = round(audio_seconds / wall_seconds, 2)
+    server.stop()
+    stats['mean_batch_size'] = round(server.get_stats()['mean_batch_size'], 2)
+
+    print(
+        f"✅ {backend.describe()} x{jobs} jobs - serial {stats['serial_throughput']:.1f} vs "
+        f"batched {stats['batched_throughput']:.1f} audio s/s (mean batch {stats['mean_batch_size']:.1f})"
+    )
+    return stats
+
+
+def benchmark_task_persistence(counts: List[int]) -> List[Dict]:
+    """
+    Time persisting action items one by one versus in bulk
+
+    Each run creates `count` synthetic tasks in the configured database
+    (a meeting's worth or a backfill), then deletes them again.
+
+    Args:
+        counts: Numbers of tasks to persist per run
+
+    Returns:
+        List of per-count result dictionaries
+    """
+    from datetime import datetime, timedelta
+    from db import get_db_manager
+    from task_manager import get_task_manager
+
+    db_manager = get_db_manager()
+    db_manager.connect()
+    task_manager = get_task_manager()
+
+    results = []
+    for count in counts:
+        meeting_id = f"benchmark-{int(time.time())}"
+        items = [
+            {
+                'task': f"Benchmark task {index}",
+                'assignee': f"User {index % 10}",
+                'priority': 'medium',
+                'suggested_deadline': (datetime.utcnow() + timedelta(days=index % 30 + 2)).strftime('%Y-%m-%d')
+            }
+            for index in range(count)
+        ]
+        stats = {'tasks': count}
+        for mode in ('serial', 'bulk'):
+            start = time.perf_counter()
+            if mode == 'serial':
+                task_ids = [task_manager.create_task(dict(item), meeting_id) for item in items]
+            else:
+                task_ids = task_manager.create_tasks_from_action_items(items, meeting_id)
+            stats[f'{mode}_seconds'] = round(time.perf_counter() - start, 3)
+            for task_id in task_ids:
+                task_manager._cancel_task_reminders(task_id)
+            db_manager.delete_tasks_by_meeting(meeting_id)
+        stats['speedup'] = round(stats['serial_seconds'] / stats['bulk_seconds'], 1) if stats['bulk_seconds'] else None
+        results.append(stats)
+        print(
+            f"✅ {count} tasks - one by one {stats['serial_seconds']:.2f}s vs "
+            f"bulk {stats['bulk_seconds']:.2f}s ({stats['speedup']}x)"
+        )
+    return results
+
+
+@functools.lru_cache(maxsize=1)
+def synthetic_vocabulary() -> tuple:
+    """Fixed 5000-word vocabulary (most frequent first) and cumulative Zipf weights"""
+    import random
+    import itertools
+    vocabulary_rng = random.Random(0)
+    letters = 'etaoinshrdlucmfwypvbgkqjxz'
+    vocabulary = [
+        ''.join(vocabulary_rng.choices(letters, weights=range(26, 0, -1), k=vocabulary_rng.randint(2, 9)))
+        for _ in range(5000)
+    ]
+    return vocabulary, list(itertools.accumulate(1 / rank for rank in range(1, len(vocabulary) + 1)))
+
+
+def synthetic_transcript(minutes: float, seed: int) -> str:
+    """Meeting-like text: ~150 words a minute drawn Zipf-like from a fixed vocabulary"""
+    import random
+    rng = random.Random(seed)
+    vocabulary, cumulative_weights = synthetic_vocabulary()
+    words = rng.choices(vocabulary, cum_weights=cumulative_weights, k=int(minutes * 150))
+    sentences = [' '.join(words[i:i + 12]).capitalize() + '.' for i in range(0, len(words), 12)]
+    return ' '.join(sentences)
+
+
+def benchmark_transcript_storage(count: int, minutes: float) -> Dict:
+    """
+    Storage size and fetch latency of compressed transcript bodies
+
+    Compresses a synthetic corpus with every available codec, then saves it
+    to the configured database and times metadata-only reads against reads
+    that fetch and decompress the text. The transcripts are deleted afterwards.
+
+    Args:
+        count: Transcripts in the corpus
+        minutes: Meeting length each transcript represents
+
+    Returns:
+        Dictionary with per-codec sizes and fetch latencies
+    """
+    import statistics
+    from db import get_db_manager
+    from text_codec import compress_text, decompress_text, zstandard
+
+    corpus = [synthetic_transcript(minutes, seed) for seed in range(count)]
+    raw_bytes = sum(len(text.encode('utf-8')) for text in corpus)
+    print(f"📚 {count} transcripts of {minutes:g} minutes: {raw_bytes / 1e6:.1f} MB of text")
+
+    results = {'transcripts': count, 'raw_bytes': raw_bytes, 'codecs': {}}
+    for codec in ['zlib'] + (['zstd'] if zstandard is not None else []):
+        start = time.perf_counter()
+        bodies = [compress_text(text, codec) for text in corpus]
+        compress_seconds = time.perf_counter() - start
+        start = time.perf_counter()
+        for body in bodies:
+            decompress_text(body)
+        decompress_seconds = time.perf_counter() - start
+        stored_bytes = sum(body['stored_bytes'] for body in bodies)
+        results['codecs'][codec] = {
+            'stored_bytes': stored_bytes,
+            'ratio': round(raw_bytes / stored_bytes, 2),
+            'compress_ms': round(compress_seconds / count * 1000, 3),
+            'decompress_ms': round(decompress_seconds / count * 1000, 3)
+        }
+        print(
+            f"✅ {codec}: {stored_bytes / 1e6:.2f} MB stored ({raw_bytes / stored_bytes:.1f}x smaller), "
+            f"{compress_seconds / count * 1000:.2f} ms to compress / "
+            f"{decompress_seconds / count * 1000:.2f} ms to decompress per transcript"
+        )
+
+    db_manager = get_db_manager()
+    db_manager.connect()
+    transcript_ids = [
+        db_manager.save_transcript({'meeting_title': f"Benchmark {index}", 'file_type': 'text', 'text': text})
+        for index, text in enumerate(corpus)
+    ]
+    try:
+        timings = {'metadata': [], 'text': []}
+        for transcript_id in transcript_ids:
+            # Straight from the database: the document cache would hide the reads
+            start = time.perf_counter()
+            db_manager._load_transcript(transcript_id)
+            timings['metadata'].append(time.perf_counter() - start)
+            start = time.perf_counter()
+            db_manager.get_transcript_text(transcript_id)
+            timings['text'].append(time.perf_counter() - start)
+        for name, values in timings.items():
+            values.sort()
+            results[f'{name}_fetch_ms'] = {
+                'p50': round(statistics.median(values) * 1000, 3),
+                'p95': round(values[min(int(len(values) * 0.95), len(values) - 1)] * 1000, 3)
+            }
+        print(
+            f"✅ {db_manager.name} fetch p50/p95 - metadata only "
+            f"{results['metadata_fetch_ms']['p50']:.2f}/{results['metadata_fetch_ms']['p95']:.2f} ms, "
+            f"with text {results['text_fetch_ms']['p50']:.2f}/{results['text_fetch_ms']['p95']:.2f} ms"
+        )
+    finally:
+        for transcript_id in transcript_ids:
+            db_manager.delete_transcript(transcript_id)
+    return results
+
+
+def benchmark_search(meetings: int, minutes: float, queries: int, backend: str = 'sqlite') -> Dict:
+    """
+    Full-text search latency over a synthetic corpus
+
+    Each meeting has a transcript, a summary and three tasks, saved through
+    the storage interface so they are indexed on write. Queries are one to
+    three words drawn from the corpus vocabulary, skipping the most common
+    ones, and fetch the first page of hits with snippets; every fourth query
+    is restricted to one kind of document.
+
+    Args:
+        meetings: Meetings in the corpus
+        minutes: Meeting length each transcript represents
+        queries: Searches to time
+        backend: 'sqlite' for a throwaway database file, 'configured' for get_db_manager()
+            (the meetings are deleted afterwards)
+
+    Returns:
+        Dictionary with indexing time and search latency percentiles
+    """
+    import random
+    import statistics
+    import tempfile
+    from search import SEARCH_KINDS
+
+    if backend == 'sqlite':
+        from sqlite_storage import SQLiteStorage
+        temp_dir = tempfile.TemporaryDirectory()
+        storage = SQLiteStorage(os.path.join(temp_dir.name, 'search.db'))
+    else:
+        from db import get_db_manager
+        temp_dir, storage = None, get_db_manager()
+    storage.connect()
+    # Every query below misses the document cache anyway
+    storage.cache.max_entries = 0
+
+    rng = random.Random(1)
+    vocabulary, _ = synthetic_vocabulary()
+    transcript_ids = []
+    start = time.perf_counter()
+    try:
+        for index in range(meetings):
+            text = synthetic_transcript(minutes, index)
+            title = ' '.join(rng.sample(vocabulary[50:], 3)).capitalize()
+            transcript_id = storage.save_transcript({'meeting_title': title, 'file_type': 'text', 'text': text})
+            transcript_ids.append(transcript_id)
+            storage.save_summary({'meeting_title': title, 'transcript_id': transcript_id,
+                                  'meeting_id': transcript_id, 'summary': text[:600]})
+            storage.save_tasks([
+                {'task': ' '.join(rng.sample(vocabulary[20:], 4)).capitalize(), 'assignee': f"person{index % 50}",
+                 'context': ' '.join(rng.sample(vocabulary[20:], 12)), 'status': 'pending', 'priority': 'medium',
+                 'meeting_id': transcript_id, 'transcript_id': transcript_id} for _ in range(3)
+            ])
+            if (index + 1) % 10000 == 0:
+                print(f"   indexed {index + 1} meetings")
+        index_seconds = time.perf_counter() - start
+        print(f"📚 {meetings} meetings of {minutes:g} minutes indexed in {index_seconds:.1f}s "
+              f"({index_seconds / meetings * 1000:.2f} ms per meeting)")
+
+        timings = []
+        for number in range(queries):
+            query = ' '.join(rng.sample(vocabulary[100:], rng.randint(1, 3)))
+            kinds = [rng.choice(SEARCH_KINDS)] if number % 4 == 3 else None
+            start = time.perf_counter()
+            storage.search(query, kinds)
+            timings.append(time.perf_counter() - start)
+        timings.sort()
+        results = {
+            'meetings': meetings,
+            'index_ms_per_meeting': round(index_seconds / meetings * 1000, 3),
+            'search_ms': {
+                'p50': round(statistics.median(timings) * 1000, 3),
+                'p95': round(timings[min(int(len(timings) * 0.95), len(timings) - 1)] * 1000, 3),
+                'max': round(timings[-1] * 1000, 3)
+            }
+        }
+        print(f"✅ {storage.name} search over {meetings} meetings - p50 {results['search_ms']['p50']:.2f} ms, "
+              f"p95 {results['search_ms']['p95']:.2f} ms, max {results['search_ms']['max']:.2f} ms")
+        return results
+    finally:
+        if temp_dir is not None:
+            storage.close_connection()
+            temp_dir.cleanup()
+        else:
+            for transcript_id in transcript_ids:
+                storage.delete_transcript(transcript_id)
+
+
+def main():
+    """Main benchmark function"""
+    parser = argparse.ArgumentParser(description="AI-Driven Meeting Summarizer benchmarks")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    asr_parser = subparsers.add_parser('asr', help="Compare ASR backends and model sizes")
+    asr_parser.add_argument('audio', nargs='?', default=DEFAULT_AUDIO)
+    asr_parser.add_argument('--backends', default='whisper,faster_whisper')
+    asr_parser.add_argument('--sizes', default='tiny,base')
+
+    stream_parser = subparsers.add_parser('stream', help="Measure live transcription lag on a real-time replay")
+    stream_parser.add_argument('audio', nargs='?', default=DEFAULT_AUDIO)
+    stream_parser.add_argument('--backend', default='whisper')
+    stream_parser.add_argument('--size', default='base')
+    stream_parser.add_argument('--speed', type=float, default=1.0)
+
+    language_parser = subparsers.add_parser('language', help="Compare latency with and without a pinned language")
+    language_parser.add_argument('audio', nargs='?', default=DEFAULT_AUDIO)
+    language_parser.add_argument('--backend', default='whisper')
+    language_parser.add_argument('--size', default='base')
+    language_parser.add_argument('--window', type=float, default=30.0)
+
+    batch_parser = subparsers.add_parser('batch', help="Compare concurrent throughput with and without micro-batching")
+    batch_parser.add_argument('audio', nargs='?', default=DEFAULT_AUDIO)
+    batch_parser.add_argument('--backend', default='whisper')
+    batch_parser.add_argument('--size', default='base')
+    batch_parser.add_argument('--jobs', type=int, default=4)
+    batch_parser.add_argument('--batch-size', type=int, default=8)
+
+    presets_parser = subparsers.add_parser('presets', help="Real-time factor of each speed preset")
+    presets_parser.add_argument('audio', nargs='*', default=[DEFAULT_AUDIO])
+    presets_parser.add_argument('--backend', default='whisper')
+    presets_parser.add_argument('--size', default='base')
+
+    tasks_parser = subparsers.add_parser('tasks', help="Compare one-by-one and bulk task persistence")
+    tasks_parser.add_argument('--counts', default='50,10000')
+
+    bodies_parser = subparsers.add_parser('bodies', help="Transcript body compression and fetch latency")
+    bodies_parser.add_argument('--count', type=int, default=200)
+    bodies_parser.add_argument('--minutes', type=float, default=60)
+
+    search_parser = subparsers.add_parser('search', help="Full-text search latency over a synthetic corpus")
+    search_parser.add_argument('--meetings', type=int, default=100000)
+    search_parser.add_argument('--minutes', type=float, default=5)
+    search_parser.add_argument('--queries', type=int, default=500)
+    search_parser.add_argument('--backend', choices=['sqlite', 'configured'], default='sqlite')
+
+    args = parser.parse_args()
+
+    print("⏱️ AI-Driven Meeting Summarizer - Benchmarks")
+    print("=" * 50)
+
+    if args.command == 'asr':
+        benchmark_asr_backends(args.audio, args.backends.split(','), args.sizes.split(','))
+    elif args.command == 'stream':
+        benchmark_streaming_lag(args.audio, args.backend, args.size, args.speed)
+    elif args.command == 'language':
+        benchmark_language_pinning(args.audio, args.backend, args.size, args.window)
+    elif args.command == 'batch':
+        benchmark_batched_throughput(args.audio, args.backend, args.size, args.jobs, args.batch_size)
+    elif args.command == 'presets':
+        benchmark_speed_presets(args.audio, args.backend, args.size)
+    elif args.command == 'tasks':
+        benchmark_task_persistence([int(count) for count in args.counts.split(',')])
+    elif args.command == 'bodies':
+        benchmark_transcript_storage(args.count, args.minutes)
+    elif args.command == 'search':
+        benchmark_search(args.meetings, args.minutes, args.queries, args.backend)
+
+
+if __name__ == "__main__":
+    main()
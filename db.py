@@ -3,27 +3,143 @@ MongoDB connection and database operations for the Meeting Summarizer
 """
 import os
 from datetime import datetime
-from typing import List, Dict, Optional
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutError
+from typing import List, Dict, Optional, Tuple
+from pymongo import MongoClient, IndexModel, ASCENDING, DESCENDING, TEXT, ReturnDocument, UpdateOne, ReplaceOne
+from pymongo.errors import BulkWriteError, ConnectionFailure, OperationFailure, ServerSelectionTimeoutError
 from bson import ObjectId
 import logging
 import streamlit as st
+from db_config import PoolMetrics, client_options, read_preference, redact_uri, write_concern
+from storage import (
+    DEFAULT_PAGE_SIZE, MEETING_LIST_FIELDS, OPEN_TASK_STATUSES, TASK_COUNTER_STATUSES,
+    TASK_LIST_FIELDS, StorageBackend, deadline_window, decode_page_token, encode_page_token,
+    pack_transcript_body, segment_buckets, segments_from_buckets, transcript_body_fields
+)
+from search import SEARCH_KINDS, TASK_SEARCH_FIELDS, TITLE_WEIGHT, search_entry, tokenize
+from text_codec import compress_text
 
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-class DatabaseManager:
+# Keyset pagination order for list queries: newest first, _id breaks ties
+PAGE_SORT = [('created_at', DESCENDING), ('_id', DESCENDING)]
+
+# Index registry: every hot query shape has an index with its equality fields
+# first, then its sort key, then its range fields. Created idempotently on connect.
+INDEXES = {
+    'tasks': [
+        # get_all_tasks(), get_tasks() without filters
+        IndexModel(PAGE_SORT, name='created_at_id_desc'),
+        # get_all_tasks(status), get_tasks({'status'}), status counts
+        IndexModel([('status', ASCENDING)] + PAGE_SORT, name='status_created_at_id'),
+        # get_tasks({'assignee'}) on the tasks page
+        IndexModel([('assignee', ASCENDING)] + PAGE_SORT, name='assignee_created_at_id'),
+        # get_tasks_by_meeting, get_tasks({'meeting_id'}) in exports
+        IndexModel([('meeting_id', ASCENDING)] + PAGE_SORT, name='meeting_id_created_at_id'),
+        # get_overdue_tasks, get_upcoming_tasks: status $in, deadline range and sort
+        IndexModel([('status', ASCENDING), ('actual_deadline', ASCENDING)], name='status_actual_deadline'),
+        # delete_transcript
+        IndexModel([('transcript_id', ASCENDING)], name='transcript_id'),
+    ],
+    'summaries': [
+        # get_recent_meetings, get_meetings_page
+        IndexModel(PAGE_SORT, name='created_at_id_desc'),
+        # delete_transcript
+        IndexModel([('transcript_id', ASCENDING)], name='transcript_id'),
+    ],
+    'transcripts': [
+        IndexModel(PAGE_SORT, name='created_at_id_desc'),
+    ],
+    'transcript_segments': [
+        # get_segments_in_range, save_transcript_segments, delete_transcript
+        IndexModel([('transcript_id', ASCENDING), ('start', ASCENDING)], name='transcript_id_start'),
+    ],
+    'search_index': [
+        # search: $text over titles and the distinct terms of each body
+        IndexModel([('title', TEXT), ('terms', TEXT)], weights={'title': int(TITLE_WEIGHT), 'terms': 1},
+                   default_language='english', name='search_text'),
+    ],
+}
+
+# Indexes superseded by the registry, dropped by ensure_indexes
+RETIRED_INDEXES = {
+    'tasks': ['created_at_desc', 'status_created_at', 'assignee_created_at', 'meeting_id_created_at'],
+    'summaries': ['created_at_desc'],
+    'transcripts': ['created_at_desc'],
+}
+
+# Representative query shapes checked by explain_query_plans: (name, collection, filter, sort)
+QUERY_SHAPES = [
+    ('get_all_tasks', 'tasks', {}, PAGE_SORT),
+    ('get_all_tasks(status)', 'tasks', {'status': 'pending'}, PAGE_SORT),
+    ('get_tasks(assignee)', 'tasks', {'assignee': 'TBD'}, PAGE_SORT),
+    ('get_tasks_by_meeting', 'tasks', {'meeting_id': ''}, PAGE_SORT),
+    ('get_tasks_page(next page)', 'tasks',
+     {'status': 'pending', 'created_at': {'$lte': datetime(2100, 1, 1)},
+      '$or': [{'created_at': {'$lt': datetime(2100, 1, 1)}}, {'_id': {'$lt': ObjectId('f' * 24)}}]},
+     PAGE_SORT),
+    ('get_overdue_tasks', 'tasks',
+     {'status': {'$in': ['pending', 'in_progress']}, 'actual_deadline': {'$lt': '9999-12-31'}}, [('actual_deadline', 1)]),
+    ('get_upcoming_tasks', 'tasks',
+     {'status': {'$in': ['pending', 'in_progress']}, 'actual_deadline': {'$gte': '0000-01-01', '$lte': '9999-12-31'}},
+     [('actual_deadline', 1)]),
+    ('delete_transcript(tasks)', 'tasks', {'transcript_id': ''}, None),
+    ('delete_transcript(summaries)', 'summaries', {'transcript_id': ''}, None),
+    ('get_recent_meetings', 'summaries', {}, PAGE_SORT),
+    ('recent transcripts', 'transcripts', {}, PAGE_SORT),
+    ('get_segments_in_range', 'transcript_segments',
+     {'transcript_id': '', 'start': {'$lt': 60.0}, 'end': {'$gt': 0.0}}, [('start', 1)]),
+    ('search', 'search_index', {'$text': {'$search': 'payment'}}, [('score', {'$meta': 'textScore'})]),
+]
+
+# search_index fields returned with each hit
+SEARCH_HIT_FIELDS = {'kind': 1, 'ref_id': 1, 'meeting_id': 1, 'title': 1, 'created_at': 1, 'body': 1,
+                     'score': {'$meta': 'textScore'}}
+
+
+def keyset_filter(page_token: str) -> Dict:
+    """
+    Filter selecting documents after a continuation token
+    
+    Raises:
+        ValueError: If the token is malformed
+    """
+    created_at, document_id = decode_page_token(page_token)
+    # The top-level bound keeps the index scan starting at the token's position
+    return {
+        'created_at': {'$lte': created_at},
+        '$or': [{'created_at': {'$lt': created_at}}, {'_id': {'$lt': document_id}}]
+    }
+
+def _plan_stages(plan) -> List[Dict]:
+    """Flatten an explain plan tree into its stages (stage name and index)"""
+    stages = []
+    if isinstance(plan, dict):
+        if 'stage' in plan:
+            stages.append({'stage': plan['stage'], 'index': plan.get('indexName')})
+        for value in plan.values():
+            stages.extend(_plan_stages(value))
+    elif isinstance(plan, list):
+        for value in plan:
+            stages.extend(_plan_stages(value))
+    return stages
+
+class DatabaseManager(StorageBackend):
     """Handles all MongoDB operations for the meeting summarizer"""
     
+    name = 'mongo'
+    
     def __init__(self):
         """Initialize database manager without connecting"""
+        super().__init__()
         self.client = None
         self.db = None
         self.database_name = os.getenv('DATABASE_NAME', 'meeting_summarizer')
-        self._connected = False
+        self.pool_metrics = PoolMetrics()
+        # Collection handles per (name, operation), configured once
+        self._collections = {}
     
     def connect(self):
         """Establish connection to MongoDB"""
@@ -33,51 +149,284 @@ class DatabaseManager:
         try:
             # Get MongoDB URI from Streamlit secrets
             mongo_uri = st.secrets["mongo"]["uri"]
-            print(f"🔌 Testing connection to: {mongo_uri}")
             logger.info("Using MongoDB URI from Streamlit secrets")
         except (KeyError, AttributeError):
             # Fallback to environment variable or localhost
             mongo_uri = os.getenv('MONGODB_URI', 'mongodb://localhost:27017/')
-            print(f"🔌 Testing connection to: {mongo_uri}")
             logger.info("Using MongoDB URI from environment variable or localhost")
         
+        logger.info(f"🔌 Testing connection to: {redact_uri(mongo_uri)}")
         try:
-            self.client = MongoClient(mongo_uri, serverSelectionTimeoutMS=5000, tls=True)
+            self.client = MongoClient(mongo_uri, **client_options([self.pool_metrics]))
             # Test connection
             self.client.admin.command('ping')
-            self.db = self.client.get_default_database()
+            self.db = self.client.get_default_database(self.database_name)
             self._connected = True
-            print("✅ MongoDB Atlas connection successful!")
             logger.info(f"✅ Successfully connected to MongoDB Atlas: {self.db.name}")
+            if os.getenv('DB_ENSURE_INDEXES', 'true').lower() in ('1', 'true', 'yes'):
+                self.ensure_indexes()
         except (ConnectionFailure, ServerSelectionTimeoutError) as e:
             logger.error(f"❌ Failed to connect to MongoDB: {e}")
-            logger.error(f"MongoDB URI being used: {mongo_uri}")
+            logger.error(f"MongoDB URI being used: {redact_uri(mongo_uri)}")
             raise RuntimeError(f"❌ Could not connect to MongoDB: {e}")
         except Exception as e:
             logger.error(f"❌ Unexpected error connecting to MongoDB: {e}")
             raise RuntimeError(f"❌ Could not connect to MongoDB: {e}")
     
-    def get_collection(self, collection_name: str):
-        """Get a collection from the database"""
+    def ensure_indexes(self) -> Dict[str, List[str]]:
+        """
+        Create every index in the INDEXES registry
+        
+        Safe to call on every start: indexes that already exist with the same
+        keys and options are left alone. Index builds do not block reads or writes.
+        
+        Returns:
+            Dictionary mapping collection name to the index names ensured
+        """
+        created = {}
+        for collection_name, indexes in INDEXES.items():
+            try:
+                created[collection_name] = self.db[collection_name].create_indexes(indexes)
+            except OperationFailure as e:
+                # An index with the same name but other keys or options exists
+                logger.warning(f"Could not create indexes on {collection_name}: {e}")
+                created[collection_name] = []
+        # Drop superseded indexes only once their replacements exist
+        for collection_name, names in RETIRED_INDEXES.items():
+            if not created.get(collection_name):
+                continue
+            for name in set(self.db[collection_name].index_information()).intersection(names):
+                self.db[collection_name].drop_index(name)
+                logger.info(f"Dropped superseded index {collection_name}.{name}")
+        logger.info(f"Ensured {sum(len(names) for names in created.values())} indexes")
+        return created
+    
+    def explain_query_plans(self) -> List[Dict]:
+        """
+        Explain each hot query shape and flag any that still scan a whole collection
+        
+        Returns:
+            List of dictionaries with 'query', 'collection', 'stages',
+            'indexes' and 'collscan' (True if the winning plan has a COLLSCAN)
+        """
+        report = []
+        for name, collection_name, query, sort in QUERY_SHAPES:
+            cursor = self.get_collection(collection_name).find(query).limit(1)
+            if sort:
+                cursor = cursor.sort(sort)
+            planner = cursor.explain().get('queryPlanner', {})
+            stages = _plan_stages(planner.get('winningPlan', {}))
+            collscan = any(stage['stage'] == 'COLLSCAN' for stage in stages)
+            if collscan:
+                logger.warning(f"Query {name} on {collection_name} does a COLLSCAN")
+            report.append({
+                'query': name,
+                'collection': collection_name,
+                'stages': [stage['stage'] for stage in stages],
+                'indexes': sorted({stage['index'] for stage in stages if stage['index']}),
+                'collscan': collscan
+            })
+        return report
+    
+    def get_collection(self, collection_name: str, operation: Optional[str] = None):
+        """
+        Get a collection from the database
+        
+        Args:
+            collection_name: Collection name
+            operation: Kind of read ('dashboard', 'export', 'analytics') that
+                may be routed to secondaries; None reads from the primary
+                
+        Returns:
+            Collection with the configured read preference and write concern
+        """
         if not self._connected:
             raise RuntimeError("Database not connected. Call connect() first.")
-        return self.db[collection_name]
+        key = (collection_name, operation)
+        collection = self._collections.get(key)
+        if collection is None:
+            collection = self.db.get_collection(
+                collection_name,
+                read_preference=read_preference(operation),
+                write_concern=write_concern(collection_name)
+            )
+            self._collections[key] = collection
+        return collection
+    
+    def get_pool_metrics(self) -> Dict:
+        """Connection pool checkout counts and wait times"""
+        return self.pool_metrics.get_metrics()
+    
+    def find_page(self, collection_name: str, query: Optional[Dict] = None, projection: Optional[List[str]] = None,
+                  page_size: int = DEFAULT_PAGE_SIZE, page_token: Optional[str] = None,
+                  operation: Optional[str] = None) -> Dict:
+        """
+        One page of a list query, newest first
+        
+        Pages continue from the last document's (created_at, _id) rather than
+        skipping, so every page is one index seek whatever its position.
+        
+        Args:
+            collection_name: Collection to list
+            query: Filter
+            projection: Fields to return (None for whole documents)
+            page_size: Documents per page
+            page_token: Token from the previous page, or None for the first page
+            operation: Kind of read for read-preference routing (see get_collection)
+            
+        Returns:
+            Dictionary with 'items' and 'next_page_token' (None on the last page)
+        """
+        query = dict(query or {})
+        if page_token:
+            query = {'$and': [query, keyset_filter(page_token)]} if query else keyset_filter(page_token)
+        fields = None if projection is None else dict.fromkeys([*projection, 'created_at'], 1)
+        cursor = (self.get_collection(collection_name, operation)
+                  .find(query, fields).sort(PAGE_SORT).limit(page_size + 1))
+        items = list(cursor)
+        next_page_token = encode_page_token(items[page_size - 1]) if len(items) > page_size else None
+        return {'items': items[:page_size], 'next_page_token': next_page_token}
+    
+    def iter_pages(self, collection_name: str, query: Optional[Dict] = None, projection: Optional[List[str]] = None,
+                   page_size: int = DEFAULT_PAGE_SIZE, operation: Optional[str] = None):
+        """Yield every matching document page by page (for exports of whole collections)"""
+        page_token = None
+        while True:
+            page = self.find_page(collection_name, query, projection, page_size, page_token, operation)
+            yield from page['items']
+            page_token = page['next_page_token']
+            if page_token is None:
+                return
     
     def save_transcript(self, transcript_data: Dict) -> str:
         """
         Save raw transcript to MongoDB
         
+        The text is stored compressed in transcript_bodies under the
+        transcript's _id, so reads of the metadata never transfer it.
+        
         Args:
             transcript_data: Dictionary containing transcript information
             
         Returns:
             str: Document ID of the saved transcript
         """
-        collection = self.get_collection('transcripts')
         transcript_data['created_at'] = datetime.utcnow()
-        result = collection.insert_one(transcript_data)
-        logger.info(f"Saved transcript with ID: {result.inserted_id}")
-        return str(result.inserted_id)
+        transcript_data.setdefault('_id', ObjectId())
+        metadata, body = pack_transcript_body(transcript_data)
+        if body is not None:
+            # Body first: a transcript is never visible without its text
+            self._save_transcript_body(transcript_data['_id'], body)
+        self.get_collection('transcripts').insert_one(metadata)
+        if body is not None:
+            self._index_search([search_entry('transcript', metadata, transcript_data['text'])])
+        self._invalidate_transcript(transcript_data['_id'])
+        logger.info(f"Saved transcript with ID: {transcript_data['_id']}")
+        return str(transcript_data['_id'])
+    
+    def _save_transcript_body(self, transcript_id, body: Dict):
+        self.get_collection('transcript_bodies').replace_one(
+            {'_id': ObjectId(transcript_id)}, {'codec': body['codec'], 'data': body['data']}, upsert=True
+        )
+    
+    def append_transcript_segments(self, transcript_id: str, segments: List[Dict]) -> bool:
+        """
+        Append committed segments (and their text) to a live transcript
+        
+        Args:
+            transcript_id: ID of the live transcript
+            segments: Segments with 'start', 'end' and 'text'
+            
+        Returns:
+            bool: True if the transcript was updated
+        """
+        if not segments:
+            return True
+        try:
+            collection = self.get_collection('transcripts')
+            new_text = ''.join(segment['text'] for segment in segments)
+            # Pipeline update so text and segments grow in one atomic write;
+            # $literal keeps user text such as "$5" from being read as a field path
+            result = collection.update_one(
+                {'_id': ObjectId(transcript_id)},
+                [{'$set': {
+                    'text': {'$concat': [{'$ifNull': ['$text', '']}, {'$literal': new_text}]},
+                    'segments': {'$concatArrays': [{'$ifNull': ['$segments', []]}, {'$literal': segments}]},
+                    'updated_at': datetime.utcnow()
+                }}]
+            )
+            self._invalidate_transcript(transcript_id)
+            return result.modified_count > 0
+        except Exception as e:
+            logger.error(f"Error appending segments to transcript {transcript_id}: {e}")
+            return False
+    
+    def finalize_live_transcript(self, transcript_id: str, language: Optional[str] = None) -> bool:
+        """Mark a live transcript as complete"""
+        try:
+            collection = self.get_collection('transcripts')
+            transcript = collection.find_one({'_id': ObjectId(transcript_id)})
+            if transcript is None:
+                return False
+            if transcript.get('segments'):
+                # Move the segments appended during the stream into columnar storage
+                self.save_transcript_segments(transcript_id, transcript['segments'])
+            # Pack the text streamed inline into a compressed body
+            text = transcript.get('text') or ''
+            body = compress_text(text)
+            self._save_transcript_body(transcript_id, body)
+            updates = {'status': 'completed', 'updated_at': datetime.utcnow(), **transcript_body_fields(text, body)}
+            if language:
+                updates['language'] = language
+            result = collection.update_one(
+                {'_id': ObjectId(transcript_id)},
+                {'$set': updates, '$unset': {'segments': '', 'text': ''}}
+            )
+            self._index_search([search_entry('transcript', transcript, text)])
+            self._invalidate_transcript(transcript_id)
+            return result.modified_count > 0
+        except Exception as e:
+            logger.error(f"Error finalizing transcript {transcript_id}: {e}")
+            return False
+    
+    def save_transcript_segments(self, transcript_id: str, segments) -> int:
+        """
+        Persist timed segments in compact columnar buckets (see storage.segment_buckets)
+        
+        Args:
+            transcript_id: ID of the transcript the segments belong to
+            segments: SegmentStore or list of segment dictionaries (sorted by start)
+            
+        Returns:
+            int: Number of bucket documents written
+        """
+        buckets = segment_buckets(transcript_id, segments)
+        if not buckets:
+            return 0
+        collection = self.get_collection('transcript_segments')
+        collection.delete_many({'transcript_id': transcript_id})
+        collection.insert_many(buckets)
+        logger.info(f"Saved {len(segments)} segments in {len(buckets)} buckets for transcript {transcript_id}")
+        return len(buckets)
+    
+    def get_segments_in_range(self, transcript_id: str, start: float = 0.0, end: float = float('inf')) -> List[Dict]:
+        """
+        Get the segments of a transcript that overlap a time range
+        
+        Only the buckets whose span overlaps the range are fetched; the
+        transcript document itself is never read.
+        
+        Args:
+            transcript_id: ID of the transcript
+            start: Range start in seconds
+            end: Range end in seconds
+            
+        Returns:
+            List of segment dictionaries ordered by time
+        """
+        collection = self.get_collection('transcript_segments')
+        query = {'transcript_id': transcript_id, 'start': {'$lt': end}, 'end': {'$gt': start}}
+        return segments_from_buckets(collection.find(query, {'created_at': 0}).sort('start', 1), start, end)
     
     def save_summary(self, summary_data: Dict) -> str:
         """
@@ -92,6 +441,8 @@ class DatabaseManager:
         collection = self.get_collection('summaries')
         summary_data['created_at'] = datetime.utcnow()
         result = collection.insert_one(summary_data)
+        self._index_search([search_entry('summary', summary_data)])
+        self._invalidate_summary(result.inserted_id)
         logger.info(f"Saved summary with ID: {result.inserted_id}")
         return str(result.inserted_id)
     
@@ -108,87 +459,314 @@ class DatabaseManager:
         collection = self.get_collection('tasks')
         task_data['created_at'] = datetime.utcnow()
         result = collection.insert_one(task_data)
+        self._apply_task_counters([(None, task_data)])
+        self._index_search([search_entry('task', task_data)])
+        self._invalidate_tasks()
         logger.info(f"Saved task with ID: {result.inserted_id}")
         return str(result.inserted_id)
     
-    def get_transcript(self, transcript_id: str) -> Optional[Dict]:
-        """Get a transcript by ID"""
+    def _find_by_id(self, collection_name: str, document_id: str, operation: Optional[str] = None,
+                    projection: Optional[Dict] = None) -> Optional[Dict]:
+        """Find a document by ID, retrying on the primary if a secondary has not seen it yet"""
+        query = {'_id': ObjectId(document_id)}
+        document = self.get_collection(collection_name, operation).find_one(query, projection)
+        if document is None and operation is not None:
+            document = self.get_collection(collection_name).find_one(query, projection)
+        return document
+    
+    def save_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        """
+        Save many tasks in one unordered bulk insert
+        
+        A failing document does not stop the others.
+        
+        Args:
+            tasks: Task documents
+            
+        Returns:
+            List aligned with `tasks` of dictionaries with 'task_id' (None on
+            failure) and 'error' (None on success)
+        """
+        if not tasks:
+            return []
+        now = datetime.utcnow()
+        for task in tasks:
+            task['created_at'] = now
+        errors = {}
         try:
-            collection = self.get_collection('transcripts')
-            return collection.find_one({'_id': ObjectId(transcript_id)})
+            self.get_collection('tasks').insert_many(tasks, ordered=False)
+        except BulkWriteError as e:
+            errors = {error['index']: error.get('errmsg', 'write failed') for error in e.details.get('writeErrors', [])}
+            if e.details.get('writeConcernErrors'):
+                logger.warning(f"Bulk task insert write concern errors: {e.details['writeConcernErrors']}")
+        # insert_many assigns every _id before sending, so inserted documents carry theirs
+        results = [
+            {'task_id': None, 'error': errors[index]} if index in errors else {'task_id': str(task['_id']), 'error': None}
+            for index, task in enumerate(tasks)
+        ]
+        saved = [task for index, task in enumerate(tasks) if index not in errors]
+        self._apply_task_counters([(None, task) for task in saved])
+        self._index_search([search_entry('task', task) for task in saved])
+        self._invalidate_tasks()
+        logger.info(f"Saved {len(tasks) - len(errors)} of {len(tasks)} tasks in bulk")
+        return results
+    
+    def _load_transcript(self, transcript_id: str, operation: Optional[str] = None) -> Optional[Dict]:
+        """Read a transcript's metadata by ID"""
+        try:
+            return self._find_by_id('transcripts', transcript_id, operation, {'text': 0})
         except Exception as e:
             logger.error(f"Error getting transcript {transcript_id}: {e}")
             return None
     
-    def get_summary(self, summary_id: str) -> Optional[Dict]:
-        """Get a summary by ID"""
+    def _load_transcript_body(self, transcript_id: str, operation: Optional[str] = None) -> Optional[Dict]:
+        """Read a transcript's compressed body, or its inline text (live and older transcripts)"""
+        try:
+            body = self._find_by_id('transcript_bodies', transcript_id, operation)
+            if body is not None:
+                return body
+            inline = self._find_by_id('transcripts', transcript_id, operation, {'text': 1})
+            if inline is None:
+                return None
+            return {'codec': 'none', 'data': (inline.get('text') or '').encode('utf-8')}
+        except Exception as e:
+            logger.error(f"Error getting transcript text {transcript_id}: {e}")
+            return None
+    
+    def get_task(self, task_id: str) -> Optional[Dict]:
+        """Get a task by ID"""
+        try:
+            return self._find_by_id('tasks', task_id)
+        except Exception as e:
+            logger.error(f"Error getting task {task_id}: {e}")
+            return None
+    
+    def _load_summary(self, summary_id: str, operation: Optional[str] = None) -> Optional[Dict]:
+        """Read a summary by ID"""
         try:
-            collection = self.get_collection('summaries')
-            return collection.find_one({'_id': ObjectId(summary_id)})
+            return self._find_by_id('summaries', summary_id, operation)
         except Exception as e:
             logger.error(f"Error getting summary {summary_id}: {e}")
             return None
     
-    def get_all_tasks(self, status: Optional[str] = None) -> List[Dict]:
+    def get_tasks_page(self, filters: Optional[Dict] = None, projection: Optional[List[str]] = TASK_LIST_FIELDS,
+                       page_size: int = DEFAULT_PAGE_SIZE, page_token: Optional[str] = None,
+                       operation: Optional[str] = None) -> Dict:
         """
-        Get all tasks, optionally filtered by status
+        One page of tasks, newest first
         
         Args:
-            status: Optional status filter ('pending', 'completed', etc.)
+            filters: Optional filters (status, assignee, priority, meeting_id)
+            projection: Fields to return (defaults to the task list fields)
+            page_size: Tasks per page
+            page_token: Token from the previous page
+            operation: Kind of read for read-preference routing (see get_collection)
             
         Returns:
-            List of task documents
+            Dictionary with 'items' and 'next_page_token'
         """
-        collection = self.get_collection('tasks')
-        query = {} if status is None else {'status': status}
-        return list(collection.find(query).sort('created_at', -1))
+        return self.find_page('tasks', filters, projection, page_size, page_token, operation)
     
-    def get_tasks_by_meeting(self, meeting_id: str) -> List[Dict]:
-        """Get all tasks for a specific meeting"""
-        collection = self.get_collection('tasks')
-        return list(collection.find({'meeting_id': meeting_id}).sort('created_at', -1))
-    
-    def update_task_status(self, task_id: str, status: str) -> bool:
+    def update_task(self, task_id: str, updates: Dict) -> bool:
         """
-        Update task status
+        Update task fields and keep the task counters in step
         
         Args:
             task_id: ID of the task to update
-            status: New status ('pending', 'completed', etc.)
+            updates: Fields to set
             
         Returns:
-            bool: True if update was successful
+            bool: True if the task exists
         """
         try:
             collection = self.get_collection('tasks')
-            result = collection.update_one(
+            before = collection.find_one_and_update(
                 {'_id': ObjectId(task_id)},
-                {'$set': {'status': status, 'updated_at': datetime.utcnow()}}
+                {'$set': {**updates, 'updated_at': datetime.utcnow()}},
+                projection={'status': 1, 'assignee': 1},
+                return_document=ReturnDocument.BEFORE
             )
-            return result.modified_count > 0
+            if before is None:
+                return False
+            self._invalidate_tasks()
+            if 'status' in updates or 'assignee' in updates:
+                self._apply_task_counters([(before, {**before, **updates})])
+            if any(field in updates for field in TASK_SEARCH_FIELDS):
+                task = collection.find_one({'_id': ObjectId(task_id)})
+                if task is not None:
+                    self._index_search([search_entry('task', task)])
+            return True
         except Exception as e:
             logger.error(f"Error updating task {task_id}: {e}")
             return False
     
-    def get_recent_meetings(self, limit: int = 10) -> List[Dict]:
-        """Get recent meetings with their summaries"""
-        collection = self.get_collection('summaries')
-        return list(collection.find().sort('created_at', -1).limit(limit))
+    def delete_task(self, task_id: str) -> bool:
+        """
+        Delete a task and remove it from the task counters
+        
+        Args:
+            task_id: ID of the task to delete
+            
+        Returns:
+            bool: True if the task existed
+        """
+        try:
+            collection = self.get_collection('tasks')
+            before = collection.find_one_and_delete({'_id': ObjectId(task_id)}, projection={'status': 1, 'assignee': 1})
+            if before is None:
+                return False
+            self._apply_task_counters([(before, None)])
+            self._unindex_search([('task', task_id)])
+            self._invalidate_tasks()
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting task {task_id}: {e}")
+            return False
+    
+    def delete_tasks_by_meeting(self, meeting_id: str) -> int:
+        """Delete every task of a meeting and remove them from the task counters"""
+        collection = self.get_collection('tasks')
+        removed_tasks = list(collection.find({'meeting_id': meeting_id}, {'status': 1, 'assignee': 1}))
+        collection.delete_many({'_id': {'$in': [task['_id'] for task in removed_tasks]}})
+        self._apply_task_counters([(task, None) for task in removed_tasks])
+        self._unindex_search([('task', task['_id']) for task in removed_tasks])
+        self._invalidate_tasks()
+        return len(removed_tasks)
+    
+    def get_overdue_tasks(self) -> List[Dict]:
+        """Get open tasks whose deadline has passed, earliest deadline first"""
+        today_str, _ = deadline_window(0)
+        return list(self.get_collection('tasks').find({
+            'status': {'$in': OPEN_TASK_STATUSES},
+            'actual_deadline': {'$lt': today_str}
+        }).sort('actual_deadline', 1))
+    
+    def get_upcoming_tasks(self, days_ahead: int = 7) -> List[Dict]:
+        """Get open tasks due within `days_ahead` days, earliest deadline first"""
+        today_str, future_str = deadline_window(days_ahead)
+        return list(self.get_collection('tasks').find({
+            'status': {'$in': OPEN_TASK_STATUSES},
+            'actual_deadline': {'$gte': today_str, '$lte': future_str}
+        }).sort('actual_deadline', 1))
+    
+    def _apply_task_counters(self, changes: List[Tuple[Optional[Dict], Optional[Dict]]]):
+        """Apply task changes to the task_stats counters with atomic $inc upserts"""
+        deltas = self._counter_deltas(changes)
+        if not deltas:
+            return
+        operations = []
+        for scope, increments in deltas.items():
+            update = {'$inc': increments}
+            if scope != 'global':
+                update['$set'] = {'assignee': scope.split(':', 1)[1]}
+            operations.append(UpdateOne({'_id': scope}, update, upsert=True))
+        try:
+            self.get_collection('task_stats').bulk_write(operations, ordered=False)
+        except Exception as e:
+            # The task write already succeeded; reconciliation corrects the drift
+            logger.warning(f"Could not update task counters: {e}")
+    
+    def reconcile_task_stats(self) -> Dict:
+        """
+        Recompute the task_stats counters from the tasks collection
+        
+        Corrects drift from failed counter updates or writes made outside
+        DatabaseManager. Increments racing with the recount may be lost until the next run.
+        
+        Returns:
+            The recomputed global counters
+        """
+        pipeline = [{'$group': {'_id': {'assignee': '$assignee', 'status': '$status'}, 'count': {'$sum': 1}}}]
+        counters = {'global': {'_id': 'global', 'total': 0, **{status: 0 for status in TASK_COUNTER_STATUSES}}}
+        for group in self.get_collection('tasks').aggregate(pipeline):
+            assignee = group['_id'].get('assignee') or 'TBD'
+            scope = f"assignee:{assignee}"
+            if scope not in counters:
+                counters[scope] = {'_id': scope, 'assignee': assignee, 'total': 0,
+                                   **{status: 0 for status in TASK_COUNTER_STATUSES}}
+            for document in (counters['global'], counters[scope]):
+                document['total'] += group['count']
+                if group['_id'].get('status') in TASK_COUNTER_STATUSES:
+                    document[group['_id']['status']] += group['count']
+        
+        collection = self.get_collection('task_stats')
+        collection.bulk_write(
+            [ReplaceOne({'_id': scope}, {**document, 'reconciled_at': datetime.utcnow()}, upsert=True)
+             for scope, document in counters.items()],
+            ordered=False
+        )
+        collection.delete_many({'_id': {'$nin': list(counters)}})
+        logger.info(f"Reconciled task counters for {len(counters) - 1} assignees")
+        return counters['global']
+    
+    def get_assignee_workload(self, operation: Optional[str] = None) -> List[Dict]:
+        """
+        Per-assignee task counters, busiest first
+        
+        Args:
+            operation: Kind of read for read-preference routing (see get_collection)
+            
+        Returns:
+            List of dictionaries with 'assignee', 'total' and a count per status
+        """
+        collection = self.get_collection('task_stats', operation)
+        return list(collection.find({'_id': {'$ne': 'global'}, 'total': {'$gt': 0}}, {'_id': 0, 'reconciled_at': 0})
+                    .sort([('pending', -1), ('in_progress', -1)]))
+    
+    def get_meetings_page(self, projection: Optional[List[str]] = MEETING_LIST_FIELDS,
+                          page_size: int = DEFAULT_PAGE_SIZE, page_token: Optional[str] = None,
+                          operation: Optional[str] = None) -> Dict:
+        """
+        One page of meeting summaries, newest first
+        
+        Args:
+            projection: Fields to return (defaults to the meeting list fields)
+            page_size: Meetings per page
+            page_token: Token from the previous page
+            operation: Kind of read for read-preference routing (see get_collection)
+            
+        Returns:
+            Dictionary with 'items' and 'next_page_token'
+        """
+        return self.find_page('summaries', None, projection, page_size, page_token, operation)
     
     def delete_transcript(self, transcript_id: str) -> bool:
         """Delete a transcript and related data"""
         try:
             # Delete transcript
             transcripts_collection = self.get_collection('transcripts')
-            transcripts_collection.delete_one({'_id': ObjectId(transcript_id)})
+            transcript = transcripts_collection.find_one_and_delete(
+                {'_id': ObjectId(transcript_id)}, projection={'media_id': 1, 'media_store': 1}
+            )
+            
+            self.get_collection('transcript_bodies').delete_one({'_id': ObjectId(transcript_id)})
             
             # Delete related summaries
             summaries_collection = self.get_collection('summaries')
+            removed_summaries = list(summaries_collection.find({'transcript_id': transcript_id}, {'_id': 1}))
             summaries_collection.delete_many({'transcript_id': transcript_id})
             
             # Delete related tasks
             tasks_collection = self.get_collection('tasks')
+            removed_tasks = list(tasks_collection.find({'transcript_id': transcript_id}, {'status': 1, 'assignee': 1}))
             tasks_collection.delete_many({'transcript_id': transcript_id})
+            self._apply_task_counters([(task, None) for task in removed_tasks])
+            
+            self._unindex_search([('transcript', transcript_id),
+                                  *(('summary', summary['_id']) for summary in removed_summaries),
+                                  *(('task', task['_id']) for task in removed_tasks)])
+            
+            # Delete stored segments
+            segments_collection = self.get_collection('transcript_segments')
+            segments_collection.delete_many({'transcript_id': transcript_id})
+            
+            self._invalidate_transcript(transcript_id)
+            self._invalidate_tasks()
+            
+            # Delete the stored original media from the store it was saved in
+            if transcript and transcript.get('media_id'):
+                from media_store import delete_media
+                delete_media(transcript['media_id'], transcript.get('media_store'))
             
             logger.info(f"Deleted transcript and related data: {transcript_id}")
             return True
@@ -196,26 +774,170 @@ class DatabaseManager:
             logger.error(f"Error deleting transcript {transcript_id}: {e}")
             return False
     
-    def get_database_stats(self) -> Dict:
-        """Get database statistics"""
+    def _index_search(self, entries: List[Dict]):
+        """
+        Upsert search entries (see search.search_entry) into search_index
+        
+        The text index covers each body's distinct terms rather than the body
+        itself; summary and task bodies are kept compressed for snippets,
+        transcript bodies are read from transcript_bodies.
+        """
+        if not entries:
+            return
+        operations = []
+        for entry in entries:
+            document = {key: value for key, value in entry.items() if key != 'text'}
+            document['terms'] = list(dict.fromkeys(tokenize(entry['text'])))
+            if entry['kind'] != 'transcript':
+                body = compress_text(entry['text'])
+                document['body'] = {'codec': body['codec'], 'data': body['data']}
+            operations.append(ReplaceOne({'_id': f"{entry['kind']}:{entry['ref_id']}"}, document, upsert=True))
+        try:
+            self.get_collection('search_index').bulk_write(operations, ordered=False)
+        except Exception as e:
+            # The index is derived data: rebuild_search_index() repairs it
+            logger.error(f"Error indexing {len(entries)} documents for search: {e}")
+    
+    def _unindex_search(self, keys: List[Tuple[str, str]]):
+        """Remove search entries by (kind, ref_id)"""
+        if not keys:
+            return
+        try:
+            self.get_collection('search_index').delete_many(
+                {'_id': {'$in': [f"{kind}:{ref_id}" for kind, ref_id in keys]}}
+            )
+        except Exception as e:
+            logger.error(f"Error removing {len(keys)} documents from the search index: {e}")
+    
+    def _search_hits(self, terms: List[str], kinds: List[str], offset: int, limit: int) -> List[Dict]:
+        """Ranked hits from the search_index text index; any term may match"""
+        query = {'$text': {'$search': ' '.join(terms)}}
+        if set(kinds) != set(SEARCH_KINDS):
+            query['kind'] = {'$in': kinds}
+        cursor = self.get_collection('search_index', 'search').find(query, SEARCH_HIT_FIELDS).sort(
+            [('score', {'$meta': 'textScore'}), ('_id', ASCENDING)]
+        ).skip(offset).limit(limit)
+        return [{
+            'kind': document['kind'],
+            'id': document['ref_id'],
+            'meeting_id': document.get('meeting_id'),
+            'title': document['title'],
+            'created_at': document.get('created_at'),
+            'score': document['score'],
+            'body': document.get('body')
+        } for document in cursor]
+    
+    def rebuild_search_index(self) -> int:
+        """
+        Re-index every completed transcript, summary and task
+        
+        Returns:
+            int: Number of search entries written
+        """
+        self.get_collection('search_index').delete_many({})
+        count = 0
+        for transcript in self.get_collection('transcripts').find({'status': {'$ne': 'live'}}, {'text': 0, 'segments': 0}):
+            text = self.get_transcript_text(str(transcript['_id']))
+            if text is not None:
+                self._index_search([search_entry('transcript', transcript, text)])
+                count += 1
+        for collection_name, kind in (('summaries', 'summary'), ('tasks', 'task')):
+            batch = []
+            for document in self.get_collection(collection_name).find():
+                batch.append(search_entry(kind, document))
+                if len(batch) == 500:
+                    self._index_search(batch)
+                    count, batch = count + len(batch), []
+            self._index_search(batch)
+            count += len(batch)
+        logger.info(f"Rebuilt the search index with {count} entries")
+        return count
+    
+    def get_task_statistics(self, days_ahead: int = 7, operation: Optional[str] = None) -> Dict:
+        """
+        Get all task counters
+        
+        Status counters are read from the task_stats document maintained on
+        every task write (zeros until it exists; the scheduled recount builds
+        it for databases created before the counters). Overdue and upcoming tasks depend on today's date,
+        so one $facet pass counts them over the open tasks due before the
+        window's end, found through the status/deadline index.
+        
+        Args:
+            days_ahead: Window for the upcoming counter
+            operation: Kind of read for read-preference routing (see get_collection)
+            
+        Returns:
+            Dictionary with 'total_tasks', 'pending_tasks', 'in_progress_tasks',
+            'completed_tasks', 'overdue_tasks' and 'upcoming_tasks'
+        """
+        today_str, future_str = deadline_window(days_ahead)
+        counters = self.get_collection('task_stats', operation).find_one({'_id': 'global'})
+        if counters is None:
+            # Recounting here would turn a dashboard read into a scan and a write
+            logger.warning("Task counters not found (no tasks yet, or a database from before them); "
+                           "reporting zeros until the scheduled reconcile_task_stats() runs")
+            counters = {}
+        pipeline = [
+            {'$match': {'status': {'$in': OPEN_TASK_STATUSES}, 'actual_deadline': {'$lte': future_str}}},
+            {'$facet': {
+                'overdue': [{'$match': {'actual_deadline': {'$lt': today_str}}}, {'$count': 'count'}],
+                'upcoming': [{'$match': {'actual_deadline': {'$gte': today_str}}}, {'$count': 'count'}]
+            }}
+        ]
+        facets = next(self.get_collection('tasks', operation).aggregate(pipeline))
+        return {
+            'total_tasks': counters.get('total', 0),
+            'pending_tasks': counters.get('pending', 0),
+            'in_progress_tasks': counters.get('in_progress', 0),
+            'completed_tasks': counters.get('completed', 0),
+            'overdue_tasks': facets['overdue'][0]['count'] if facets['overdue'] else 0,
+            'upcoming_tasks': facets['upcoming'][0]['count'] if facets['upcoming'] else 0
+        }
+    
+    def get_database_stats(self, operation: Optional[str] = 'dashboard') -> Dict:
+        """Get database statistics (read from secondaries when the dashboard read preference allows)"""
+        task_stats = self.get_task_statistics(operation=operation)
         stats = {
-            'transcripts': self.get_collection('transcripts').count_documents({}),
-            'summaries': self.get_collection('summaries').count_documents({}),
-            'tasks': self.get_collection('tasks').count_documents({}),
-            'pending_tasks': self.get_collection('tasks').count_documents({'status': 'pending'}),
-            'completed_tasks': self.get_collection('tasks').count_documents({'status': 'completed'})
+            # Collection metadata counts: no documents are read
+            'transcripts': self.get_collection('transcripts', operation).estimated_document_count(),
+            'summaries': self.get_collection('summaries', operation).estimated_document_count(),
+            'tasks': task_stats['total_tasks'],
+            'pending_tasks': task_stats['pending_tasks'],
+            'in_progress_tasks': task_stats['in_progress_tasks'],
+            'completed_tasks': task_stats['completed_tasks'],
+            'overdue_tasks': task_stats['overdue_tasks']
         }
         return stats
     
+    def ping(self) -> bool:
+        """Check that the database answers"""
+        try:
+            self.client.admin.command('ping')
+            return True
+        except Exception as e:
+            logger.error(f"Database ping failed: {e}")
+            return False
+    
     def close_connection(self):
         """Close database connection"""
         if self.client:
             self.client.close()
             logger.info("Database connection closed")
 
+def _create_storage() -> StorageBackend:
+    """Storage backend chosen by $STORAGE_BACKEND ('mongo' or 'sqlite')"""
+    backend = os.getenv('STORAGE_BACKEND', 'mongo').lower()
+    if backend == 'sqlite':
+        from sqlite_storage import SQLiteStorage
+        return SQLiteStorage()
+    if backend != 'mongo':
+        logger.warning(f"Unknown storage backend {backend}; using MongoDB")
+    return DatabaseManager()
+
 # Global database instance
-db_manager = DatabaseManager()
+db_manager = _create_storage()
 
-def get_db_manager() -> DatabaseManager:
+def get_db_manager() -> StorageBackend:
     """Get the global database manager instance"""
-    return db_manager
\ No newline at end of file
+    return db_manager
@@ -0,0 +1,245 @@
+"""
+MongoDB connection configuration for the Meeting Summarizer
+Pool sizing, compression, per-operation read preferences, per-collection write concerns and pool metrics
+"""
+import os
+import re
+import time
+import logging
+import threading
+from collections import deque
+from typing import Dict, List, Optional
+from pymongo import monitoring
+from pymongo.read_preferences import (
+    Nearest, Primary, PrimaryPreferred, Secondary, SecondaryPreferred, ReadPreference
+)
+from pymongo.write_concern import WriteConcern
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+READ_PREFERENCE_MODES = {
+    'primary': Primary,
+    'primaryPreferred': PrimaryPreferred,
+    'secondary': Secondary,
+    'secondaryPreferred': SecondaryPreferred,
+    'nearest': Nearest
+}
+
+# Read preference per kind of read; override with $MONGO_READ_PREFERENCE_<OPERATION>.
+# Reads that must see the caller's own writes stay on the primary.
+DEFAULT_READ_PREFERENCES = {
+    'default': 'primary',
+    'dashboard': 'secondaryPreferred',
+    'export': 'secondaryPreferred',
+    'analytics': 'secondaryPreferred',
+    'search': 'secondaryPreferred'
+}
+
+# Write concern per collection; override with $MONGO_WRITE_CONCERN_<COLLECTION> ('majority' or a number).
+# Derived data that can be rebuilt is acknowledged by the primary only.
+DEFAULT_WRITE_CONCERNS = {
+    'transcripts': 'majority',
+    'transcript_bodies': 'majority',
+    'summaries': 'majority',
+    'tasks': 'majority',
+    'transcript_segments': '1',
+    'task_stats': '1',
+    'search_index': '1'
+}
+
+# Wire compressors and the optional module each needs on the client side
+COMPRESSOR_MODULES = {'zstd': 'zstandard', 'snappy': 'snappy', 'zlib': 'zlib'}
+
+# Checkout waits kept for percentile metrics
+POOL_METRICS_WINDOW = 1000
+
+
+def redact_uri(uri: str) -> str:
+    """Hide the password in a MongoDB URI for logging"""
+    return re.sub(r'(://[^:/@]+):[^/]*@', r'\1:***@', uri)
+
+
+def available_compressors(requested: str) -> List[str]:
+    """
+    Wire compressors from a comma-separated list whose client library is installed
+
+    Args:
+        requested: Compressors in order of preference, e.g. 'zstd,snappy,zlib'
+
+    Returns:
+        List of usable compressor names
+    """
+    compressors = []
+    for name in (part.strip() for part in requested.split(',')):
+        if not name:
+            continue
+        module = COMPRESSOR_MODULES.get(name)
+        if module is None:
+            logger.warning(f"Unknown MongoDB compressor: {name}")
+            continue
+        if _compressor_installed(name, module):
+            compressors.append(name)
+        else:
+            logger.info(f"MongoDB compressor {name} skipped: install pymongo[{name}] to enable it")
+    return compressors
+
+
+def _compressor_installed(name: str, module: str) -> bool:
+    # Ask pymongo itself where it can: newer releases read zstd from backports.zstd, not zstandard
+    try:
+        from pymongo import compression_support
+        check = getattr(compression_support, f"_have_{name}", None)
+        if check is not None:
+            return bool(check())
+    except ImportError:
+        pass
+    try:
+        __import__(module)
+        return True
+    except ImportError:
+        return False
+
+
+def client_options(event_listeners: Optional[List] = None) -> Dict:
+    """
+    MongoClient keyword arguments from the environment
+
+    Args:
+        event_listeners: Monitoring listeners to register
+
+    Returns:
+        Dictionary of MongoClient options
+    """
+    options = {
+        'serverSelectionTimeoutMS': int(os.getenv('MONGO_SERVER_SELECTION_TIMEOUT_MS', '5000')),
+        'maxPoolSize': int(os.getenv('MONGO_MAX_POOL_SIZE', '20')),
+        'minPoolSize': int(os.getenv('MONGO_MIN_POOL_SIZE', '0')),
+        'maxIdleTimeMS': int(os.getenv('MONGO_MAX_IDLE_TIME_MS', '300000')),
+        'waitQueueTimeoutMS': int(os.getenv('MONGO_WAIT_QUEUE_TIMEOUT_MS', '10000')),
+        'appname': os.getenv('MONGO_APP_NAME', 'meeting-summarizer')
+    }
+    compressors = available_compressors(os.getenv('MONGO_COMPRESSORS', 'zstd,snappy,zlib'))
+    if compressors:
+        options['compressors'] = ','.join(compressors)
+    # mongodb+srv:// URIs enable TLS themselves; only force it when asked
+    tls = os.getenv('MONGO_TLS')
+    if tls is not None:
+        options['tls'] = tls.lower() in ('1', 'true', 'yes')
+    if event_listeners:
+        options['event_listeners'] = event_listeners
+    return options
+
+
+def read_preference(operation: Optional[str] = None):
+    """
+    Read preference for a kind of read
+
+    Args:
+        operation: 'dashboard', 'export', 'analytics' or None for ordinary reads
+
+    Returns:
+        pymongo read preference
+    """
+    operation = operation or 'default'
+    mode = os.getenv(f"MONGO_READ_PREFERENCE_{operation.upper()}",
+                     DEFAULT_READ_PREFERENCES.get(operation, 'primary'))
+    if mode not in READ_PREFERENCE_MODES:
+        logger.warning(f"Unknown read preference {mode} for {operation}; using primary")
+        return ReadPreference.PRIMARY
+    if mode == 'primary':
+        return ReadPreference.PRIMARY
+    # -1 means no staleness limit; otherwise the server requires at least 90 seconds
+    max_staleness = int(os.getenv('MONGO_MAX_STALENESS_SECONDS', '-1'))
+    return READ_PREFERENCE_MODES[mode](max_staleness=max_staleness)
+
+
+def write_concern(collection_name: str) -> WriteConcern:
+    """Write concern for a collection"""
+    value = os.getenv(f"MONGO_WRITE_CONCERN_{collection_name.upper()}",
+                      DEFAULT_WRITE_CONCERNS.get(collection_name, 'majority'))
+    return WriteConcern(w=int(value) if value.isdigit() else value)
+
+
+class PoolMetrics(monitoring.ConnectionPoolListener):
+    """
+    Connection pool listener recording how long operations wait for a connection
+
+    Long checkout waits mean the pool is too small for the request load.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._started = threading.local()
+        self.waits_ms = deque(maxlen=POOL_METRICS_WINDOW)
+        self.checkouts = 0
+        self.checkout_failures = 0
+        self.checked_out = 0
+        self.connections_created = 0
+        self.pools_cleared = 0
+
+    def _record_wait(self, event) -> float:
+        # pymongo 4.7+ reports the wait itself; time it on older versions
+        duration = getattr(event, 'duration', None)
+        if duration is None:
+            started = getattr(self._started, 'value', None)
+            duration = time.perf_counter() - started if started is not None else 0.0
+        return duration * 1000
+
+    def connection_check_out_started(self, event):
+        self._started.value = time.perf_counter()
+
+    def connection_checked_out(self, event):
+        wait_ms = self._record_wait(event)
+        with self._lock:
+            self.waits_ms.append(wait_ms)
+            self.checkouts += 1
+            self.checked_out += 1
+
+    def connection_check_out_failed(self, event):
+        with self._lock:
+            self.checkout_failures += 1
+
+    def connection_checked_in(self, event):
+        with self._lock:
+            self.checked_out -= 1
+
+    def connection_created(self, event):
+        with self._lock:
+            self.connections_created += 1
+
+    def pool_cleared(self, event):
+        with self._lock:
+            self.pools_cleared += 1
+
+    def pool_created(self, event):
+        pass
+
+    def pool_ready(self, event):
+        pass
+
+    def pool_closed(self, event):
+        pass
+
+    def connection_ready(self, event):
+        pass
+
+    def connection_closed(self, event):
+        pass
+
+    def get_metrics(self) -> Dict:
+        """Checkout counts and wait-time percentiles (recent checkouts) in milliseconds"""
+        with self._lock:
+            waits = sorted(self.waits_ms)
+            metrics = {
+                'checkouts': self.checkouts,
+                'checkout_failures': self.checkout_failures,
+                'checked_out': self.checked_out,
+                'connections_created': self.connections_created,
+                'pools_cleared': self.pools_cleared
+            }
+        for name, quantile in (('wait_p50_ms', 0.5), ('wait_p95_ms', 0.95), ('wait_p99_ms', 0.99)):
+            metrics[name] = round(waits[min(int(len(waits) * quantile), len(waits) - 1)], 3) if waits else 0.0
+        metrics['wait_max_ms'] = round(waits[-1], 3) if waits else 0.0
+        return metrics
@@ -0,0 +1,129 @@
+"""
+In-process read-through cache for stored documents
+Keeps recently read transcripts, summaries and meeting task lists with LRU and TTL eviction
+"""
+import os
+import copy
+import time
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+class DocumentCache:
+    """
+    Size-bounded LRU cache with a time-to-live per entry
+
+    Keys are tuples whose first element names the kind of document
+    ('transcripts', 'summaries', ...), so a whole kind can be invalidated.
+    Values are copied in and out, so callers may modify what they get.
+    Writes through this process invalidate entries; writes from other
+    processes are picked up once the TTL expires.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None, ttl_seconds: Optional[float] = None):
+        """
+        Initialize the cache
+
+        Args:
+            max_entries: Entries kept (defaults to $DOC_CACHE_MAX_ENTRIES or 500; 0 disables caching)
+            ttl_seconds: Lifetime of an entry (defaults to $DOC_CACHE_TTL_SECONDS or 300)
+        """
+        self.max_entries = max_entries if max_entries is not None else int(os.getenv('DOC_CACHE_MAX_ENTRIES', '500'))
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else float(os.getenv('DOC_CACHE_TTL_SECONDS', '300'))
+        self._entries: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        # Bumped by every invalidation so a load racing with a write is not cached
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        Return the cached document for `key`, loading and caching it on a miss
+
+        Args:
+            key: Cache key, e.g. ('summaries', summary_id)
+            loader: Reads the document (or list of documents) from the database; None if it does not exist
+
+        Returns:
+            A copy of the cached value, or None (missing documents are not cached)
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                value, expires_at = entry
+                if expires_at > now:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return copy.deepcopy(value)
+                del self._entries[key]
+                self.expirations += 1
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+        if value is None or self.max_entries <= 0:
+            return value
+
+        with self._lock:
+            if generation == self._generation:
+                self._entries[key] = (copy.deepcopy(value), now + self.ttl_seconds)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.evictions += 1
+        return value
+
+    def invalidate(self, key: Hashable):
+        """Drop one entry"""
+        with self._lock:
+            self._generation += 1
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def invalidate_where(self, kind: str, predicate: Optional[Callable[[Dict], bool]] = None):
+        """
+        Drop every entry of one kind, or only those whose document matches `predicate`
+
+        Args:
+            kind: First element of the keys to drop
+            predicate: Test on the cached document (None drops the whole kind)
+        """
+        with self._lock:
+            self._generation += 1
+            for key in [key for key, (value, _) in self._entries.items()
+                        if key[0] == kind and (predicate is None or predicate(value))]:
+                del self._entries[key]
+                self.invalidations += 1
+
+    def clear(self):
+        """Drop every entry"""
+        with self._lock:
+            self._generation += 1
+            self.invalidations += len(self._entries)
+            self._entries.clear()
+
+    def get_stats(self) -> Dict:
+        """Hit rate and entry counts"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'max_entries': self.max_entries,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': round(self.hits / lookups, 3) if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'invalidations': self.invalidations
+            }
@@ -8,7 +8,7 @@ from datetime import datetime
 from typing import Dict, List, Optional
 import pandas as pd
 from fpdf import FPDF
-from db import get_db_manager
+from db import TASK_LIST_FIELDS, get_db_manager
 from task_manager import get_task_manager
 
 # Configure logging
@@ -34,7 +34,7 @@ class ExportManager:
             bytes: CSV content as bytes
         """
         try:
-            summary = self.db_manager.get_summary(summary_id)
+            summary = self.db_manager.get_summary(summary_id, operation='export')
             if not summary:
                 raise ValueError(f"Summary not found: {summary_id}")
             
@@ -73,7 +73,7 @@ class ExportManager:
             bytes: CSV content as bytes
         """
         try:
-            tasks = self.task_manager.get_tasks(filters)
+            tasks = self.task_manager.get_tasks(filters, operation='export', projection=TASK_LIST_FIELDS + ['updated_at'])
             
             if not tasks:
                 # Create empty DataFrame with expected columns
@@ -126,13 +126,13 @@ class ExportManager:
             bytes: CSV content as bytes
         """
         try:
-            summary = self.db_manager.get_summary(summary_id)
+            summary = self.db_manager.get_summary(summary_id, operation='export')
             if not summary:
                 raise ValueError(f"Summary not found: {summary_id}")
             
             # Get related tasks
             meeting_id = summary.get('meeting_id')
-            tasks = self.task_manager.get_tasks({'meeting_id': meeting_id}) if meeting_id else []
+            tasks = self.db_manager.get_tasks_by_meeting(meeting_id, operation='export', projection=TASK_LIST_FIELDS) if meeting_id else []
             
             # Prepare summary data
             summary_data = {
@@ -196,7 +196,7 @@ class ExportManager:
             bytes: PDF content as bytes
         """
         try:
-            summary = self.db_manager.get_summary(summary_id)
+            summary = self.db_manager.get_summary(summary_id, operation='export')
             if not summary:
                 raise ValueError(f"Summary not found: {summary_id}")
             
@@ -253,13 +253,13 @@ class ExportManager:
             bytes: PDF content as bytes
         """
         try:
-            summary = self.db_manager.get_summary(summary_id)
+            summary = self.db_manager.get_summary(summary_id, operation='export')
             if not summary:
                 raise ValueError(f"Summary not found: {summary_id}")
             
             # Get related tasks
             meeting_id = summary.get('meeting_id')
-            tasks = self.task_manager.get_tasks({'meeting_id': meeting_id}) if meeting_id else []
+            tasks = self.db_manager.get_tasks_by_meeting(meeting_id, operation='export', projection=TASK_LIST_FIELDS) if meeting_id else []
             
             # Create PDF
             pdf = FPDF()
@@ -330,7 +330,7 @@ class ExportManager:
             bytes: CSV content as bytes
         """
         try:
-            stats = self.task_manager.get_task_statistics()
+            stats = self.task_manager.get_task_statistics(operation='export')
             
             # Prepare data for CSV
             data = {
@@ -0,0 +1,303 @@
+"""
+Streaming JSON transcript parser for large meeting exports
+Reads Zoom, Teams and Otter-style segment arrays incrementally with bounded memory
+"""
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Dict, Iterator, Optional, Union
+
+from segment_store import SegmentStore
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Keys whose array values are treated as transcript segments
+SEGMENT_LIST_KEYS = (
+    'segments', 'transcript', 'transcripts', 'entries', 'items', 'messages',
+    'utterances', 'captions', 'monologues', 'timeline', 'phrases', 'results'
+)
+
+# Field aliases used by the common export formats
+SPEAKER_KEYS = ('speaker', 'speaker_name', 'speakerName', 'speakerDisplayName', 'username', 'name', 'participant', 'author', 'user')
+TEXT_KEYS = ('text', 'content', 'transcript', 'message', 'caption', 'words')
+START_KEYS = ('start', 'start_time', 'startTime', 'startOffset', 'begin', 'ts', 'timestamp', 'start_ms', 'startMs')
+END_KEYS = ('end', 'end_time', 'endTime', 'endOffset', 'stop', 'end_ms', 'endMs')
+
+# Plain-text fields checked on the top-level object, in priority order
+PLAIN_TEXT_KEYS = ('transcript', 'text', 'content')
+
+_CLOCK_PATTERN = re.compile(r'^(?:(\d+):)?(\d+):(\d+(?:[.,]\d+)?)$')
+
+_decoder = json.JSONDecoder()
+
+
+class _JSONStreamReader:
+    """Minimal pull reader over a text stream that decodes one JSON value at a time"""
+
+    def __init__(self, stream, chunk_size: int = 64 * 1024):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+
+    def _fill(self, min_size: int = 0) -> bool:
+        """Drop consumed input and append the next chunk; returns False at EOF"""
+        if self.eof:
+            return False
+        chunk = self.stream.read(max(self.chunk_size, min_size))
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        if not chunk:
+            self.eof = True
+            return False
+        return True
+
+    def peek(self) -> str:
+        """Return the next non-whitespace character without consuming it ('' at EOF)"""
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in ' \t\r\n':
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def expect(self, char: str):
+        """Consume the next non-whitespace character, which must be `char`"""
+        found = self.peek()
+        if found != char:
+            raise ValueError(f"Malformed JSON transcript: expected '{char}' but found '{found or 'EOF'}'")
+        self.pos += 1
+
+    def read_value(self):
+        """Decode the next complete JSON value, reading more input as needed"""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # Value is incomplete; grow the read size geometrically so large
+                # values are not re-scanned quadratically
+                if not self._fill(len(self.buffer) - self.pos):
+                    raise
+                continue
+            # A number at the very end of the buffer may continue in the next chunk
+            if end == len(self.buffer) and not self.eof and isinstance(value, (int, float)) and not isinstance(value, bool):
+                self._fill(len(self.buffer) - self.pos)
+                continue
+            self.pos = end
+            return value
+
+    def iter_array(self) -> Iterator:
+        """Yield the elements of the array at the current position one at a time"""
+        self.expect('[')
+        if self.peek() == ']':
+            self.pos += 1
+            return
+        while True:
+            yield self.read_value()
+            separator = self.peek()
+            self.pos += 1
+            if separator == ']':
+                return
+            if separator != ',':
+                raise ValueError(f"Malformed JSON transcript: unexpected '{separator or 'EOF'}' in array")
+
+
+def parse_timestamp(value, milliseconds: bool = False) -> Optional[float]:
+    """
+    Convert a timestamp field to seconds
+
+    Args:
+        value: Number of seconds (or ms) or a clock string such as '00:01:02.500'
+        milliseconds: Whether numeric values are expressed in milliseconds
+
+    Returns:
+        Seconds as float, or None if the value cannot be interpreted
+    """
+    if value is None or isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value) / 1000.0 if milliseconds else float(value)
+    if isinstance(value, str):
+        value = value.strip()
+        match = _CLOCK_PATTERN.match(value)
+        if match:
+            hours, minutes, seconds = match.groups()
+            return int(hours or 0) * 3600 + int(minutes) * 60 + float(seconds.replace(',', '.'))
+        try:
+            return float(value) / 1000.0 if milliseconds else float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def _first_present(item: Dict, keys) -> tuple:
+    """Return (key, value) for the first alias present in the item"""
+    for key in keys:
+        if key in item and item[key] is not None:
+            return key, item[key]
+    return None, None
+
+
+def normalize_segment(item) -> Optional[Dict]:
+    """
+    Map one export record onto the common segment shape
+
+    Args:
+        item: A record from a segment array (dict or string)
+
+    Returns:
+        Dict with 'speaker', 'text', 'start' and 'end' keys, or None if the record has no text
+    """
+    if isinstance(item, str):
+        text = item.strip()
+        return {'speaker': None, 'text': text, 'start': None, 'end': None} if text else None
+    if not isinstance(item, dict):
+        return None
+
+    _, text = _first_present(item, TEXT_KEYS)
+    if isinstance(text, list):
+        # Word-level exports: join the individual tokens
+        words = [w.get('text', w.get('word', '')) if isinstance(w, dict) else str(w) for w in text]
+        text = ' '.join(word.strip() for word in words if word)
+    if not isinstance(text, str) or not text.strip():
+        return None
+
+    _, speaker = _first_present(item, SPEAKER_KEYS)
+    if isinstance(speaker, dict):
+        speaker = speaker.get('name') or speaker.get('displayName')
+
+    start_key, start = _first_present(item, START_KEYS)
+    end_key, end = _first_present(item, END_KEYS)
+
+    return {
+        'speaker': str(speaker).strip() if speaker is not None else None,
+        'text': text.strip(),
+        'start': parse_timestamp(start, milliseconds=bool(start_key and start_key.lower().endswith('ms'))),
+        'end': parse_timestamp(end, milliseconds=bool(end_key and end_key.lower().endswith('ms')))
+    }
+
+
+class JSONTranscriptParser:
+    """Incrementally walks a JSON transcript and yields normalized segments"""
+
+    def __init__(self, chunk_size: int = 64 * 1024, max_depth: int = 3):
+        """
+        Initialize the parser
+
+        Args:
+            chunk_size: Number of characters read from disk at a time
+            max_depth: How deep nested objects are searched for segment arrays
+        """
+        self.chunk_size = chunk_size
+        self.max_depth = max_depth
+        self.metadata = {}
+        self.plain_text = None
+        self.root_value = None
+
+    def iter_segments(self, stream) -> Iterator[Dict]:
+        """
+        Yield normalized segments from a text stream
+
+        Top-level scalar fields are collected into `metadata`, and a plain-text
+        transcript field (if present) into `plain_text`, as a side effect.
+        """
+        reader = _JSONStreamReader(stream, self.chunk_size)
+        first = reader.peek()
+        if first == '[':
+            yield from self._iter_segment_array(reader)
+        elif first == '{':
+            yield from self._walk_object(reader, depth=0)
+        elif first:
+            self.root_value = reader.read_value()
+
+    def _iter_segment_array(self, reader: _JSONStreamReader) -> Iterator[Dict]:
+        for item in reader.iter_array():
+            segment = normalize_segment(item)
+            if segment is not None:
+                yield segment
+
+    def _walk_object(self, reader: _JSONStreamReader, depth: int) -> Iterator[Dict]:
+        reader.expect('{')
+        if reader.peek() == '}':
+            reader.pos += 1
+            return
+        while True:
+            key = reader.read_value()
+            reader.expect(':')
+            next_char = reader.peek()
+            if next_char == '[' and key in SEGMENT_LIST_KEYS:
+                yield from self._iter_segment_array(reader)
+            elif next_char == '{' and depth < self.max_depth:
+                yield from self._walk_object(reader, depth + 1)
+            else:
+                value = reader.read_value()
+                if depth == 0:
+                    if key in PLAIN_TEXT_KEYS and isinstance(value, str) and self.plain_text is None:
+                        self.plain_text = value
+                    else:
+                        self.metadata[key] = value
+            separator = reader.peek()
+            reader.pos += 1
+            if separator == '}':
+                return
+            if separator != ',':
+                raise ValueError(f"Malformed JSON transcript: unexpected '{separator or 'EOF'}' in object")
+
+
+def iter_json_segments(file_path: Union[str, Path], chunk_size: int = 64 * 1024) -> Iterator[Dict]:
+    """
+    Stream normalized segments from a JSON transcript file
+
+    Args:
+        file_path: Path to the JSON file
+        chunk_size: Number of characters read at a time
+
+    Returns:
+        Iterator of segment dictionaries
+    """
+    parser = JSONTranscriptParser(chunk_size=chunk_size)
+    with open(file_path, 'r', encoding='utf-8') as stream:
+        yield from parser.iter_segments(stream)
+
+
+def load_json_transcript(file_path: Union[str, Path], chunk_size: int = 64 * 1024) -> Dict:
+    """
+    Parse a JSON transcript into plain text plus structured segments
+
+    Args:
+        file_path: Path to the JSON file
+        chunk_size: Number of characters read at a time
+
+    Returns:
+        Dictionary with 'text', 'segment_store' and 'metadata'
+    """
+    parser = JSONTranscriptParser(chunk_size=chunk_size)
+
+    with open(file_path, 'r', encoding='utf-8') as stream:
+        # Segments go straight into the packed store, one record at a time
+        store = SegmentStore.from_segments(parser.iter_segments(stream), separator='\n', label_speakers=True)
+
+    if parser.plain_text is not None:
+        text = parser.plain_text
+        if len(store) == 0:
+            store = SegmentStore.from_text(text)
+    elif len(store) > 0:
+        text = store.text
+    elif parser.root_value is not None:
+        text = str(parser.root_value)
+    else:
+        # No obvious text field, fall back to the collected fields
+        text = json.dumps(parser.metadata, indent=2, default=str)
+
+    logger.info(f"Parsed {len(store)} segments from JSON transcript {Path(file_path).name}")
+    return {
+        'text': text,
+        'segment_store': store,
+        'metadata': parser.metadata
+    }
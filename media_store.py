@@ -0,0 +1,214 @@
+"""
+Chunked storage of original uploaded media
+Streams uploads into MongoDB GridFS (or a local chunked blob store) with bounded memory
+"""
+import os
+import json
+import uuid
+import shutil
+import logging
+import tempfile
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, Optional
+
+from bson import ObjectId
+from gridfs import GridFSBucket
+from gridfs.errors import NoFile
+
+from db import get_db_manager
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Fixed chunk size used for both GridFS and the local blob store
+MEDIA_CHUNK_SIZE = 1024 * 1024
+
+
+class MediaStore:
+    """Base interface for chunked media storage"""
+
+    name = 'base'
+
+    def save_stream(self, stream: BinaryIO, filename: str, metadata: Optional[Dict] = None) -> str:
+        """
+        Store a binary stream chunk by chunk
+
+        Args:
+            stream: Readable binary stream (e.g. a Streamlit upload)
+            filename: Original file name
+            metadata: Optional metadata stored with the file
+
+        Returns:
+            str: Media ID
+        """
+        raise NotImplementedError
+
+    def iter_chunks(self, media_id: str) -> Iterator[bytes]:
+        """Yield the stored bytes in fixed-size chunks"""
+        raise NotImplementedError
+
+    def get_info(self, media_id: str) -> Optional[Dict]:
+        """Return filename, length and metadata of stored media"""
+        raise NotImplementedError
+
+    def delete(self, media_id: str) -> bool:
+        """Delete stored media"""
+        raise NotImplementedError
+
+    def spool_to_file(self, media_id: str, suffix: str = '') -> str:
+        """
+        Copy stored media to a temporary file, one chunk at a time
+
+        Needed for consumers that must seek (e.g. MP4 with a trailing index).
+
+        Args:
+            media_id: Media ID
+            suffix: File suffix for the temporary file
+
+        Returns:
+            str: Path of the temporary file (caller deletes it)
+        """
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+            for chunk in self.iter_chunks(media_id):
+                temp_file.write(chunk)
+            return temp_file.name
+
+
+class GridFSMediaStore(MediaStore):
+    """Media storage in the MongoDB GridFS 'media' bucket"""
+
+    name = 'gridfs'
+
+    def __init__(self, db_manager=None, chunk_size: int = MEDIA_CHUNK_SIZE):
+        self.db_manager = db_manager or get_db_manager()
+        self.chunk_size = chunk_size
+
+    @property
+    def bucket(self) -> GridFSBucket:
+        if not self.db_manager._connected:
+            self.db_manager.connect()
+        return GridFSBucket(self.db_manager.db, bucket_name='media', chunk_size_bytes=self.chunk_size)
+
+    def save_stream(self, stream: BinaryIO, filename: str, metadata: Optional[Dict] = None) -> str:
+        # GridFS reads the source in chunk_size pieces, so memory stays bounded
+        file_id = self.bucket.upload_from_stream(filename, stream, metadata=metadata or {})
+        logger.info(f"Stored media {filename} in GridFS: {file_id}")
+        return str(file_id)
+
+    def iter_chunks(self, media_id: str) -> Iterator[bytes]:
+        grid_out = self.bucket.open_download_stream(ObjectId(media_id))
+        try:
+            while True:
+                chunk = grid_out.read(self.chunk_size)
+                if not chunk:
+                    return
+                yield chunk
+        finally:
+            grid_out.close()
+
+    def get_info(self, media_id: str) -> Optional[Dict]:
+        try:
+            grid_out = self.bucket.open_download_stream(ObjectId(media_id))
+        except NoFile:
+            return None
+        info = {'filename': grid_out.filename, 'length': grid_out.length, 'metadata': grid_out.metadata or {}}
+        grid_out.close()
+        return info
+
+    def delete(self, media_id: str) -> bool:
+        try:
+            self.bucket.delete(ObjectId(media_id))
+            return True
+        except NoFile:
+            return False
+
+
+class LocalMediaStore(MediaStore):
+    """Media storage as fixed-size chunk files in a local directory"""
+
+    name = 'local'
+
+    def __init__(self, root: Optional[str] = None, chunk_size: int = MEDIA_CHUNK_SIZE):
+        self.root = Path(root or os.getenv('MEDIA_STORE_DIR', 'media_blobs'))
+        self.chunk_size = chunk_size
+        self.root.mkdir(parents=True, exist_ok=True)
+
+    def _media_dir(self, media_id: str) -> Path:
+        return self.root / Path(media_id).name
+
+    def save_stream(self, stream: BinaryIO, filename: str, metadata: Optional[Dict] = None) -> str:
+        media_id = uuid.uuid4().hex
+        media_dir = self._media_dir(media_id)
+        media_dir.mkdir()
+        length = 0
+        index = 0
+        while True:
+            chunk = stream.read(self.chunk_size)
+            if not chunk:
+                break
+            (media_dir / f"{index:08d}.chunk").write_bytes(chunk)
+            length += len(chunk)
+            index += 1
+        manifest = {'filename': filename, 'length': length, 'chunks': index, 'metadata': metadata or {}}
+        (media_dir / 'manifest.json').write_text(json.dumps(manifest, default=str))
+        logger.info(f"Stored media {filename} locally: {media_id}")
+        return media_id
+
+    def iter_chunks(self, media_id: str) -> Iterator[bytes]:
+        media_dir = self._media_dir(media_id)
+        manifest = self.get_info(media_id)
+        if manifest is None:
+            raise FileNotFoundError(f"Media not found: {media_id}")
+        for index in range(manifest['chunks']):
+            yield (media_dir / f"{index:08d}.chunk").read_bytes()
+
+    def get_info(self, media_id: str) -> Optional[Dict]:
+        manifest_path = self._media_dir(media_id) / 'manifest.json'
+        if not manifest_path.exists():
+            return None
+        return json.loads(manifest_path.read_text())
+
+    def delete(self, media_id: str) -> bool:
+        media_dir = self._media_dir(media_id)
+        if not media_dir.exists():
+            return False
+        shutil.rmtree(media_dir)
+        return True
+
+
+def get_media_store(name: Optional[str] = None) -> MediaStore:
+    """
+    Get the configured media store, or the one named
+
+    Uses GridFS when MongoDB is the connected storage backend (or
+    MEDIA_STORE=gridfs), otherwise the local chunked blob store (MEDIA_STORE=local).
+
+    Args:
+        name: 'gridfs' or 'local' to open the store some media was saved in
+    """
+    choice = (name or os.getenv('MEDIA_STORE', '')).lower()
+    db_manager = get_db_manager()
+    if choice == 'local' or (choice != 'gridfs' and not (db_manager.name == 'mongo' and db_manager._connected)):
+        return LocalMediaStore()
+    return GridFSMediaStore(db_manager)
+
+
+def delete_media(media_id: str, store_name: Optional[str] = None) -> bool:
+    """
+    Delete media from the store it was saved in, logging instead of raising
+
+    Args:
+        media_id: Media ID
+        store_name: Store recorded with the media ID; older records without
+            one are matched by ID format (GridFS IDs are ObjectIds)
+
+    Returns:
+        bool: True if the media was deleted
+    """
+    store_name = store_name or (GridFSMediaStore.name if ObjectId.is_valid(media_id) else LocalMediaStore.name)
+    try:
+        return get_media_store(store_name).delete(media_id)
+    except Exception as e:
+        logger.error(f"Error deleting media {media_id} from the {store_name} store: {e}")
+        return False
@@ -9,6 +9,8 @@ import requests
 import ollama
 from datetime import datetime, timedelta
 
+from segment_store import SegmentStore
+
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -54,9 +56,7 @@ class OllamaNLPProcessor:
         try:
             # Truncate transcript if too long (gemma:2b has context limits)
             max_length = 4000  # Conservative limit for gemma:2b
-            if len(transcript_text) > max_length:
-                transcript_text = transcript_text[:max_length] + "..."
-                logger.warning(f"Transcript truncated to {max_length} characters")
+            transcript_text = self._fit_transcript(transcript_text, max_length)
             
             prompt = self._create_summary_prompt(transcript_text, meeting_title)
             
@@ -102,8 +102,7 @@ class OllamaNLPProcessor:
         try:
             # Truncate transcript if too long
             max_length = 3000
-            if len(transcript_text) > max_length:
-                transcript_text = transcript_text[:max_length] + "..."
+            transcript_text = self._fit_transcript(transcript_text, max_length)
             
             prompt = self._create_action_items_prompt(transcript_text, summary_text)
             
@@ -136,6 +135,29 @@ class OllamaNLPProcessor:
             logger.error(f"Error extracting action items: {e}")
             raise
     
+    def _fit_transcript(self, transcript_text: str, max_length: int) -> str:
+        """
+        Leading part of a transcript that fits the model's context, cut between speaker turns
+        
+        Args:
+            transcript_text: The meeting transcript text
+            max_length: Maximum number of characters sent to the model
+            
+        Returns:
+            The transcript, or its header and first whole turns followed by "..."
+        """
+        if len(transcript_text) <= max_length:
+            return transcript_text
+        store = SegmentStore.from_text(transcript_text)
+        cut = max_length
+        if len(store) > 0 and store.text_starts[0] < max_length:
+            # Headers before the first turn count against the limit too
+            _, _, last = next(store.chunks(max_length - store.text_starts[0]))
+            if store.text_ends[last - 1] <= max_length:
+                cut = store.text_ends[last - 1]
+        logger.warning(f"Transcript truncated to {cut} of {len(transcript_text)} characters")
+        return transcript_text[:cut] + "..."
+    
     def _create_summary_prompt(self, transcript_text: str, meeting_title: str = None) -> str:
         """Create prompt for meeting summarization"""
         title_context = f"Meeting: {meeting_title}\n\n" if meeting_title else ""
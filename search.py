@@ -0,0 +1,187 @@
+"""
+Full-text search across transcripts, summaries and tasks
+Search entries, query parsing and hit highlighting shared by the storage backends
+
+Usage:
+    python search.py query "payment api" [--kinds transcript,summary,task]
+    python search.py rebuild
+"""
+import re
+import json
+import base64
+import argparse
+import logging
+from typing import Dict, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SEARCH_KINDS = ['transcript', 'summary', 'task']
+DEFAULT_SEARCH_PAGE_SIZE = 10
+
+# Task fields whose changes need the task re-indexed
+TASK_SEARCH_FIELDS = ['task', 'context', 'assignee']
+
+# Title matches count this many times a body match
+TITLE_WEIGHT = 5.0
+
+# Characters of context around the best match in a snippet
+SNIPPET_CHARS = 240
+
+# Query words too common to rank on
+STOPWORDS = frozenset("""
+a about above after again all am an and any are as at be because been before being below between both but by
+can could did do does doing down during each few for from further had has have having he her here hers him his
+how i if in into is it its just me more most my no nor not now of off on once only or other our ours out over own
+same she should so some such than that the their them then there these they this those through to too under until
+up very was we were what when where which while who whom why will with would you your yours
+""".split())
+
+_WORD = re.compile(r'\w+', re.UNICODE)
+_SUFFIXES = ('ations', 'ation', 'ings', 'ing', 'ies', 'ed', 'es', 's')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lower-case words of `text` without stopwords"""
+    return [word for word in _WORD.findall(text.lower()) if word not in STOPWORDS]
+
+
+def query_terms(query: str) -> List[str]:
+    """Distinct search terms of a query, in order"""
+    return list(dict.fromkeys(tokenize(query)))
+
+
+def stem(word: str) -> str:
+    """Crude suffix stripping, enough to highlight 'payments' for 'payment'"""
+    for suffix in _SUFFIXES:
+        if len(word) > len(suffix) + 2 and word.endswith(suffix):
+            return word[:-len(suffix)]
+    return word
+
+
+def search_entry(kind: str, document: Dict, text: Optional[str] = None) -> Dict:
+    """
+    What the search index stores for a transcript, summary or task
+
+    Args:
+        kind: 'transcript', 'summary' or 'task'
+        document: Stored document (with '_id' and 'created_at')
+        text: Transcript text (transcript documents no longer carry it)
+
+    Returns:
+        Dictionary with 'kind', 'ref_id', 'meeting_id', 'title', 'created_at'
+        and 'text' (the indexed body)
+    """
+    if kind == 'transcript':
+        title = document.get('meeting_title') or document.get('file_name') or ''
+        body = text if text is not None else document.get('text', '')
+        meeting_id = str(document['_id'])
+    elif kind == 'summary':
+        title = document.get('meeting_title') or ''
+        body = document.get('summary', '')
+        meeting_id = document.get('meeting_id') or document.get('transcript_id')
+    elif kind == 'task':
+        title = document.get('task') or ''
+        body = ' '.join(str(document.get(field) or '') for field in TASK_SEARCH_FIELDS[1:])
+        meeting_id = document.get('meeting_id')
+    else:
+        raise ValueError(f"Unknown search kind: {kind}")
+    return {
+        'kind': kind,
+        'ref_id': str(document['_id']),
+        'meeting_id': meeting_id,
+        'title': title,
+        'created_at': document.get('created_at'),
+        'text': body or ''
+    }
+
+
+def highlight(text: str, terms: List[str], max_chars: int = SNIPPET_CHARS) -> Tuple[str, List[Tuple[int, int]]]:
+    """
+    Snippet of `text` around its densest cluster of query terms
+
+    Args:
+        text: Text of the hit
+        terms: Query terms
+        max_chars: Snippet length
+
+    Returns:
+        (snippet, list of (start, end) offsets of matched words in the snippet)
+    """
+    stems = {stem(term) for term in terms}
+    # A word shares a term's stem only if it starts with it, so the regex
+    # finds every candidate without stemming each word of a long transcript
+    candidates = re.compile(r'\b(?:' + '|'.join(map(re.escape, sorted(stems, key=len, reverse=True))) + r')\w*',
+                            re.IGNORECASE)
+    matches = [(match.start(), match.end()) for match in candidates.finditer(text)
+               if stem(match.group().lower()) in stems]
+    if not matches:
+        return text[:max_chars] + ('…' if len(text) > max_chars else ''), []
+
+    # Window start (at a match) covering the most matches
+    best_start, best_count, last = matches[0][0], 0, 0
+    for first, (start, _) in enumerate(matches):
+        while last < len(matches) and matches[last][1] <= start + max_chars:
+            last += 1
+        if last - first > best_count:
+            best_start, best_count = start, last - first
+    # Show a little context before the first match
+    window_start = max(0, best_start - max_chars // 6)
+    space = text.rfind(' ', 0, window_start + 1)
+    window_start = space + 1 if window_start and space >= 0 else window_start
+    window_end = min(len(text), window_start + max_chars)
+
+    prefix = '…' if window_start > 0 else ''
+    snippet = prefix + text[window_start:window_end] + ('…' if window_end < len(text) else '')
+    offsets = [(start - window_start + len(prefix), end - window_start + len(prefix))
+               for start, end in matches if start >= window_start and end <= window_end]
+    return snippet, offsets
+
+
+def encode_offset_token(offset: int) -> str:
+    """Opaque continuation token for ranked results"""
+    return base64.urlsafe_b64encode(json.dumps({'offset': offset}).encode()).decode()
+
+
+def decode_offset_token(token: str) -> int:
+    """
+    Offset of a continuation token
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        return int(json.loads(base64.urlsafe_b64decode(token.encode()))['offset'])
+    except Exception as e:
+        raise ValueError(f"Invalid page token: {e}")
+
+
+def main():
+    """Query or rebuild the search index of the configured storage backend"""
+    from db import get_db_manager
+
+    parser = argparse.ArgumentParser(description="Meeting search")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    query_parser = subparsers.add_parser('query', help="Search transcripts, summaries and tasks")
+    query_parser.add_argument('query')
+    query_parser.add_argument('--kinds', default=','.join(SEARCH_KINDS))
+    query_parser.add_argument('--page-size', type=int, default=DEFAULT_SEARCH_PAGE_SIZE)
+    subparsers.add_parser('rebuild', help="Re-index every stored transcript, summary and task")
+    args = parser.parse_args()
+
+    db_manager = get_db_manager()
+    db_manager.connect()
+    if args.command == 'rebuild':
+        print(f"✅ Indexed {db_manager.rebuild_search_index()} documents")
+        return
+    page = db_manager.search(args.query, args.kinds.split(','), args.page_size)
+    for hit in page['items']:
+        print(f"[{hit['kind']}] {hit['title']} ({hit['score']:.2f})")
+        print(f"    {hit['snippet']}")
+    if not page['items']:
+        print("No matches")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,394 @@
+"""
+Compact speaker-turn segment storage for transcripts
+Keeps timings and text offsets in packed arrays over one contiguous text buffer
+"""
+import logging
+import math
+import re
+import sys
+from array import array
+from bisect import bisect_right
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# "Name: text" turns, optionally prefixed by a "[00:01:02]" timestamp
+TURN_PATTERN = re.compile(
+    r"^[ \t]*(?:\[?(?P<clock>\d{1,2}:\d{2}(?::\d{2}(?:[.,]\d+)?)?)\]?[ \t]+)?"
+    r"(?P<speaker>[A-Z][\w.'\- ]{0,40}?)[ \t]*:[ \t]+(?P<text>\S.*)$",
+    re.MULTILINE
+)
+
+# Header labels that look like turns but are transcript metadata
+HEADER_LABELS = {
+    'meeting', 'date', 'time', 'attendees', 'participants', 'location',
+    'agenda', 'subject', 'title', 'duration', 'notes'
+}
+
+NO_SPEAKER = -1
+
+
+def _clock_to_seconds(clock: Optional[str]) -> float:
+    """Convert 'MM:SS' or 'HH:MM:SS(.ms)' to seconds; NaN when absent"""
+    if not clock:
+        return math.nan
+    parts = clock.replace(',', '.').split(':')
+    seconds = 0.0
+    for part in parts:
+        seconds = seconds * 60 + float(part)
+    return seconds
+
+
+def _to_le_bytes(values: array) -> bytes:
+    """Serialize an array as little-endian bytes"""
+    if sys.byteorder == 'big':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _from_le_bytes(typecode: str, data: bytes) -> array:
+    """Deserialize little-endian bytes into an array"""
+    values = array(typecode)
+    values.frombytes(bytes(data))
+    if sys.byteorder == 'big':
+        values.byteswap()
+    return values
+
+
+class SegmentStore:
+    """
+    Array-backed store of transcript segments
+
+    Each segment is a row across parallel arrays: start/end times in seconds
+    (NaN when unknown), [text_start, text_end) character offsets into `text`,
+    and an interned speaker id (-1 when unattributed).
+    """
+
+    def __init__(self, text: str = ''):
+        """
+        Initialize an empty store over a text buffer
+
+        Args:
+            text: Contiguous transcript text the offsets refer to
+        """
+        self.text = text
+        self.starts = array('d')
+        self.ends = array('d')
+        self.text_starts = array('I')
+        self.text_ends = array('I')
+        self.speaker_ids = array('i')
+        self.speakers: List[str] = []
+        self._speaker_index: Dict[str, int] = {}
+        self._untimed = 0
+
+    # ------------------------------------------------------------------
+    # Construction
+    # ------------------------------------------------------------------
+
+    def _intern_speaker(self, speaker: Optional[str]) -> int:
+        if not speaker:
+            return NO_SPEAKER
+        speaker_id = self._speaker_index.get(speaker)
+        if speaker_id is None:
+            speaker_id = len(self.speakers)
+            self.speakers.append(speaker)
+            self._speaker_index[speaker] = speaker_id
+        return speaker_id
+
+    def add(self, text_start: int, text_end: int, speaker: Optional[str] = None,
+            start: Optional[float] = None, end: Optional[float] = None):
+        """
+        Append a segment that refers to text[text_start:text_end]
+
+        Args:
+            text_start: Offset of the first character of the segment
+            text_end: Offset one past the last character of the segment
+            speaker: Optional speaker label
+            start: Optional start time in seconds
+            end: Optional end time in seconds
+        """
+        self.text_starts.append(text_start)
+        self.text_ends.append(text_end)
+        if start is None:
+            self._untimed += 1
+        self.starts.append(math.nan if start is None else float(start))
+        self.ends.append(math.nan if end is None else float(end))
+        self.speaker_ids.append(self._intern_speaker(speaker))
+
+    @classmethod
+    def from_segments(cls, segments: Iterable[Dict], separator: str = '',
+                      label_speakers: bool = False) -> 'SegmentStore':
+        """
+        Build a store from segment dictionaries (Whisper or JSON-export shape)
+
+        Args:
+            segments: Iterable of dicts with 'text' and optional 'speaker', 'start', 'end'
+            separator: String placed between segment texts in the buffer
+            label_speakers: Prefix each segment with 'Speaker: ' in the buffer
+
+        Returns:
+            SegmentStore whose text is the concatenation of the segments
+        """
+        store = cls()
+        parts: List[str] = []
+        offset = 0
+        for segment in segments:
+            if parts and separator:
+                parts.append(separator)
+                offset += len(separator)
+            speaker = segment.get('speaker')
+            if label_speakers and speaker:
+                label = f"{speaker}: "
+                parts.append(label)
+                offset += len(label)
+            text = segment.get('text', '')
+            parts.append(text)
+            store.add(offset, offset + len(text), speaker, segment.get('start'), segment.get('end'))
+            offset += len(text)
+        store.text = ''.join(parts)
+        return store
+
+    @classmethod
+    def from_text(cls, text: str) -> 'SegmentStore':
+        """
+        Build a store from a plain-text transcript with 'Name:' turns
+
+        Lines that do not start a new turn are folded into the previous one.
+        Text before the first turn (headers) is not part of any segment. A
+        transcript without recognizable turns becomes a single segment.
+
+        Args:
+            text: Transcript text
+
+        Returns:
+            SegmentStore that slices the given text without copying it
+        """
+        store = cls(text)
+        pending = None
+        for match in TURN_PATTERN.finditer(text):
+            speaker = match.group('speaker').strip()
+            if speaker.lower() in HEADER_LABELS:
+                continue
+            if pending is not None:
+                store._add_turn(text, *pending, turn_end=match.start())
+            pending = (match.start('text'), speaker, _clock_to_seconds(match.group('clock')))
+        if pending is not None:
+            store._add_turn(text, *pending, turn_end=len(text))
+        elif text.strip():
+            stripped_start = len(text) - len(text.lstrip())
+            store.add(stripped_start, len(text.rstrip()))
+        store._fill_turn_ends()
+        return store
+
+    def _add_turn(self, text: str, text_start: int, speaker: str, start: float, turn_end: int):
+        # Trim trailing blank lines between turns
+        while turn_end > text_start and text[turn_end - 1].isspace():
+            turn_end -= 1
+        self.add(text_start, turn_end, speaker, None if math.isnan(start) else start)
+
+    def _fill_turn_ends(self):
+        """Use the next turn's start as the end time for timestamped turns"""
+        for index in range(len(self) - 1):
+            if math.isnan(self.ends[index]) and not math.isnan(self.starts[index + 1]):
+                self.ends[index] = self.starts[index + 1]
+
+    # ------------------------------------------------------------------
+    # Access
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self.text_starts)
+
+    def __iter__(self) -> Iterator[Dict]:
+        for index in range(len(self)):
+            yield self.segment(index)
+
+    def segment(self, index: int) -> Dict:
+        """Materialize one segment as a dictionary"""
+        speaker_id = self.speaker_ids[index]
+        start = self.starts[index]
+        end = self.ends[index]
+        return {
+            'index': index,
+            'speaker': self.speakers[speaker_id] if speaker_id != NO_SPEAKER else None,
+            'text': self.segment_text(index),
+            'start': None if math.isnan(start) else start,
+            'end': None if math.isnan(end) else end,
+            'text_start': self.text_starts[index],
+            'text_end': self.text_ends[index]
+        }
+
+    def segment_text(self, index: int) -> str:
+        """Slice a segment's text out of the shared buffer"""
+        return self.text[self.text_starts[index]:self.text_ends[index]]
+
+    @property
+    def has_timing(self) -> bool:
+        """True if every segment has a start time"""
+        return len(self) > 0 and self._untimed == 0
+
+    @property
+    def duration(self) -> Optional[float]:
+        """End time of the last timed segment"""
+        if not self.has_timing:
+            return None
+        last_end = self.ends[-1]
+        return self.starts[-1] if math.isnan(last_end) else last_end
+
+    # ------------------------------------------------------------------
+    # Lookup (O(log n) via bisect on the sorted arrays)
+    # ------------------------------------------------------------------
+
+    def index_at_offset(self, offset: int) -> Optional[int]:
+        """
+        Find the segment containing a character offset of `text`
+
+        Args:
+            offset: Character offset into the text buffer
+
+        Returns:
+            Segment index, or None if the offset falls outside every segment
+        """
+        index = bisect_right(self.text_starts, offset) - 1
+        if index < 0 or offset >= self.text_ends[index]:
+            return None
+        return index
+
+    def range_for_time(self, start: float, end: float) -> Tuple[int, int]:
+        """
+        Return the [first, last) segment indices overlapping a time range
+
+        Args:
+            start: Range start in seconds
+            end: Range end in seconds
+
+        Returns:
+            Tuple of (first_index, last_index_exclusive)
+        """
+        if not self.has_timing:
+            return 0, 0
+        first = max(bisect_right(self.starts, start) - 1, 0)
+        if first < len(self) and not math.isnan(self.ends[first]) and self.ends[first] <= start:
+            first += 1
+        last = bisect_right(self.starts, end)
+        return first, max(first, last)
+
+    # ------------------------------------------------------------------
+    # Consumers: chunking and preview
+    # ------------------------------------------------------------------
+
+    def chunks(self, max_chars: int) -> Iterator[Tuple[str, int, int]]:
+        """
+        Group whole segments into chunks of at most `max_chars` characters
+
+        A single segment longer than `max_chars` becomes its own chunk.
+
+        Args:
+            max_chars: Target chunk size
+
+        Returns:
+            Iterator of (chunk_text, first_index, last_index_exclusive)
+        """
+        first = 0
+        total = len(self)
+        while first < total:
+            last = first + 1
+            chunk_start = self.text_starts[first]
+            while last < total and self.text_ends[last] - chunk_start <= max_chars:
+                last += 1
+            yield self.text[chunk_start:self.text_ends[last - 1]], first, last
+            first = last
+
+    def preview(self, max_chars: int = 1000) -> str:
+        """
+        Leading transcript text cut at a segment boundary where possible
+
+        Args:
+            max_chars: Maximum preview length
+
+        Returns:
+            Preview text
+        """
+        if len(self.text) <= max_chars:
+            return self.text
+        if len(self) > 0:
+            index = self.index_at_offset(max_chars)
+            if index is None:
+                index = bisect_right(self.text_starts, max_chars) - 1
+            if index > 0:
+                cut = self.text_ends[index - 1]
+                if cut > max_chars // 2:
+                    return self.text[:cut]
+        return self.text[:max_chars]
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the segment index (excluding the text buffer)"""
+        arrays = (self.starts, self.ends, self.text_starts, self.text_ends, self.speaker_ids)
+        return sum(arr.itemsize * len(arr) for arr in arrays) + sum(sys.getsizeof(name) for name in self.speakers)
+
+    # ------------------------------------------------------------------
+    # Columnar serialization
+    # ------------------------------------------------------------------
+
+    def to_columns(self, first: int = 0, last: Optional[int] = None) -> Dict:
+        """
+        Pack segments [first, last) into a columnar dictionary
+
+        Arrays are stored as little-endian bytes and text offsets are relative
+        to the packed text slice, so a bucket can be decoded on its own.
+
+        Args:
+            first: Index of the first segment
+            last: Index one past the last segment (defaults to the end)
+
+        Returns:
+            Dictionary of packed columns
+        """
+        last = len(self) if last is None else last
+        base = self.text_starts[first] if last > first else 0
+        text_end = self.text_ends[last - 1] if last > first else 0
+
+        # Re-intern speakers so the bucket carries only the names it uses
+        local_ids: Dict[int, int] = {}
+        speakers: List[str] = []
+        speaker_ids = array('i')
+        for speaker_id in self.speaker_ids[first:last]:
+            if speaker_id == NO_SPEAKER:
+                speaker_ids.append(NO_SPEAKER)
+                continue
+            if speaker_id not in local_ids:
+                local_ids[speaker_id] = len(speakers)
+                speakers.append(self.speakers[speaker_id])
+            speaker_ids.append(local_ids[speaker_id])
+
+        columns = {
+            'starts': self.starts[first:last],
+            'ends': self.ends[first:last],
+            'text_starts': array('I', (offset - base for offset in self.text_starts[first:last])),
+            'text_ends': array('I', (offset - base for offset in self.text_ends[first:last])),
+            'speaker_ids': speaker_ids
+        }
+        packed = {name: _to_le_bytes(values) for name, values in columns.items()}
+        packed.update({'count': last - first, 'speakers': speakers, 'text': self.text[base:text_end]})
+        return packed
+
+    @classmethod
+    def from_columns(cls, packed: Dict) -> 'SegmentStore':
+        """Rebuild a store from a dictionary produced by to_columns"""
+        store = cls(packed.get('text', ''))
+        store.starts = _from_le_bytes('d', packed['starts'])
+        store.ends = _from_le_bytes('d', packed['ends'])
+        store.text_starts = _from_le_bytes('I', packed['text_starts'])
+        store.text_ends = _from_le_bytes('I', packed['text_ends'])
+        store.speaker_ids = _from_le_bytes('i', packed['speaker_ids'])
+        store.speakers = list(packed.get('speakers', []))
+        store._speaker_index = {name: index for index, name in enumerate(store.speakers)}
+        store._untimed = sum(1 for start in store.starts if math.isnan(start))
+        return store
+
+    def to_dicts(self) -> List[Dict]:
+        """Materialize every segment (for JSON export or debugging)"""
+        return list(self)
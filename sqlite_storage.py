@@ -0,0 +1,813 @@
+"""
+Embedded SQLite storage for the Meeting Summarizer
+Runs the app on a single machine without a MongoDB server ($STORAGE_BACKEND=sqlite)
+"""
+import os
+import re
+import json
+import base64
+import sqlite3
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from bson import ObjectId
+
+from storage import (
+    DEFAULT_PAGE_SIZE, MEETING_LIST_FIELDS, OPEN_TASK_STATUSES, TASK_COUNTER_STATUSES, TASK_LIST_FIELDS,
+    StorageBackend, deadline_window, decode_page_token, encode_page_token, pack_transcript_body, segment_buckets,
+    segments_from_buckets, transcript_body_fields
+)
+from search import SEARCH_KINDS, TASK_SEARCH_FIELDS, TITLE_WEIGHT, search_entry
+from text_codec import compress_text, decompress_text
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Every table keeps the whole document as JSON in 'doc'; the other columns
+# copy the fields that queries filter or sort on so they can be indexed
+SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS transcripts (
+        id TEXT PRIMARY KEY, created_at TEXT NOT NULL, doc TEXT NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS transcript_bodies (
+        id TEXT PRIMARY KEY, codec TEXT NOT NULL, data BLOB NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS summaries (
+        id TEXT PRIMARY KEY, transcript_id TEXT, created_at TEXT NOT NULL, doc TEXT NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS tasks (
+        id TEXT PRIMARY KEY, status TEXT, assignee TEXT, priority TEXT, meeting_id TEXT,
+        transcript_id TEXT, actual_deadline TEXT, created_at TEXT NOT NULL, doc TEXT NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS transcript_segments (
+        transcript_id TEXT NOT NULL, start REAL NOT NULL, "end" REAL NOT NULL, doc TEXT NOT NULL)""",
+    """CREATE TABLE IF NOT EXISTS task_stats (
+        id TEXT PRIMARY KEY, assignee TEXT, total INTEGER NOT NULL DEFAULT 0,
+        pending INTEGER NOT NULL DEFAULT 0, in_progress INTEGER NOT NULL DEFAULT 0,
+        completed INTEGER NOT NULL DEFAULT 0, reconciled_at TEXT)""",
+    # Search index: one row per transcript, summary and task, and a BM25
+    # inverted index over their titles, bodies and kinds (so a kind filter
+    # narrows the match before anything is scored; query terms are scoped
+    # to titles and bodies). The FTS table stores no
+    # text of its own; summary and task bodies are kept compressed here
+    # (transcripts already have theirs in transcript_bodies) for snippets
+    # and for removing rows from the index
+    """CREATE TABLE IF NOT EXISTS search_entries (
+        rowid INTEGER PRIMARY KEY, kind TEXT NOT NULL, ref_id TEXT NOT NULL, meeting_id TEXT,
+        title TEXT NOT NULL, created_at TEXT, codec TEXT, body BLOB, UNIQUE (kind, ref_id))""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS search_fts USING fts5(
+        title, body, kind, content='', tokenize='porter unicode61')""",
+]
+
+# Index registry, mirroring db.INDEXES: equality columns first, then the sort key
+INDEXES = {
+    'tasks': [
+        ('tasks_created_at_id', ['created_at', 'id']),
+        ('tasks_status_created_at_id', ['status', 'created_at', 'id']),
+        ('tasks_assignee_created_at_id', ['assignee', 'created_at', 'id']),
+        ('tasks_meeting_id_created_at_id', ['meeting_id', 'created_at', 'id']),
+        ('tasks_status_actual_deadline', ['status', 'actual_deadline']),
+        ('tasks_transcript_id', ['transcript_id']),
+    ],
+    'summaries': [
+        ('summaries_created_at_id', ['created_at', 'id']),
+        ('summaries_transcript_id', ['transcript_id']),
+    ],
+    'transcripts': [
+        ('transcripts_created_at_id', ['created_at', 'id']),
+    ],
+    'transcript_segments': [
+        ('transcript_segments_transcript_id_start', ['transcript_id', 'start']),
+    ],
+}
+
+# Document fields copied into columns, per table
+COLUMNS = {
+    'transcripts': [],
+    'summaries': ['transcript_id'],
+    'tasks': ['status', 'assignee', 'priority', 'meeting_id', 'transcript_id', 'actual_deadline'],
+}
+
+OPEN_STATUS_PLACEHOLDERS = ', '.join('?' for _ in OPEN_TASK_STATUSES)
+OVERDUE_SQL = (f"SELECT id, doc FROM tasks WHERE status IN ({OPEN_STATUS_PLACEHOLDERS}) "
+               f"AND actual_deadline < ? ORDER BY actual_deadline")
+UPCOMING_SQL = (f"SELECT id, doc FROM tasks WHERE status IN ({OPEN_STATUS_PLACEHOLDERS}) "
+                f"AND actual_deadline >= ? AND actual_deadline <= ? ORDER BY actual_deadline")
+DEADLINE_COUNTS_SQL = (f"SELECT COALESCE(SUM(actual_deadline < ?), 0), COALESCE(SUM(actual_deadline >= ?), 0) "
+                       f"FROM tasks WHERE status IN ({OPEN_STATUS_PLACEHOLDERS}) AND actual_deadline <= ?")
+SEGMENTS_SQL = ('SELECT doc FROM transcript_segments WHERE transcript_id = ? AND start < ? AND "end" > ? '
+                'ORDER BY start')
+# Best BM25 score first over every match (bm25() is lower for better
+# matches; the kind column does not count)
+SEARCH_SQL = (f"SELECT rowid, bm25(search_fts, {TITLE_WEIGHT}, 1.0, 0.0) AS score FROM search_fts "
+              f"WHERE search_fts MATCH ? ORDER BY score LIMIT ? OFFSET ?")
+
+# Representative query shapes checked by explain_query_plans: (name, table, filters or SQL, parameters)
+QUERY_SHAPES = [
+    ('get_all_tasks', 'tasks', {}, None),
+    ('get_all_tasks(status)', 'tasks', {'status': 'pending'}, None),
+    ('get_tasks(assignee)', 'tasks', {'assignee': 'TBD'}, None),
+    ('get_tasks_by_meeting', 'tasks', {'meeting_id': ''}, None),
+    ('get_overdue_tasks', 'tasks', OVERDUE_SQL, [*OPEN_TASK_STATUSES, '9999-12-31']),
+    ('get_upcoming_tasks', 'tasks', UPCOMING_SQL, [*OPEN_TASK_STATUSES, '0000-01-01', '9999-12-31']),
+    ('delete_transcript(tasks)', 'tasks', 'SELECT id FROM tasks WHERE transcript_id = ?', ['']),
+    ('delete_transcript(summaries)', 'summaries', 'SELECT id FROM summaries WHERE transcript_id = ?', ['']),
+    ('get_recent_meetings', 'summaries', {}, None),
+    ('get_segments_in_range', 'transcript_segments', SEGMENTS_SQL, ['', 60.0, 0.0]),
+    ('search', 'search_fts', SEARCH_SQL, ['{title body} : ("payment")', 11, 0]),
+]
+
+_FIELD_NAME = re.compile(r'^\w+$')
+
+
+def _encode_value(value):
+    """JSON form of the BSON types documents carry"""
+    if isinstance(value, datetime):
+        return {'$date': value.isoformat()}
+    if isinstance(value, ObjectId):
+        return {'$oid': str(value)}
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return {'$binary': base64.b64encode(bytes(value)).decode()}
+    raise TypeError(f"Cannot store {type(value).__name__} values")
+
+
+def _decode_value(obj: Dict):
+    if len(obj) == 1:
+        if '$date' in obj:
+            return datetime.fromisoformat(obj['$date'])
+        if '$oid' in obj:
+            return ObjectId(obj['$oid'])
+        if '$binary' in obj:
+            return base64.b64decode(obj['$binary'])
+    return obj
+
+
+def dumps(document: Dict) -> str:
+    """Serialize a document (without its _id) to JSON"""
+    return json.dumps({key: value for key, value in document.items() if key != '_id'}, default=_encode_value)
+
+
+def loads(document_id: Optional[str], doc: str) -> Dict:
+    """Deserialize a stored document, restoring its ObjectId _id"""
+    document = json.loads(doc, object_hook=_decode_value)
+    if document_id is not None:
+        document['_id'] = ObjectId(document_id)
+    return document
+
+
+def sort_key(created_at: datetime) -> str:
+    """Fixed-width timestamp, so text order matches time order"""
+    return created_at.isoformat(timespec='microseconds')
+
+
+def _project(document: Dict, projection: Optional[List[str]]) -> Dict:
+    if projection is None:
+        return document
+    fields = {'_id', 'created_at', *projection}
+    return {key: value for key, value in document.items() if key in fields}
+
+
+class SQLiteStorage(StorageBackend):
+    """
+    Stores transcripts, summaries and tasks in one SQLite file
+
+    Documents are kept as JSON with their queried fields copied into indexed
+    columns. One connection is shared by all threads behind a lock; the
+    database runs in WAL mode so readers in other processes are not blocked.
+    """
+
+    name = 'sqlite'
+
+    def __init__(self, path: Optional[str] = None):
+        """
+        Initialize the storage without opening it
+
+        Args:
+            path: Database file (defaults to $SQLITE_PATH or 'meeting_summarizer.db')
+        """
+        super().__init__()
+        self.path = path or os.getenv('SQLITE_PATH', 'meeting_summarizer.db')
+        self.conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def connect(self):
+        """Open the database file and create missing tables and indexes"""
+        if self._connected:
+            return
+        try:
+            self.conn = sqlite3.connect(self.path, check_same_thread=False)
+            self.conn.execute('PRAGMA journal_mode=WAL')
+            self.conn.execute('PRAGMA synchronous=NORMAL')
+            with self.conn:
+                for statement in SCHEMA:
+                    self.conn.execute(statement)
+            self._connected = True
+            logger.info(f"✅ Opened SQLite database: {self.path}")
+            self.ensure_indexes()
+            # Databases written before the search index existed are indexed once
+            unindexed = self.conn.execute(
+                'SELECT NOT EXISTS (SELECT 1 FROM search_entries) AND (EXISTS (SELECT 1 FROM transcript_bodies) '
+                'OR EXISTS (SELECT 1 FROM summaries) OR EXISTS (SELECT 1 FROM tasks))'
+            ).fetchone()[0]
+            if unindexed:
+                self.rebuild_search_index()
+        except sqlite3.Error as e:
+            logger.error(f"❌ Could not open SQLite database {self.path}: {e}")
+            raise RuntimeError(f"❌ Could not open SQLite database: {e}")
+
+    def _db(self) -> sqlite3.Connection:
+        if not self._connected:
+            raise RuntimeError("Database not connected. Call connect() first.")
+        return self.conn
+
+    def ensure_indexes(self) -> Dict[str, List[str]]:
+        """Create every index in the INDEXES registry (no-op for existing ones)"""
+        conn = self._db()
+        with self._lock, conn:
+            for table, indexes in INDEXES.items():
+                for name, columns in indexes:
+                    conn.execute(f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(columns)})")
+        return {table: [name for name, _ in indexes] for table, indexes in INDEXES.items()}
+
+    def explain_query_plans(self) -> List[Dict]:
+        """
+        Explain each hot query shape and flag any that still scan a whole table
+
+        Returns:
+            List of dictionaries with 'query', 'collection', 'stages',
+            'indexes' and 'collscan' (True if a table is scanned without an index)
+        """
+        report = []
+        for name, table, query, params in QUERY_SHAPES:
+            if isinstance(query, dict):
+                query, params = self._page_query(table, query, None, DEFAULT_PAGE_SIZE)
+            with self._lock:
+                details = [row[-1] for row in self._db().execute(f"EXPLAIN QUERY PLAN {query}", params)]
+            collscan = any(detail.startswith('SCAN') and 'INDEX' not in detail for detail in details)
+            if collscan:
+                logger.warning(f"Query {name} on {table} scans the whole table")
+            report.append({
+                'query': name,
+                'collection': table,
+                'stages': details,
+                'indexes': sorted({match for detail in details
+                                   for match in re.findall(r'INDEX (\w+)', detail)}),
+                'collscan': collscan
+            })
+        return report
+
+    def ping(self) -> bool:
+        """Check that the database answers"""
+        try:
+            with self._lock:
+                self._db().execute('SELECT 1')
+            return True
+        except Exception as e:
+            logger.error(f"Database ping failed: {e}")
+            return False
+
+    def close_connection(self):
+        """Close the database"""
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+            self._connected = False
+            logger.info("Database connection closed")
+
+    # Documents
+
+    def _insert(self, conn: sqlite3.Connection, table: str, document: Dict):
+        """Insert a document, assigning its _id and created_at like insert_one"""
+        document.setdefault('_id', ObjectId())
+        columns = COLUMNS[table]
+        conn.execute(
+            f"INSERT INTO {table} (id, {''.join(f'{column}, ' for column in columns)}created_at, doc) "
+            f"VALUES ({', '.join('?' for _ in range(len(columns) + 3))})",
+            [str(document['_id']), *(document.get(column) for column in columns),
+             sort_key(document['created_at']), dumps(document)]
+        )
+
+    def _replace(self, conn: sqlite3.Connection, table: str, document: Dict):
+        """Write back a changed document and its indexed columns"""
+        columns = COLUMNS[table]
+        conn.execute(
+            f"UPDATE {table} SET {''.join(f'{column} = ?, ' for column in columns)}doc = ? WHERE id = ?",
+            [*(document.get(column) for column in columns), dumps(document), str(document['_id'])]
+        )
+
+    def _find_by_id(self, table: str, document_id) -> Optional[Dict]:
+        with self._lock:
+            row = self._db().execute(f"SELECT id, doc FROM {table} WHERE id = ?", (str(document_id),)).fetchone()
+        return loads(*row) if row else None
+
+    def _page_query(self, table: str, filters: Optional[Dict], page_token: Optional[str],
+                    page_size: int) -> Tuple[str, List]:
+        """SQL and parameters for one keyset page (newest first)"""
+        conditions, params = [], []
+        for field, value in (filters or {}).items():
+            if not _FIELD_NAME.match(field):
+                raise ValueError(f"Invalid filter field: {field}")
+            column = field if field in COLUMNS[table] else f"json_extract(doc, '$.{field}')"
+            conditions.append(f"{column} = ?")
+            params.append(str(value) if isinstance(value, ObjectId) else value)
+        if page_token:
+            created_at, document_id = decode_page_token(page_token)
+            conditions.append('(created_at < ? OR (created_at = ? AND id < ?))')
+            params.extend([sort_key(created_at), sort_key(created_at), str(document_id)])
+        where = f" WHERE {' AND '.join(conditions)}" if conditions else ''
+        return (f"SELECT id, doc FROM {table}{where} ORDER BY created_at DESC, id DESC LIMIT ?",
+                params + [page_size + 1])
+
+    def _find_page(self, table: str, filters: Optional[Dict], projection: Optional[List[str]],
+                   page_size: int, page_token: Optional[str]) -> Dict:
+        query, params = self._page_query(table, filters, page_token, page_size)
+        with self._lock:
+            rows = self._db().execute(query, params).fetchall()
+        items = [loads(*row) for row in rows]
+        next_page_token = encode_page_token(items[page_size - 1]) if len(items) > page_size else None
+        return {'items': [_project(item, projection) for item in items[:page_size]],
+                'next_page_token': next_page_token}
+
+    # Transcripts
+
+    def save_transcript(self, transcript_data: Dict) -> str:
+        """Save a raw transcript, its text compressed in transcript_bodies"""
+        transcript_data['created_at'] = datetime.utcnow()
+        transcript_data.setdefault('_id', ObjectId())
+        metadata, body = pack_transcript_body(transcript_data)
+        conn = self._db()
+        with self._lock, conn:
+            if body is not None:
+                self._save_transcript_body(conn, transcript_data['_id'], body)
+            self._insert(conn, 'transcripts', metadata)
+            if body is not None:
+                self._index_search(conn, [search_entry('transcript', metadata, transcript_data['text'])])
+        self._invalidate_transcript(transcript_data['_id'])
+        logger.info(f"Saved transcript with ID: {transcript_data['_id']}")
+        return str(transcript_data['_id'])
+
+    @staticmethod
+    def _save_transcript_body(conn: sqlite3.Connection, transcript_id, body: Dict):
+        conn.execute('INSERT OR REPLACE INTO transcript_bodies (id, codec, data) VALUES (?, ?, ?)',
+                     (str(transcript_id), body['codec'], body['data']))
+
+    def append_transcript_segments(self, transcript_id: str, segments: List[Dict]) -> bool:
+        """Append committed segments (and their text) to a live transcript"""
+        if not segments:
+            return True
+        try:
+            conn = self._db()
+            with self._lock, conn:
+                transcript = self._find_by_id('transcripts', transcript_id)
+                if transcript is None:
+                    return False
+                transcript['text'] = (transcript.get('text') or '') + ''.join(segment['text'] for segment in segments)
+                transcript['segments'] = (transcript.get('segments') or []) + list(segments)
+                transcript['updated_at'] = datetime.utcnow()
+                self._replace(conn, 'transcripts', transcript)
+            self._invalidate_transcript(transcript_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error appending segments to transcript {transcript_id}: {e}")
+            return False
+
+    def finalize_live_transcript(self, transcript_id: str, language: Optional[str] = None) -> bool:
+        """Mark a live transcript as complete"""
+        try:
+            conn = self._db()
+            with self._lock, conn:
+                transcript = self._find_by_id('transcripts', transcript_id)
+                if transcript is None:
+                    return False
+                segments = transcript.pop('segments', None)
+                if segments:
+                    # Move the segments appended during the stream into columnar storage
+                    self.save_transcript_segments(transcript_id, segments)
+                # Pack the text streamed inline into a compressed body
+                text = transcript.pop('text', None) or ''
+                body = compress_text(text)
+                self._save_transcript_body(conn, transcript_id, body)
+                transcript.update({'status': 'completed', 'updated_at': datetime.utcnow(),
+                                   **transcript_body_fields(text, body)})
+                if language:
+                    transcript['language'] = language
+                self._replace(conn, 'transcripts', transcript)
+                self._index_search(conn, [search_entry('transcript', transcript, text)])
+            self._invalidate_transcript(transcript_id)
+            return True
+        except Exception as e:
+            logger.error(f"Error finalizing transcript {transcript_id}: {e}")
+            return False
+
+    def save_transcript_segments(self, transcript_id: str, segments) -> int:
+        """Persist timed segments in compact columnar buckets (see storage.segment_buckets)"""
+        buckets = segment_buckets(transcript_id, segments)
+        if not buckets:
+            return 0
+        conn = self._db()
+        with self._lock, conn:
+            conn.execute('DELETE FROM transcript_segments WHERE transcript_id = ?', (transcript_id,))
+            conn.executemany(
+                'INSERT INTO transcript_segments (transcript_id, start, "end", doc) VALUES (?, ?, ?, ?)',
+                [(transcript_id, bucket['start'], bucket['end'], dumps(bucket)) for bucket in buckets]
+            )
+        logger.info(f"Saved {len(segments)} segments in {len(buckets)} buckets for transcript {transcript_id}")
+        return len(buckets)
+
+    def get_segments_in_range(self, transcript_id: str, start: float = 0.0, end: float = float('inf')) -> List[Dict]:
+        """Get the segments of a transcript that overlap a time range"""
+        with self._lock:
+            rows = self._db().execute(SEGMENTS_SQL, (transcript_id, end, start)).fetchall()
+        return segments_from_buckets((loads(None, row[0]) for row in rows), start, end)
+
+    def _load_transcript(self, transcript_id: str, operation: Optional[str] = None) -> Optional[Dict]:
+        """Read a transcript's metadata by ID"""
+        try:
+            transcript = self._find_by_id('transcripts', transcript_id)
+            if transcript is not None:
+                # Live transcripts hold their text inline until finalized
+                transcript.pop('text', None)
+            return transcript
+        except Exception as e:
+            logger.error(f"Error getting transcript {transcript_id}: {e}")
+            return None
+
+    def _load_transcript_body(self, transcript_id: str, operation: Optional[str] = None) -> Optional[Dict]:
+        """Read a transcript's compressed body, or its inline text while it is live"""
+        try:
+            with self._lock:
+                row = self._db().execute('SELECT codec, data FROM transcript_bodies WHERE id = ?',
+                                         (str(transcript_id),)).fetchone()
+            if row is not None:
+                return {'codec': row[0], 'data': row[1]}
+            transcript = self._find_by_id('transcripts', transcript_id)
+            if transcript is None:
+                return None
+            return {'codec': 'none', 'data': (transcript.get('text') or '').encode('utf-8')}
+        except Exception as e:
+            logger.error(f"Error getting transcript text {transcript_id}: {e}")
+            return None
+
+    def delete_transcript(self, transcript_id: str) -> bool:
+        """Delete a transcript and related data"""
+        try:
+            conn = self._db()
+            with self._lock, conn:
+                transcript = self._find_by_id('transcripts', transcript_id)
+                removed_summaries = [('summary', row[0]) for row in conn.execute(
+                    'SELECT id FROM summaries WHERE transcript_id = ?', (transcript_id,))]
+                removed_tasks = [
+                    {'_id': task_id, 'status': status, 'assignee': assignee} for task_id, status, assignee in
+                    conn.execute('SELECT id, status, assignee FROM tasks WHERE transcript_id = ?', (transcript_id,))
+                ]
+                # Before the body goes: the index needs it to remove the transcript
+                self._unindex_search(conn, [('transcript', str(transcript_id)), *removed_summaries,
+                                            *(('task', task['_id']) for task in removed_tasks)])
+                conn.execute('DELETE FROM transcripts WHERE id = ?', (str(transcript_id),))
+                conn.execute('DELETE FROM transcript_bodies WHERE id = ?', (str(transcript_id),))
+                conn.execute('DELETE FROM summaries WHERE transcript_id = ?', (transcript_id,))
+                conn.execute('DELETE FROM tasks WHERE transcript_id = ?', (transcript_id,))
+                self._apply_task_counters(conn, [(task, None) for task in removed_tasks])
+                conn.execute('DELETE FROM transcript_segments WHERE transcript_id = ?', (transcript_id,))
+            self._invalidate_transcript(transcript_id)
+            self._invalidate_tasks()
+
+            # Delete the stored original media from the store it was saved in
+            if transcript and transcript.get('media_id'):
+                from media_store import delete_media
+                delete_media(transcript['media_id'], transcript.get('media_store'))
+
+            logger.info(f"Deleted transcript and related data: {transcript_id}")
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting transcript {transcript_id}: {e}")
+            return False
+
+    # Summaries
+
+    def save_summary(self, summary_data: Dict) -> str:
+        """Save a meeting summary"""
+        summary_data['created_at'] = datetime.utcnow()
+        conn = self._db()
+        with self._lock, conn:
+            self._insert(conn, 'summaries', summary_data)
+            self._index_search(conn, [search_entry('summary', summary_data)])
+        self._invalidate_summary(summary_data['_id'])
+        logger.info(f"Saved summary with ID: {summary_data['_id']}")
+        return str(summary_data['_id'])
+
+    def _load_summary(self, summary_id: str, operation: Optional[str] = None) -> Optional[Dict]:
+        """Read a summary by ID"""
+        try:
+            return self._find_by_id('summaries', summary_id)
+        except Exception as e:
+            logger.error(f"Error getting summary {summary_id}: {e}")
+            return None
+
+    def get_meetings_page(self, projection: Optional[List[str]] = MEETING_LIST_FIELDS,
+                          page_size: int = DEFAULT_PAGE_SIZE, page_token: Optional[str] = None,
+                          operation: Optional[str] = None) -> Dict:
+        """One page of meeting summaries, newest first"""
+        return self._find_page('summaries', None, projection, page_size, page_token)
+
+    # Tasks
+
+    def save_task(self, task_data: Dict) -> str:
+        """Save a task"""
+        task_data['created_at'] = datetime.utcnow()
+        conn = self._db()
+        with self._lock, conn:
+            self._insert(conn, 'tasks', task_data)
+            self._apply_task_counters(conn, [(None, task_data)])
+            self._index_search(conn, [search_entry('task', task_data)])
+        self._invalidate_tasks()
+        logger.info(f"Saved task with ID: {task_data['_id']}")
+        return str(task_data['_id'])
+
+    def save_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        """
+        Save many tasks in one transaction
+
+        A failing document does not stop the others.
+        """
+        if not tasks:
+            return []
+        now = datetime.utcnow()
+        results, saved = [], []
+        conn = self._db()
+        with self._lock, conn:
+            for task in tasks:
+                task['created_at'] = now
+                try:
+                    self._insert(conn, 'tasks', task)
+                    results.append({'task_id': str(task['_id']), 'error': None})
+                    saved.append(task)
+                except (sqlite3.Error, TypeError, ValueError) as e:
+                    results.append({'task_id': None, 'error': str(e)})
+            self._apply_task_counters(conn, [(None, task) for task in saved])
+            self._index_search(conn, [search_entry('task', task) for task in saved])
+        self._invalidate_tasks()
+        logger.info(f"Saved {len(saved)} of {len(tasks)} tasks in bulk")
+        return results
+
+    def get_task(self, task_id: str) -> Optional[Dict]:
+        """Get a task by ID"""
+        try:
+            return self._find_by_id('tasks', task_id)
+        except Exception as e:
+            logger.error(f"Error getting task {task_id}: {e}")
+            return None
+
+    def update_task(self, task_id: str, updates: Dict) -> bool:
+        """Update task fields and keep the task counters in step"""
+        try:
+            conn = self._db()
+            with self._lock, conn:
+                before = self._find_by_id('tasks', task_id)
+                if before is None:
+                    return False
+                after = {**before, **updates, 'updated_at': datetime.utcnow()}
+                self._replace(conn, 'tasks', after)
+                self._apply_task_counters(conn, [(before, after)])
+                if any(field in updates for field in TASK_SEARCH_FIELDS):
+                    self._index_search(conn, [search_entry('task', after)])
+            self._invalidate_tasks()
+            return True
+        except Exception as e:
+            logger.error(f"Error updating task {task_id}: {e}")
+            return False
+
+    def delete_task(self, task_id: str) -> bool:
+        """Delete a task and remove it from the task counters"""
+        try:
+            conn = self._db()
+            with self._lock, conn:
+                before = self._find_by_id('tasks', task_id)
+                if before is None:
+                    return False
+                conn.execute('DELETE FROM tasks WHERE id = ?', (str(task_id),))
+                self._apply_task_counters(conn, [(before, None)])
+                self._unindex_search(conn, [('task', str(task_id))])
+            self._invalidate_tasks()
+            return True
+        except Exception as e:
+            logger.error(f"Error deleting task {task_id}: {e}")
+            return False
+
+    def delete_tasks_by_meeting(self, meeting_id: str) -> int:
+        """Delete every task of a meeting and remove them from the task counters"""
+        conn = self._db()
+        with self._lock, conn:
+            removed_tasks = [
+                {'_id': task_id, 'status': status, 'assignee': assignee} for task_id, status, assignee in
+                conn.execute('SELECT id, status, assignee FROM tasks WHERE meeting_id = ?', (meeting_id,))
+            ]
+            conn.execute('DELETE FROM tasks WHERE meeting_id = ?', (meeting_id,))
+            self._apply_task_counters(conn, [(task, None) for task in removed_tasks])
+            self._unindex_search(conn, [('task', task['_id']) for task in removed_tasks])
+        self._invalidate_tasks()
+        return len(removed_tasks)
+
+    def get_tasks_page(self, filters: Optional[Dict] = None, projection: Optional[List[str]] = TASK_LIST_FIELDS,
+                       page_size: int = DEFAULT_PAGE_SIZE, page_token: Optional[str] = None,
+                       operation: Optional[str] = None) -> Dict:
+        """One page of tasks, newest first"""
+        return self._find_page('tasks', filters, projection, page_size, page_token)
+
+    def get_overdue_tasks(self) -> List[Dict]:
+        """Get open tasks whose deadline has passed, earliest deadline first"""
+        today_str, _ = deadline_window(0)
+        with self._lock:
+            rows = self._db().execute(OVERDUE_SQL, [*OPEN_TASK_STATUSES, today_str]).fetchall()
+        return [loads(*row) for row in rows]
+
+    def get_upcoming_tasks(self, days_ahead: int = 7) -> List[Dict]:
+        """Get open tasks due within `days_ahead` days, earliest deadline first"""
+        today_str, future_str = deadline_window(days_ahead)
+        with self._lock:
+            rows = self._db().execute(UPCOMING_SQL, [*OPEN_TASK_STATUSES, today_str, future_str]).fetchall()
+        return [loads(*row) for row in rows]
+
+    # Task counters
+
+    def _apply_task_counters(self, conn: sqlite3.Connection, changes: List[Tuple[Optional[Dict], Optional[Dict]]]):
+        """Apply task changes to the task_stats counters inside the caller's transaction"""
+        for scope, increments in self._counter_deltas(changes).items():
+            assignee = None if scope == 'global' else scope.split(':', 1)[1]
+            conn.execute('INSERT OR IGNORE INTO task_stats (id, assignee) VALUES (?, ?)', (scope, assignee))
+            conn.execute(
+                f"UPDATE task_stats SET {', '.join(f'{field} = {field} + ?' for field in increments)} WHERE id = ?",
+                [*increments.values(), scope]
+            )
+
+    def reconcile_task_stats(self) -> Dict:
+        """
+        Recompute the task_stats counters from the tasks table
+
+        Runs in one transaction, so no concurrent write is lost.
+
+        Returns:
+            The recomputed global counters
+        """
+        counters = {'global': {'_id': 'global', 'total': 0, **{status: 0 for status in TASK_COUNTER_STATUSES}}}
+        conn = self._db()
+        with self._lock, conn:
+            for assignee, status, count in conn.execute(
+                    'SELECT assignee, status, COUNT(*) FROM tasks GROUP BY assignee, status'):
+                assignee = assignee or 'TBD'
+                scope = f"assignee:{assignee}"
+                if scope not in counters:
+                    counters[scope] = {'_id': scope, 'assignee': assignee, 'total': 0,
+                                       **{status: 0 for status in TASK_COUNTER_STATUSES}}
+                for document in (counters['global'], counters[scope]):
+                    document['total'] += count
+                    if status in TASK_COUNTER_STATUSES:
+                        document[status] += count
+            conn.execute('DELETE FROM task_stats')
+            reconciled_at = sort_key(datetime.utcnow())
+            conn.executemany(
+                f"INSERT INTO task_stats (id, assignee, total, {', '.join(TASK_COUNTER_STATUSES)}, reconciled_at) "
+                f"VALUES (?, ?, ?, {', '.join('?' for _ in TASK_COUNTER_STATUSES)}, ?)",
+                [(scope, document.get('assignee'), document['total'],
+                  *(document[status] for status in TASK_COUNTER_STATUSES), reconciled_at)
+                 for scope, document in counters.items()]
+            )
+        logger.info(f"Reconciled task counters for {len(counters) - 1} assignees")
+        return counters['global']
+
+    def get_assignee_workload(self, operation: Optional[str] = None) -> List[Dict]:
+        """Per-assignee task counters, busiest first"""
+        fields = ['assignee', 'total', *TASK_COUNTER_STATUSES]
+        with self._lock:
+            rows = self._db().execute(
+                f"SELECT {', '.join(fields)} FROM task_stats WHERE id != 'global' AND total > 0 "
+                f"ORDER BY pending DESC, in_progress DESC"
+            ).fetchall()
+        return [dict(zip(fields, row)) for row in rows]
+
+    def get_task_statistics(self, days_ahead: int = 7, operation: Optional[str] = None) -> Dict:
+        """
+        Get all task counters
+
+        Status counters come from task_stats; overdue and upcoming tasks are
+        counted over the status/deadline index.
+        """
+        today_str, future_str = deadline_window(days_ahead)
+        with self._lock:
+            row = self._db().execute(
+                f"SELECT total, {', '.join(TASK_COUNTER_STATUSES)} FROM task_stats WHERE id = 'global'"
+            ).fetchone()
+            # Counters are kept from the first task write, so no row means no tasks
+            counters = dict(zip(['total', *TASK_COUNTER_STATUSES], row)) if row else {}
+            overdue, upcoming = self._db().execute(
+                DEADLINE_COUNTS_SQL, [today_str, today_str, *OPEN_TASK_STATUSES, future_str]
+            ).fetchone()
+        return {
+            'total_tasks': counters.get('total', 0),
+            'pending_tasks': counters.get('pending', 0),
+            'in_progress_tasks': counters.get('in_progress', 0),
+            'completed_tasks': counters.get('completed', 0),
+            'overdue_tasks': overdue,
+            'upcoming_tasks': upcoming
+        }
+
+    def get_database_stats(self, operation: Optional[str] = 'dashboard') -> Dict:
+        """Get database statistics"""
+        task_stats = self.get_task_statistics(operation=operation)
+        with self._lock:
+            transcripts = self._db().execute('SELECT COUNT(*) FROM transcripts').fetchone()[0]
+            summaries = self._db().execute('SELECT COUNT(*) FROM summaries').fetchone()[0]
+        return {
+            'transcripts': transcripts,
+            'summaries': summaries,
+            'tasks': task_stats['total_tasks'],
+            'pending_tasks': task_stats['pending_tasks'],
+            'in_progress_tasks': task_stats['in_progress_tasks'],
+            'completed_tasks': task_stats['completed_tasks'],
+            'overdue_tasks': task_stats['overdue_tasks']
+        }
+
+    # Search
+
+    def _index_search(self, conn: sqlite3.Connection, entries: List[Dict]):
+        """Add or replace search entries (see search.search_entry) inside the caller's transaction"""
+        self._unindex_search(conn, [(entry['kind'], entry['ref_id']) for entry in entries])
+        for entry in entries:
+            # Transcript bodies are already stored in transcript_bodies
+            body = None if entry['kind'] == 'transcript' else compress_text(entry['text'])
+            cursor = conn.execute(
+                'INSERT INTO search_entries (kind, ref_id, meeting_id, title, created_at, codec, body) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?)',
+                (entry['kind'], entry['ref_id'], entry['meeting_id'], entry['title'],
+                 sort_key(entry['created_at']) if entry['created_at'] else None,
+                 body and body['codec'], body and body['data'])
+            )
+            conn.execute('INSERT INTO search_fts (rowid, title, body, kind) VALUES (?, ?, ?, ?)',
+                         (cursor.lastrowid, entry['title'], entry['text'], entry['kind']))
+
+    def _unindex_search(self, conn: sqlite3.Connection, keys: List[Tuple[str, str]]):
+        """Remove search entries by (kind, ref_id) inside the caller's transaction"""
+        for kind, ref_id in keys:
+            row = conn.execute(
+                'SELECT search_entries.rowid, title, COALESCE(search_entries.codec, transcript_bodies.codec), '
+                'COALESCE(body, transcript_bodies.data) FROM search_entries LEFT JOIN transcript_bodies '
+                "ON kind = 'transcript' AND transcript_bodies.id = ref_id WHERE kind = ? AND ref_id = ?",
+                (kind, str(ref_id))
+            ).fetchone()
+            if row is None:
+                continue
+            rowid, title, codec, data = row
+            text = decompress_text({'codec': codec, 'data': data}) if data is not None else ''
+            # The FTS table keeps no text, so removal needs the indexed values
+            conn.execute("INSERT INTO search_fts (search_fts, rowid, title, body, kind) "
+                         "VALUES ('delete', ?, ?, ?, ?)", (rowid, title, text, kind))
+            conn.execute('DELETE FROM search_entries WHERE rowid = ?', (rowid,))
+
+    def _search_hits(self, terms: List[str], kinds: List[str], offset: int, limit: int) -> List[Dict]:
+        """Ranked hits from the FTS5 index; any term may match"""
+        # Terms match titles and bodies only: the kind column is there for the filter
+        match = '{title body} : (' + ' OR '.join(f'"{term}"' for term in terms) + ')'
+        if set(kinds) != set(SEARCH_KINDS):
+            match = f"({match}) AND kind : ({' OR '.join(kinds)})"
+        with self._lock:
+            ranked = self._db().execute(SEARCH_SQL, (match, limit, offset)).fetchall()
+            if not ranked:
+                return []
+            # Titles and bodies are only read for the rows on this page
+            rows = self._db().execute(
+                f"SELECT rowid, kind, ref_id, meeting_id, title, created_at, codec, body FROM search_entries "
+                f"WHERE rowid IN ({', '.join('?' for _ in ranked)})", [rowid for rowid, _ in ranked]
+            ).fetchall()
+        entries = {row[0]: row for row in rows}
+        hits = []
+        for rowid, score in ranked:
+            _, kind, ref_id, meeting_id, title, created_at, codec, body = entries[rowid]
+            hits.append({
+                'kind': kind,
+                'id': ref_id,
+                'meeting_id': meeting_id,
+                'title': title,
+                'created_at': datetime.fromisoformat(created_at) if created_at else None,
+                'score': -score,
+                'body': {'codec': codec, 'data': body} if body is not None else None
+            })
+        return hits
+
+    def rebuild_search_index(self) -> int:
+        """Re-index every completed transcript, summary and task in one transaction"""
+        conn = self._db()
+        with self._lock, conn:
+            conn.execute('DELETE FROM search_entries')
+            conn.execute("INSERT INTO search_fts (search_fts) VALUES ('delete-all')")
+            count = 0
+            for transcript_id, doc, codec, data in conn.execute(
+                    'SELECT transcripts.id, doc, codec, data FROM transcripts '
+                    'JOIN transcript_bodies ON transcript_bodies.id = transcripts.id').fetchall():
+                text = decompress_text({'codec': codec, 'data': data})
+                self._index_search(conn, [search_entry('transcript', loads(transcript_id, doc), text)])
+                count += 1
+            for table, kind in (('summaries', 'summary'), ('tasks', 'task')):
+                for row in conn.execute(f"SELECT id, doc FROM {table}").fetchall():
+                    self._index_search(conn, [search_entry(kind, loads(*row))])
+                    count += 1
+        logger.info(f"Rebuilt the search index with {count} entries")
+        return count
@@ -0,0 +1,627 @@
+"""
+Storage interface for transcripts, summaries and tasks
+Shared by the MongoDB implementation (db.DatabaseManager) and the embedded SQLite one (sqlite_storage.SQLiteStorage)
+"""
+import json
+import math
+import base64
+import logging
+from datetime import datetime, timedelta
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from bson import ObjectId
+
+from segment_store import SegmentStore
+from document_cache import DocumentCache
+from text_codec import compress_text, decompress_text
+from search import (DEFAULT_SEARCH_PAGE_SIZE, SEARCH_KINDS, query_terms, highlight,
+                    encode_offset_token, decode_offset_token)
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Segments per columnar bucket document in the transcript_segments collection
+SEGMENT_BUCKET_SIZE = 256
+
+# Task statuses that still count as open work (overdue and upcoming counters)
+OPEN_TASK_STATUSES = ['pending', 'in_progress']
+
+# Statuses with their own counter in the task_stats collection
+TASK_COUNTER_STATUSES = ['pending', 'in_progress', 'completed']
+
+DEFAULT_PAGE_SIZE = 50
+
+# Fields list views need; full bodies are only read by ID
+TASK_LIST_FIELDS = ['task', 'assignee', 'priority', 'context', 'status', 'actual_deadline', 'meeting_id', 'created_at']
+MEETING_LIST_FIELDS = ['meeting_title', 'transcript_id', 'meeting_id', 'created_at']
+
+
+def encode_page_token(document: Dict) -> str:
+    """Opaque continuation token for the page after `document` (newest-first order)"""
+    position = {'created_at': document['created_at'].isoformat(), '_id': str(document['_id'])}
+    return base64.urlsafe_b64encode(json.dumps(position).encode()).decode()
+
+
+def decode_page_token(token: str) -> Tuple[datetime, ObjectId]:
+    """
+    Position (created_at, _id) of the last document of the previous page
+
+    Raises:
+        ValueError: If the token is malformed
+    """
+    try:
+        position = json.loads(base64.urlsafe_b64decode(token.encode()))
+        return datetime.fromisoformat(position['created_at']), ObjectId(position['_id'])
+    except Exception as e:
+        raise ValueError(f"Invalid page token: {e}")
+
+
+def deadline_window(days_ahead: int) -> Tuple[str, str]:
+    """Today's date and the date `days_ahead` days from now, as stored in 'actual_deadline'"""
+    today = datetime.utcnow()
+    return today.strftime('%Y-%m-%d'), (today + timedelta(days=days_ahead)).strftime('%Y-%m-%d')
+
+
+def pack_transcript_body(transcript_data: Dict) -> Tuple[Dict, Optional[Dict]]:
+    """
+    Split a transcript into its metadata document and compressed text body
+
+    Live transcripts keep their text inline while segments are appended;
+    finalize_live_transcript packs it once the stream ends.
+
+    Args:
+        transcript_data: Transcript document with 'text'
+
+    Returns:
+        (metadata without 'text' but with its sizes, body from compress_text or None)
+    """
+    if transcript_data.get('status') == 'live' or 'text' not in transcript_data:
+        return dict(transcript_data), None
+    metadata = {key: value for key, value in transcript_data.items() if key != 'text'}
+    body = compress_text(transcript_data['text'] or '')
+    metadata.update(transcript_body_fields(transcript_data['text'] or '', body))
+    return metadata, body
+
+
+def transcript_body_fields(text: str, body: Dict) -> Dict:
+    """Size fields kept on the transcript document so metadata reads never need the body"""
+    return {
+        'text_length': len(text),
+        'body_codec': body['codec'],
+        'text_bytes': body['text_bytes'],
+        'body_bytes': body['stored_bytes']
+    }
+
+
+def segment_buckets(transcript_id: str, segments) -> List[Dict]:
+    """
+    Split timed segments into compact columnar bucket documents
+
+    Each bucket holds up to SEGMENT_BUCKET_SIZE segments as packed
+    start/end/offset arrays plus one text slice, and records its time span
+    so range queries only read the buckets they need.
+
+    Args:
+        transcript_id: ID of the transcript the segments belong to
+        segments: SegmentStore or list of segment dictionaries (sorted by start)
+
+    Returns:
+        List of bucket documents (empty if the segments have no timestamps)
+    """
+    store = segments if isinstance(segments, SegmentStore) else SegmentStore.from_segments(segments)
+    if len(store) == 0:
+        return []
+    if not store.has_timing:
+        logger.warning(f"Segments for transcript {transcript_id} have no timestamps; not stored")
+        return []
+
+    buckets = []
+    for first in range(0, len(store), SEGMENT_BUCKET_SIZE):
+        last = min(first + SEGMENT_BUCKET_SIZE, len(store))
+        bucket = store.to_columns(first, last)
+        bucket.update({
+            'transcript_id': transcript_id,
+            'first_index': first,
+            'start': store.starts[first],
+            'end': max((e for e in store.ends[first:last] if not math.isnan(e)), default=store.starts[last - 1]),
+            'created_at': datetime.utcnow()
+        })
+        buckets.append(bucket)
+    return buckets
+
+
+def segments_from_buckets(buckets, start: float, end: float) -> List[Dict]:
+    """Segments overlapping [start, end) from buckets ordered by start time"""
+    results = []
+    for bucket in buckets:
+        store = SegmentStore.from_columns(bucket)
+        first, last = store.range_for_time(start, end)
+        for index in range(first, last):
+            segment = store.segment(index)
+            segment['index'] += bucket['first_index']
+            if segment['end'] is None or segment['end'] > start:
+                results.append(segment)
+    return results
+
+
+class StorageBackend:
+    """
+    Base interface for transcript, summary and task storage
+
+    IDs are returned as strings and accepted as strings or ObjectIds;
+    documents come back as dictionaries with an ObjectId '_id'. The
+    `operation` argument of read methods names the kind of read
+    ('dashboard', 'export', 'analytics') for backends that route reads.
+
+    Transcripts, summaries and meeting task lists are read through an
+    in-process DocumentCache; implementations load them in
+    _load_transcript / _load_summary and call the _invalidate_* hooks on writes.
+    Writes also keep the full-text search index current (see search.search_entry).
+    """
+
+    name = 'base'
+
+    def __init__(self):
+        self._connected = False
+        self.cache = DocumentCache()
+
+    # Connection
+
+    def connect(self):
+        """Open the backend (idempotent)"""
+        raise NotImplementedError
+
+    def ping(self) -> bool:
+        """Check that the backend answers"""
+        raise NotImplementedError
+
+    def close_connection(self):
+        """Close the backend"""
+        raise NotImplementedError
+
+    def ensure_indexes(self) -> Dict[str, List[str]]:
+        """Create the indexes behind the hot query paths; returns index names per collection"""
+        return {}
+
+    def explain_query_plans(self) -> List[Dict]:
+        """
+        Plan of each hot query shape
+
+        Returns:
+            List of dictionaries with 'query', 'collection', 'stages',
+            'indexes' and 'collscan' (True if a whole collection is scanned)
+        """
+        return []
+
+    def get_pool_metrics(self) -> Dict:
+        """Connection pool metrics (empty for backends without a pool)"""
+        return {}
+
+    def get_cache_stats(self) -> Dict:
+        """Document cache hit rate and entry counts"""
+        return self.cache.get_stats()
+
+    def _invalidate_transcript(self, transcript_id: str):
+        """Drop a changed or deleted transcript and its summaries from the document cache"""
+        self.cache.invalidate(('transcripts', str(transcript_id)))
+        self.cache.invalidate_where('summaries', lambda summary: summary.get('transcript_id') == str(transcript_id))
+
+    def _invalidate_summary(self, summary_id: str):
+        self.cache.invalidate(('summaries', str(summary_id)))
+
+    def _invalidate_tasks(self):
+        """Drop cached meeting task lists after any task write"""
+        self.cache.invalidate_where('meeting_tasks')
+
+    # Transcripts
+
+    def save_transcript(self, transcript_data: Dict) -> str:
+        """
+        Save a raw transcript, its text compressed apart from the metadata (see pack_transcript_body)
+
+        Args:
+            transcript_data: Dictionary containing transcript information
+
+        Returns:
+            str: Document ID of the saved transcript
+        """
+        raise NotImplementedError
+
+    def create_live_transcript(self, transcript_data: Dict) -> str:
+        """
+        Create an empty transcript that a live stream will append to
+
+        Args:
+            transcript_data: Dictionary containing transcript metadata
+
+        Returns:
+            str: Document ID of the live transcript
+        """
+        transcript_data.update({'text': '', 'segments': [], 'status': 'live'})
+        return self.save_transcript(transcript_data)
+
+    def append_transcript_segments(self, transcript_id: str, segments: List[Dict]) -> bool:
+        """
+        Append committed segments (and their text) to a live transcript
+
+        Args:
+            transcript_id: ID of the live transcript
+            segments: Segments with 'start', 'end' and 'text'
+
+        Returns:
+            bool: True if the transcript was updated
+        """
+        raise NotImplementedError
+
+    def finalize_live_transcript(self, transcript_id: str, language: Optional[str] = None) -> bool:
+        """Mark a live transcript as complete and move its segments into columnar storage"""
+        raise NotImplementedError
+
+    def save_transcript_segments(self, transcript_id: str, segments) -> int:
+        """
+        Persist timed segments in compact columnar buckets (see segment_buckets)
+
+        Args:
+            transcript_id: ID of the transcript the segments belong to
+            segments: SegmentStore or list of segment dictionaries (sorted by start)
+
+        Returns:
+            int: Number of bucket documents written
+        """
+        raise NotImplementedError
+
+    def get_segments_in_range(self, transcript_id: str, start: float = 0.0, end: float = float('inf')) -> List[Dict]:
+        """
+        Get the segments of a transcript that overlap a time range
+
+        Args:
+            transcript_id: ID of the transcript
+            start: Range start in seconds
+            end: Range end in seconds
+
+        Returns:
+            List of segment dictionaries ordered by time
+        """
+        raise NotImplementedError
+
+    def get_transcript(self, transcript_id: str, operation: Optional[str] = None,
+                       include_text: bool = True) -> Optional[Dict]:
+        """
+        Get a transcript by ID
+
+        Metadata is read through the document cache; the text body is only
+        fetched and decompressed when `include_text` is set.
+
+        Args:
+            transcript_id: ID of the transcript
+            operation: Kind of read
+            include_text: Add the transcript's 'text'
+
+        Returns:
+            Transcript document, or None if it does not exist
+        """
+        transcript = self.cache.get_or_load(('transcripts', str(transcript_id)),
+                                            lambda: self._load_transcript(transcript_id, operation))
+        if transcript is not None and include_text:
+            transcript['text'] = self.get_transcript_text(transcript_id, operation) or ''
+        return transcript
+
+    def get_transcript_text(self, transcript_id: str, operation: Optional[str] = None) -> Optional[str]:
+        """Text of a transcript (None if it does not exist)"""
+        body = self._load_transcript_body(transcript_id, operation)
+        return None if body is None else decompress_text(body)
+
+    def _load_transcript(self, transcript_id: str, operation: Optional[str] = None) -> Optional[Dict]:
+        """Read a transcript's metadata (never its text) from the database"""
+        raise NotImplementedError
+
+    def _load_transcript_body(self, transcript_id: str, operation: Optional[str] = None) -> Optional[Dict]:
+        """
+        Read a transcript's text body
+
+        Returns:
+            Dictionary with 'codec' and 'data' (codec 'none' for text still
+            held inline), or None if the transcript does not exist
+        """
+        raise NotImplementedError
+
+    def delete_transcript(self, transcript_id: str) -> bool:
+        """Delete a transcript with its media, summaries, tasks and segments"""
+        raise NotImplementedError
+
+    # Summaries
+
+    def save_summary(self, summary_data: Dict) -> str:
+        """
+        Save a meeting summary
+
+        Args:
+            summary_data: Dictionary containing summary information
+
+        Returns:
+            str: Document ID of the saved summary
+        """
+        raise NotImplementedError
+
+    def get_summary(self, summary_id: str, operation: Optional[str] = None) -> Optional[Dict]:
+        """Get a summary by ID (read through the document cache)"""
+        return self.cache.get_or_load(('summaries', str(summary_id)),
+                                      lambda: self._load_summary(summary_id, operation))
+
+    def _load_summary(self, summary_id: str, operation: Optional[str] = None) -> Optional[Dict]:
+        """Read a summary from the database"""
+        raise NotImplementedError
+
+    def get_meetings_page(self, projection: Optional[List[str]] = MEETING_LIST_FIELDS,
+                          page_size: int = DEFAULT_PAGE_SIZE, page_token: Optional[str] = None,
+                          operation: Optional[str] = None) -> Dict:
+        """
+        One page of meeting summaries, newest first
+
+        Args:
+            projection: Fields to return (defaults to the meeting list fields)
+            page_size: Meetings per page
+            page_token: Token from the previous page
+            operation: Kind of read
+
+        Returns:
+            Dictionary with 'items' and 'next_page_token' (None on the last page)
+        """
+        raise NotImplementedError
+
+    def get_recent_meetings(self, limit: int = 10, operation: Optional[str] = None,
+                            projection: Optional[List[str]] = MEETING_LIST_FIELDS) -> List[Dict]:
+        """Get recent meetings (titles only unless a projection asks for more)"""
+        return self.get_meetings_page(projection, limit, None, operation)['items']
+
+    # Tasks
+
+    def save_task(self, task_data: Dict) -> str:
+        """
+        Save a task
+
+        Args:
+            task_data: Dictionary containing task information
+
+        Returns:
+            str: Document ID of the saved task
+        """
+        raise NotImplementedError
+
+    def save_tasks(self, tasks: List[Dict]) -> List[Dict]:
+        """
+        Save many tasks at once; a failing document does not stop the others
+
+        Args:
+            tasks: Task documents
+
+        Returns:
+            List aligned with `tasks` of dictionaries with 'task_id' (None on
+            failure) and 'error' (None on success)
+        """
+        raise NotImplementedError
+
+    def get_task(self, task_id: str) -> Optional[Dict]:
+        """Get a task by ID"""
+        raise NotImplementedError
+
+    def update_task(self, task_id: str, updates: Dict) -> bool:
+        """
+        Update task fields and keep the task counters in step
+
+        Args:
+            task_id: ID of the task to update
+            updates: Fields to set
+
+        Returns:
+            bool: True if the task exists
+        """
+        raise NotImplementedError
+
+    def update_task_status(self, task_id: str, status: str) -> bool:
+        """
+        Update task status
+
+        Args:
+            task_id: ID of the task to update
+            status: New status ('pending', 'completed', etc.)
+
+        Returns:
+            bool: True if update was successful
+        """
+        return self.update_task(task_id, {'status': status})
+
+    def delete_task(self, task_id: str) -> bool:
+        """
+        Delete a task and remove it from the task counters
+
+        Args:
+            task_id: ID of the task to delete
+
+        Returns:
+            bool: True if the task existed
+        """
+        raise NotImplementedError
+
+    def delete_tasks_by_meeting(self, meeting_id: str) -> int:
+        """Delete every task of a meeting; returns the number deleted"""
+        raise NotImplementedError
+
+    def get_tasks_page(self, filters: Optional[Dict] = None, projection: Optional[List[str]] = TASK_LIST_FIELDS,
+                       page_size: int = DEFAULT_PAGE_SIZE, page_token: Optional[str] = None,
+                       operation: Optional[str] = None) -> Dict:
+        """
+        One page of tasks, newest first
+
+        Args:
+            filters: Optional equality filters (status, assignee, priority, meeting_id)
+            projection: Fields to return (defaults to the task list fields)
+            page_size: Tasks per page
+            page_token: Token from the previous page
+            operation: Kind of read
+
+        Returns:
+            Dictionary with 'items' and 'next_page_token' (None on the last page)
+        """
+        raise NotImplementedError
+
+    def iter_tasks(self, filters: Optional[Dict] = None, projection: Optional[List[str]] = None,
+                   operation: Optional[str] = None) -> Iterator[Dict]:
+        """Yield every matching task page by page, newest first"""
+        page_token = None
+        while True:
+            page = self.get_tasks_page(filters, projection, DEFAULT_PAGE_SIZE, page_token, operation)
+            yield from page['items']
+            page_token = page['next_page_token']
+            if page_token is None:
+                return
+
+    def get_all_tasks(self, status: Optional[str] = None, operation: Optional[str] = None,
+                      projection: Optional[List[str]] = None) -> List[Dict]:
+        """
+        Get all tasks, optionally filtered by status
+
+        Args:
+            status: Optional status filter ('pending', 'completed', etc.)
+            operation: Kind of read
+            projection: Fields to return (None for whole documents)
+
+        Returns:
+            List of task documents
+        """
+        filters = {} if status is None else {'status': status}
+        return list(self.iter_tasks(filters, projection, operation))
+
+    def get_tasks_by_meeting(self, meeting_id: str, operation: Optional[str] = None,
+                             projection: Optional[List[str]] = None) -> List[Dict]:
+        """Get all tasks for a specific meeting (read through the document cache)"""
+        key = ('meeting_tasks', meeting_id, None if projection is None else tuple(projection))
+        return self.cache.get_or_load(
+            key, lambda: list(self.iter_tasks({'meeting_id': meeting_id}, projection, operation))
+        )
+
+    def get_overdue_tasks(self) -> List[Dict]:
+        """Get open tasks whose deadline has passed, earliest deadline first"""
+        raise NotImplementedError
+
+    def get_upcoming_tasks(self, days_ahead: int = 7) -> List[Dict]:
+        """Get open tasks due within `days_ahead` days, earliest deadline first"""
+        raise NotImplementedError
+
+    # Task counters
+
+    @staticmethod
+    def _counter_deltas(changes: List[Tuple[Optional[Dict], Optional[Dict]]]) -> Dict[str, Dict[str, int]]:
+        """
+        Counter increments per task_stats document for a list of task changes
+
+        Args:
+            changes: (before, after) pairs of task documents; None for a task
+                that did not exist before or no longer exists after
+
+        Returns:
+            Dictionary mapping task_stats _id ('global' or 'assignee:<name>') to {field: increment}
+        """
+        deltas: Dict[str, Dict[str, int]] = {}
+        for before, after in changes:
+            for task, sign in ((before, -1), (after, 1)):
+                if task is None:
+                    continue
+                fields = ['total']
+                if task.get('status') in TASK_COUNTER_STATUSES:
+                    fields.append(task['status'])
+                for scope in ('global', f"assignee:{task.get('assignee') or 'TBD'}"):
+                    scope_deltas = deltas.setdefault(scope, {})
+                    for field in fields:
+                        scope_deltas[field] = scope_deltas.get(field, 0) + sign
+        return {
+            scope: {field: delta for field, delta in scope_deltas.items() if delta}
+            for scope, scope_deltas in deltas.items()
+            if any(scope_deltas.values())
+        }
+
+    def reconcile_task_stats(self) -> Dict:
+        """Recompute the task counters from the tasks; returns the global counters"""
+        raise NotImplementedError
+
+    def get_assignee_workload(self, operation: Optional[str] = None) -> List[Dict]:
+        """
+        Per-assignee task counters, busiest first
+
+        Returns:
+            List of dictionaries with 'assignee', 'total' and a count per status
+        """
+        raise NotImplementedError
+
+    def get_task_statistics(self, days_ahead: int = 7, operation: Optional[str] = None) -> Dict:
+        """
+        Get all task counters
+
+        Returns:
+            Dictionary with 'total_tasks', 'pending_tasks', 'in_progress_tasks',
+            'completed_tasks', 'overdue_tasks' and 'upcoming_tasks'
+        """
+        raise NotImplementedError
+
+    def get_database_stats(self, operation: Optional[str] = 'dashboard') -> Dict:
+        """Get transcript, summary and task counts"""
+        raise NotImplementedError
+
+    # Search
+
+    def search(self, query: str, kinds: Optional[List[str]] = None,
+               page_size: int = DEFAULT_SEARCH_PAGE_SIZE, page_token: Optional[str] = None) -> Dict:
+        """
+        Full-text search across transcripts, summaries and tasks, best match first
+
+        Args:
+            query: Words to look for (any of them may match)
+            kinds: Restrict to some of 'transcript', 'summary' and 'task'
+            page_size: Hits per page
+            page_token: 'next_page_token' of the previous page
+
+        Returns:
+            Dictionary with 'items' (hits with 'kind', 'id', 'meeting_id',
+            'title', 'created_at', 'score', 'snippet' and 'highlights', the
+            (start, end) offsets of matched words in the snippet) and
+            'next_page_token' (None on the last page)
+
+        Raises:
+            ValueError: If `kinds` or `page_token` is invalid
+        """
+        kinds = list(kinds or SEARCH_KINDS)
+        unknown = set(kinds) - set(SEARCH_KINDS)
+        if unknown:
+            raise ValueError(f"Unknown search kinds: {sorted(unknown)}")
+        terms = query_terms(query)
+        if not terms:
+            return {'items': [], 'next_page_token': None}
+        offset = decode_offset_token(page_token) if page_token else 0
+
+        hits = self._search_hits(terms, kinds, offset, page_size + 1)
+        items = []
+        for hit in hits[:page_size]:
+            # Only the hits on this page are decompressed; transcripts are
+            # indexed without a copy of their body
+            body = hit.pop('body') or self._load_transcript_body(hit['id'], 'search')
+            snippet, highlights = highlight(decompress_text(body) if body else '', terms)
+            hit['snippet'], hit['highlights'] = snippet, highlights
+            items.append(hit)
+        next_page_token = encode_offset_token(offset + page_size) if len(hits) > page_size else None
+        return {'items': items, 'next_page_token': next_page_token}
+
+    def _search_hits(self, terms: List[str], kinds: List[str], offset: int, limit: int) -> List[Dict]:
+        """
+        Ranked hits from the search index
+
+        Returns:
+            Dictionaries with 'kind', 'id', 'meeting_id', 'title', 'created_at',
+            'score' and 'body' (the indexed text as written by compress_text;
+            None for transcripts, whose body is read from transcript_bodies)
+        """
+        raise NotImplementedError
+
+    def rebuild_search_index(self) -> int:
+        """Re-index every transcript, summary and task; returns the number of entries"""
+        raise NotImplementedError
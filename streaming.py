@@ -0,0 +1,376 @@
+"""
+Live streaming transcription with incremental, committed transcript output
+Accepts audio chunks from a growing file, a pipe or a replayed recording
+"""
+import os
+import re
+import sys
+import time
+import logging
+import subprocess
+from pathlib import Path
+from typing import BinaryIO, Callable, Dict, Iterator, List, Optional, Union
+
+import numpy as np
+
+from asr_backends import ASRBackend
+from audio_utils import SAMPLE_RATE, decode_audio, get_ffmpeg_binary
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+BYTES_PER_SAMPLE = 2  # s16le
+WAV_HEADER_BYTES = 44
+
+
+# ----------------------------------------------------------------------
+# Chunk sources (all yield mono float32 PCM at 16 kHz)
+# ----------------------------------------------------------------------
+
+def _pcm_from_bytes(data: bytes) -> np.ndarray:
+    usable = len(data) - len(data) % BYTES_PER_SAMPLE
+    return np.frombuffer(data[:usable], np.int16).astype(np.float32) / 32768.0
+
+
+def iter_pipe_chunks(stream: BinaryIO, chunk_seconds: float = 1.0) -> Iterator[np.ndarray]:
+    """
+    Read raw 16 kHz mono s16le PCM from a pipe (e.g. `ffmpeg ... -f s16le - | python streaming.py -`)
+
+    Args:
+        stream: Binary stream to read from
+        chunk_seconds: Audio duration per yielded chunk
+    """
+    chunk_bytes = int(SAMPLE_RATE * chunk_seconds) * BYTES_PER_SAMPLE
+    while True:
+        data = stream.read(chunk_bytes)
+        if not data:
+            return
+        yield _pcm_from_bytes(data)
+
+
+def iter_media_chunks(source: Union[str, Path], chunk_seconds: float = 1.0, realtime: bool = False) -> Iterator[np.ndarray]:
+    """
+    Decode any FFmpeg-readable source incrementally
+
+    Args:
+        source: File path, URL or '-' for stdin
+        chunk_seconds: Audio duration per yielded chunk
+        realtime: Read input at its native rate (FFmpeg -re), e.g. for live replays
+    """
+    command = [get_ffmpeg_binary(), '-hide_banner', '-loglevel', 'error']
+    if source != '-':
+        command.append('-nostdin')
+    if realtime:
+        command.append('-re')
+    command += ['-i', 'pipe:0' if source == '-' else str(source), '-f', 's16le', '-ac', '1', '-ar', str(SAMPLE_RATE), '-']
+    process = subprocess.Popen(command, stdin=sys.stdin.buffer if source == '-' else None, stdout=subprocess.PIPE)
+    try:
+        yield from iter_pipe_chunks(process.stdout, chunk_seconds)
+    finally:
+        process.stdout.close()
+        process.wait()
+
+
+def iter_growing_file(file_path: Union[str, Path], chunk_seconds: float = 1.0,
+                      poll_interval: float = 0.25, idle_timeout: float = 10.0) -> Iterator[np.ndarray]:
+    """
+    Follow a WAV or raw s16le file that is still being recorded
+
+    Stops once the file has not grown for `idle_timeout` seconds.
+
+    Args:
+        file_path: File being written by a recorder (16 kHz mono s16le)
+        chunk_seconds: Audio duration per yielded chunk
+        poll_interval: Seconds between size checks
+        idle_timeout: Seconds without growth before the stream is considered finished
+    """
+    chunk_bytes = int(SAMPLE_RATE * chunk_seconds) * BYTES_PER_SAMPLE
+    with open(file_path, 'rb') as stream:
+        if str(file_path).lower().endswith('.wav'):
+            stream.seek(WAV_HEADER_BYTES)
+        pending = b''
+        last_growth = time.monotonic()
+        while True:
+            data = stream.read(chunk_bytes - len(pending))
+            if data:
+                pending += data
+                last_growth = time.monotonic()
+                if len(pending) >= chunk_bytes:
+                    yield _pcm_from_bytes(pending)
+                    pending = b''
+                continue
+            if time.monotonic() - last_growth > idle_timeout:
+                if pending:
+                    yield _pcm_from_bytes(pending)
+                return
+            time.sleep(poll_interval)
+
+
+def replay_file(file_path: Union[str, Path], chunk_seconds: float = 1.0, speed: float = 1.0) -> Iterator[np.ndarray]:
+    """
+    Replay a recording as if it were live, pacing chunks at `speed` x real time
+
+    Args:
+        file_path: Recording to replay
+        chunk_seconds: Audio duration per yielded chunk
+        speed: 1.0 for real time; larger values replay faster
+    """
+    pcm = decode_audio(file_path)
+    chunk_samples = int(SAMPLE_RATE * chunk_seconds)
+    started = time.monotonic()
+    for index, offset in enumerate(range(0, len(pcm), chunk_samples)):
+        # A chunk becomes available once it has been "spoken"
+        due = started + (index + 1) * chunk_seconds / speed
+        delay = due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        yield pcm[offset:offset + chunk_samples]
+
+
+# ----------------------------------------------------------------------
+# Incremental transcriber
+# ----------------------------------------------------------------------
+
+def _normalize(text: str) -> str:
+    return re.sub(r'[^\w]+', ' ', text.lower()).strip()
+
+
+class StreamingTranscriber:
+    """
+    Sliding-window transcriber that commits segments once they stabilize
+
+    Uncommitted audio is kept in a buffer that is re-transcribed every
+    `step_seconds` of new audio, with the committed text as prompt context.
+    A segment is committed once two consecutive hypotheses agree on it and
+    it ends at least `holdback_seconds` before the buffer end, or when the
+    buffer reaches `window_seconds` and must slide forward.
+    """
+
+    def __init__(self, asr_backend: ASRBackend, step_seconds: float = 2.0,
+                 window_seconds: float = 30.0, holdback_seconds: float = 1.0,
+                 context_chars: int = 200, language: Optional[str] = None,
+                 on_commit: Optional[Callable[[List[Dict]], None]] = None):
+        """
+        Initialize the streaming transcriber
+
+        Args:
+            asr_backend: Loaded ASR backend
+            step_seconds: New audio required before re-transcribing
+            window_seconds: Maximum uncommitted audio kept in the buffer
+            holdback_seconds: Audio at the buffer end that is never committed early
+            context_chars: Committed text passed as prompt to the next window
+            language: Optional language code pinned for every window
+            on_commit: Callback invoked with each batch of committed segments
+        """
+        self.asr_backend = asr_backend
+        self.step_seconds = step_seconds
+        self.window_seconds = window_seconds
+        self.holdback_seconds = holdback_seconds
+        self.context_chars = context_chars
+        self.language = language
+        self.on_commit = on_commit
+
+        self.buffer = np.empty(0, dtype=np.float32)
+        self.buffer_offset = 0.0  # stream time of buffer[0], in seconds
+        self.stream_seconds = 0.0
+        self.committed: List[Dict] = []
+        self.committed_text = ''
+        self._previous_hypothesis: List[Dict] = []
+        self._since_last_pass = 0.0
+        self._started_at: Optional[float] = None
+        self.lags: List[float] = []
+
+    def process_chunk(self, pcm: np.ndarray) -> List[Dict]:
+        """
+        Feed one chunk of audio
+
+        Args:
+            pcm: Mono float32 PCM at 16 kHz
+
+        Returns:
+            Segments committed by this chunk (possibly empty)
+        """
+        if self._started_at is None:
+            # Stream time 0 corresponds to the moment the first chunk arrived,
+            # minus that chunk's own duration
+            self._started_at = time.monotonic() - len(pcm) / SAMPLE_RATE
+        self.buffer = np.concatenate((self.buffer, pcm.astype(np.float32, copy=False)))
+        chunk_seconds = len(pcm) / SAMPLE_RATE
+        self.stream_seconds += chunk_seconds
+        self._since_last_pass += chunk_seconds
+
+        if self._since_last_pass < self.step_seconds:
+            return []
+        self._since_last_pass = 0.0
+        return self._transcribe_buffer(final=False)
+
+    def finish(self) -> List[Dict]:
+        """Commit whatever remains in the buffer at the end of the stream"""
+        if len(self.buffer) == 0:
+            return []
+        return self._transcribe_buffer(final=True)
+
+    def _transcribe_buffer(self, final: bool) -> List[Dict]:
+        buffer_seconds = len(self.buffer) / SAMPLE_RATE
+        options = {}
+        if self.committed_text:
+            options['initial_prompt'] = self.committed_text[-self.context_chars:]
+        result = self.asr_backend.transcribe(self.buffer, language=self.language, **options)
+        if self.language is None and result.get('language'):
+            # Pin the detected language for the following windows
+            self.language = result['language']
+        hypothesis = [segment for segment in result.get('segments', []) if segment.get('text', '').strip()]
+
+        if final:
+            stable_count = len(hypothesis)
+        else:
+            stable_count = 0
+            horizon = buffer_seconds - self.holdback_seconds
+            for index, segment in enumerate(hypothesis):
+                if segment['end'] > horizon:
+                    break
+                previous = self._previous_hypothesis[index] if index < len(self._previous_hypothesis) else None
+                if previous is None or _normalize(previous['text']) != _normalize(segment['text']):
+                    break
+                stable_count = index + 1
+            if stable_count == 0 and buffer_seconds >= self.window_seconds and len(hypothesis) > 1:
+                # The window is full: slide forward by committing all but the last segment
+                stable_count = len(hypothesis) - 1
+
+        committed = []
+        for segment in hypothesis[:stable_count]:
+            committed.append({
+                'start': self.buffer_offset + segment['start'],
+                'end': self.buffer_offset + segment['end'],
+                'text': segment['text']
+            })
+
+        if committed:
+            cut_seconds = hypothesis[stable_count - 1]['end']
+            cut = min(int(cut_seconds * SAMPLE_RATE), len(self.buffer))
+            self.buffer = self.buffer[cut:]
+            self.buffer_offset += cut / SAMPLE_RATE
+            self._previous_hypothesis = []
+            self._record_commit(committed)
+        elif buffer_seconds >= self.window_seconds and not final:
+            # Nothing usable in a full window (e.g. silence): drop the oldest audio
+            drop = int((buffer_seconds - self.window_seconds + self.step_seconds) * SAMPLE_RATE)
+            self.buffer = self.buffer[drop:]
+            self.buffer_offset += drop / SAMPLE_RATE
+            self._previous_hypothesis = []
+        else:
+            self._previous_hypothesis = hypothesis
+
+        if final:
+            self.buffer = np.empty(0, dtype=np.float32)
+        return committed
+
+    def _record_commit(self, segments: List[Dict]):
+        now = time.monotonic()
+        for segment in segments:
+            # Lag = wall time at commit minus wall time when the words were spoken
+            segment['lag_seconds'] = round(now - (self._started_at + segment['end']), 3)
+            self.lags.append(segment['lag_seconds'])
+        self.committed.extend(segments)
+        self.committed_text += ''.join(segment['text'] for segment in segments)
+        if self.on_commit:
+            self.on_commit(segments)
+
+    def run(self, chunks: Iterator[np.ndarray]) -> List[Dict]:
+        """
+        Consume a chunk source to the end
+
+        Args:
+            chunks: Iterator of PCM chunks
+
+        Returns:
+            All committed segments
+        """
+        for chunk in chunks:
+            self.process_chunk(chunk)
+        self.finish()
+        return self.committed
+
+    def lag_stats(self) -> Dict:
+        """Summary of end-to-end commit lag in seconds"""
+        if not self.lags:
+            return {'segments': 0}
+        lags = np.array(self.lags)
+        return {
+            'segments': len(lags),
+            'mean': round(float(lags.mean()), 3),
+            'p50': round(float(np.percentile(lags, 50)), 3),
+            'p95': round(float(np.percentile(lags, 95)), 3),
+            'max': round(float(lags.max()), 3)
+        }
+
+
+def stream_to_database(chunks: Iterator[np.ndarray], asr_backend: ASRBackend, meeting_title: str,
+                       file_name: str = 'live', **transcriber_options) -> Dict:
+    """
+    Transcribe a live source and append committed segments to MongoDB as they arrive
+
+    Args:
+        chunks: PCM chunk source
+        asr_backend: Loaded ASR backend
+        meeting_title: Title stored on the transcript
+        file_name: Source name stored on the transcript
+        **transcriber_options: Options for StreamingTranscriber
+
+    Returns:
+        Dictionary with the transcript ID and lag statistics
+    """
+    from db import get_db_manager
+
+    db_manager = get_db_manager()
+    db_manager.connect()
+    transcript_id = db_manager.create_live_transcript({
+        'file_name': file_name,
+        'file_type': 'audio',
+        'processing_method': f"{asr_backend.name}_streaming",
+        'meeting_title': meeting_title
+    })
+
+    transcriber = StreamingTranscriber(
+        asr_backend,
+        on_commit=lambda segments: db_manager.append_transcript_segments(transcript_id, segments),
+        **transcriber_options
+    )
+    transcriber.run(chunks)
+    db_manager.finalize_live_transcript(transcript_id, language=transcriber.language)
+
+    stats = transcriber.lag_stats()
+    logger.info(f"Live transcript {transcript_id} finished: {stats}")
+    return {'transcript_id': transcript_id, 'lag': stats}
+
+
+def main():
+    """Stream a source into MongoDB: python streaming.py <file|-> [title] [--realtime] [--follow]"""
+    import argparse
+    from transcript_loader import get_transcript_loader
+
+    parser = argparse.ArgumentParser(description="Live streaming transcription")
+    parser.add_argument('source', help="Media file, growing recording, or '-' for stdin")
+    parser.add_argument('title', nargs='?', default='Live meeting')
+    parser.add_argument('--realtime', action='store_true', help="Replay the file at real-time speed")
+    parser.add_argument('--follow', action='store_true', help="Follow a file that is still being recorded")
+    parser.add_argument('--model', default='base')
+    args = parser.parse_args()
+
+    transcript_loader = get_transcript_loader()
+    transcript_loader.load_whisper_model(args.model)
+
+    if args.follow:
+        chunks = iter_growing_file(args.source)
+    elif args.realtime:
+        chunks = replay_file(args.source)
+    else:
+        chunks = iter_media_chunks(args.source)
+
+    result = stream_to_database(chunks, transcript_loader.asr_backend, args.title, file_name=os.path.basename(args.source))
+    print(f"✅ Live transcript saved: {result['transcript_id']} (lag: {result['lag']})")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,15 +3,16 @@ Task Manager for handling task CRUD operations and scheduling with APScheduler
 """
 import os
 import logging
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.date import DateTrigger
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.jobstores.memory import MemoryJobStore
 from apscheduler.executors.pool import ThreadPoolExecutor
 import pytz
-from db import get_db_manager
+from db import DEFAULT_PAGE_SIZE, TASK_LIST_FIELDS, get_db_manager
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -24,6 +25,11 @@ class TaskManager:
         """Initialize the task manager"""
         self.db_manager = get_db_manager()
         self.scheduler = None
+        # Reminder jobs are shared by every task due on the same day:
+        # job ID -> task IDs, and task ID -> job IDs
+        self._reminder_groups: Dict[str, set] = {}
+        self._task_reminders: Dict[str, set] = {}
+        self._reminder_lock = threading.Lock()
         self._setup_scheduler()
     
     def _setup_scheduler(self):
@@ -48,6 +54,22 @@ class TaskManager:
             )
             
             self.scheduler.start()
+            
+            # One daily overdue check covers every task
+            self.scheduler.add_job(
+                func=self._check_overdue_tasks,
+                trigger=IntervalTrigger(days=1),
+                id='overdue_check',
+                replace_existing=True
+            )
+            
+            # Recount the materialized task counters to correct any drift
+            self.scheduler.add_job(
+                func=self._reconcile_task_stats,
+                trigger=IntervalTrigger(hours=float(os.getenv('TASK_STATS_RECONCILE_HOURS', '24'))),
+                id='reconcile_task_stats',
+                replace_existing=True
+            )
             logger.info("Task scheduler started successfully")
         except Exception as e:
             logger.error(f"Failed to setup scheduler: {e}")
@@ -65,32 +87,7 @@ class TaskManager:
             str: Task ID
         """
         try:
-            # Prepare task document
-            task_doc = {
-                'task': task_data.get('task', '').strip(),
-                'assignee': task_data.get('assignee', 'TBD').strip(),
-                'priority': task_data.get('priority', 'medium').lower(),
-                'context': task_data.get('context', '').strip(),
-                'status': 'pending',
-                'meeting_id': meeting_id,
-                'transcript_id': task_data.get('transcript_id'),
-                'suggested_deadline': task_data.get('suggested_deadline'),
-                'actual_deadline': task_data.get('actual_deadline'),
-                'created_at': datetime.utcnow(),
-                'updated_at': datetime.utcnow()
-            }
-            
-            # Validate required fields
-            if not task_doc['task']:
-                raise ValueError("Task description is required")
-            
-            # Set actual deadline if not provided
-            if not task_doc['actual_deadline'] and task_doc['suggested_deadline']:
-                task_doc['actual_deadline'] = task_doc['suggested_deadline']
-            elif not task_doc['actual_deadline']:
-                # Default to 7 days from now
-                default_deadline = datetime.utcnow() + timedelta(days=7)
-                task_doc['actual_deadline'] = default_deadline.strftime('%Y-%m-%d')
+            task_doc = self._prepare_task_doc(task_data, meeting_id)
             
             # Save to database
             task_id = self.db_manager.save_task(task_doc)
@@ -105,6 +102,49 @@ class TaskManager:
             logger.error(f"Error creating task: {e}")
             raise
     
+    def _prepare_task_doc(self, task_data: Dict, meeting_id: str = None) -> Dict:
+        """
+        Build and validate a task document
+        
+        Args:
+            task_data: Dictionary containing task information
+            meeting_id: Optional meeting ID this task belongs to
+            
+        Returns:
+            Task document ready to insert
+            
+        Raises:
+            ValueError: If the task description is missing
+        """
+        # Prepare task document
+        task_doc = {
+            'task': task_data.get('task', '').strip(),
+            'assignee': task_data.get('assignee', 'TBD').strip(),
+            'priority': task_data.get('priority', 'medium').lower(),
+            'context': task_data.get('context', '').strip(),
+            'status': 'pending',
+            'meeting_id': meeting_id,
+            'transcript_id': task_data.get('transcript_id'),
+            'suggested_deadline': task_data.get('suggested_deadline'),
+            'actual_deadline': task_data.get('actual_deadline'),
+            'created_at': datetime.utcnow(),
+            'updated_at': datetime.utcnow()
+        }
+        
+        # Validate required fields
+        if not task_doc['task']:
+            raise ValueError("Task description is required")
+        
+        # Set actual deadline if not provided
+        if not task_doc['actual_deadline'] and task_doc['suggested_deadline']:
+            task_doc['actual_deadline'] = task_doc['suggested_deadline']
+        elif not task_doc['actual_deadline']:
+            # Default to 7 days from now
+            default_deadline = datetime.utcnow() + timedelta(days=7)
+            task_doc['actual_deadline'] = default_deadline.strftime('%Y-%m-%d')
+        
+        return task_doc
+    
     def create_tasks_from_action_items(self, action_items: List[Dict], meeting_id: str = None, transcript_id: str = None) -> List[str]:
         """
         Create multiple tasks from action items
@@ -117,29 +157,61 @@ class TaskManager:
         Returns:
             List of created task IDs
         """
-        task_ids = []
+        task_data = [
+            {
+                'task': item.get('task', ''),
+                'assignee': item.get('assignee', 'TBD'),
+                'priority': item.get('priority', 'medium'),
+                'context': item.get('context', ''),
+                'suggested_deadline': item.get('suggested_deadline'),
+                'transcript_id': transcript_id
+            }
+            for item in action_items
+        ]
+        results = self.create_tasks_bulk(task_data, meeting_id)
         
-        for item in action_items:
-            try:
-                task_data = {
-                    'task': item.get('task', ''),
-                    'assignee': item.get('assignee', 'TBD'),
-                    'priority': item.get('priority', 'medium'),
-                    'context': item.get('context', ''),
-                    'suggested_deadline': item.get('suggested_deadline'),
-                    'transcript_id': transcript_id
-                }
-                
-                task_id = self.create_task(task_data, meeting_id)
-                task_ids.append(task_id)
-                
-            except Exception as e:
-                logger.error(f"Error creating task from action item: {e}")
-                continue
+        for index, result in enumerate(results):
+            if result['error']:
+                logger.error(f"Error creating task from action item {index}: {result['error']}")
         
+        task_ids = [result['task_id'] for result in results if result['task_id']]
         logger.info(f"Created {len(task_ids)} tasks from action items")
         return task_ids
     
+    def create_tasks_bulk(self, tasks: List[Dict], meeting_id: str = None) -> List[Dict]:
+        """
+        Create many tasks with one database round trip
+        
+        Every item is validated first; valid ones are inserted together with
+        insert_many(ordered=False) and their reminders scheduled in one batch.
+        
+        Args:
+            tasks: List of task dictionaries (as for create_task)
+            meeting_id: Optional meeting ID for all tasks
+            
+        Returns:
+            List aligned with `tasks` of dictionaries with 'task_id' (None on
+            failure) and 'error' (None on success)
+        """
+        results = [{'task_id': None, 'error': None} for _ in tasks]
+        documents = []
+        positions = []
+        for index, task_data in enumerate(tasks):
+            try:
+                documents.append(self._prepare_task_doc(task_data, meeting_id))
+                positions.append(index)
+            except Exception as e:
+                results[index]['error'] = str(e)
+        
+        saved = []
+        for index, document, result in zip(positions, documents, self.db_manager.save_tasks(documents)):
+            results[index] = result
+            if result['task_id']:
+                saved.append((result['task_id'], document))
+        
+        self._schedule_reminders(saved)
+        return results
+    
     def update_task(self, task_id: str, updates: Dict) -> bool:
         """
         Update a task
@@ -152,16 +224,8 @@ class TaskManager:
             bool: True if update was successful
         """
         try:
-            updates['updated_at'] = datetime.utcnow()
-            
-            # Update in database
-            collection = self.db_manager.get_collection('tasks')
-            result = collection.update_one(
-                {'_id': task_id},
-                {'$set': updates}
-            )
-            
-            if result.modified_count > 0:
+            # Update in database (also moves the task between status/assignee counters)
+            if self.db_manager.update_task(task_id, updates):
                 # Reschedule reminders if deadline changed
                 if 'actual_deadline' in updates:
                     self._reschedule_task_reminders(task_id)
@@ -199,10 +263,7 @@ class TaskManager:
             self._cancel_task_reminders(task_id)
             
             # Delete from database
-            collection = self.db_manager.get_collection('tasks')
-            result = collection.delete_one({'_id': task_id})
-            
-            if result.deleted_count > 0:
+            if self.db_manager.delete_task(task_id):
                 logger.info(f"Deleted task: {task_id}")
                 return True
             else:
@@ -215,84 +276,105 @@ class TaskManager:
     
     def get_task(self, task_id: str) -> Optional[Dict]:
         """Get a task by ID"""
-        collection = self.db_manager.get_collection('tasks')
-        return collection.find_one({'_id': task_id})
+        return self.db_manager.get_task(task_id)
     
-    def get_tasks(self, filters: Dict = None) -> List[Dict]:
+    def get_tasks(self, filters: Dict = None, operation: Optional[str] = None,
+                  projection: Optional[List[str]] = None) -> List[Dict]:
         """
         Get tasks with optional filters
         
         Args:
             filters: Optional filters (status, assignee, priority, etc.)
+            operation: Kind of read for read-preference routing ('export', 'dashboard')
+            projection: Fields to return (None for whole documents)
             
         Returns:
             List of task documents
         """
-        collection = self.db_manager.get_collection('tasks')
-        query = filters or {}
-        return list(collection.find(query).sort('created_at', -1))
+        return list(self.db_manager.iter_tasks(filters, projection, operation))
+    
+    def get_tasks_page(self, filters: Dict = None, page_size: int = DEFAULT_PAGE_SIZE,
+                       page_token: Optional[str] = None, projection: Optional[List[str]] = TASK_LIST_FIELDS) -> Dict:
+        """
+        Get one page of tasks, newest first
+        
+        Args:
+            filters: Optional filters (status, assignee, priority, etc.)
+            page_size: Tasks per page
+            page_token: Continuation token from the previous page
+            projection: Fields to return (defaults to the task list fields)
+            
+        Returns:
+            Dictionary with 'items' and 'next_page_token' (None on the last page)
+        """
+        return self.db_manager.get_tasks_page(filters, projection, page_size, page_token)
     
     def get_overdue_tasks(self) -> List[Dict]:
         """Get all overdue tasks"""
-        today = datetime.utcnow().strftime('%Y-%m-%d')
-        collection = self.db_manager.get_collection('tasks')
-        
-        return list(collection.find({
-            'status': {'$in': ['pending', 'in_progress']},
-            'actual_deadline': {'$lt': today}
-        }).sort('actual_deadline', 1))
+        return self.db_manager.get_overdue_tasks()
     
     def get_upcoming_tasks(self, days_ahead: int = 7) -> List[Dict]:
         """Get tasks due within specified days"""
-        today = datetime.utcnow()
-        future_date = (today + timedelta(days=days_ahead)).strftime('%Y-%m-%d')
-        
-        collection = self.db_manager.get_collection('tasks')
-        
-        return list(collection.find({
-            'status': {'$in': ['pending', 'in_progress']},
-            'actual_deadline': {'$gte': today.strftime('%Y-%m-%d'), '$lte': future_date}
-        }).sort('actual_deadline', 1))
+        return self.db_manager.get_upcoming_tasks(days_ahead)
     
     def _schedule_task_reminders(self, task_id: str, task_data: Dict):
         """Schedule reminders for a task"""
-        try:
-            if not task_data.get('actual_deadline'):
-                return
-            
-            deadline = datetime.strptime(task_data['actual_deadline'], '%Y-%m-%d')
-            
-            # Schedule reminder 1 day before deadline
-            reminder_date = deadline - timedelta(days=1)
-            if reminder_date > datetime.utcnow():
-                self.scheduler.add_job(
-                    func=self._send_task_reminder,
-                    trigger=DateTrigger(run_date=reminder_date),
-                    args=[task_id, '1 day before deadline'],
-                    id=f"reminder_1day_{task_id}",
-                    replace_existing=True
-                )
-            
-            # Schedule reminder on deadline day
-            if deadline.date() >= datetime.utcnow().date():
+        self._schedule_reminders([(task_id, task_data)])
+    
+    @staticmethod
+    def _reminder_times(task_data: Dict) -> List[Tuple[str, datetime, str]]:
+        """Reminder job IDs, run times and messages due for a task"""
+        if not task_data.get('actual_deadline'):
+            return []
+        deadline = datetime.strptime(task_data['actual_deadline'], '%Y-%m-%d')
+        reminders = []
+        
+        # Reminder 1 day before deadline
+        reminder_date = deadline - timedelta(days=1)
+        if reminder_date > datetime.utcnow():
+            reminders.append((f"reminder_1day_{deadline:%Y%m%d}", reminder_date, '1 day before deadline'))
+        
+        # Reminder on deadline day
+        if deadline.date() >= datetime.utcnow().date():
+            reminders.append((f"reminder_deadline_{deadline:%Y%m%d}", deadline, 'deadline today'))
+        return reminders
+    
+    def _schedule_reminders(self, tasks: Iterable[Tuple[str, Dict]]):
+        """
+        Schedule reminders for many tasks in one batch
+        
+        Tasks due on the same day share one job per reminder type, so a batch
+        adds a job only for days that have none yet.
+        
+        Args:
+            tasks: (task ID, task document) pairs
+        """
+        new_jobs = {}
+        with self._reminder_lock:
+            for task_id, task_data in tasks:
+                try:
+                    reminders = self._reminder_times(task_data)
+                except Exception as e:
+                    logger.error(f"Error scheduling reminders for task {task_id}: {e}")
+                    continue
+                for job_id, run_date, reminder_type in reminders:
+                    if job_id not in self._reminder_groups:
+                        self._reminder_groups[job_id] = set()
+                        new_jobs[job_id] = (run_date, reminder_type)
+                    self._reminder_groups[job_id].add(str(task_id))
+                    self._task_reminders.setdefault(str(task_id), set()).add(job_id)
+        
+        for job_id, (run_date, reminder_type) in new_jobs.items():
+            try:
                 self.scheduler.add_job(
-                    func=self._send_task_reminder,
-                    trigger=DateTrigger(run_date=deadline),
-                    args=[task_id, 'deadline today'],
-                    id=f"reminder_deadline_{task_id}",
+                    func=self._send_group_reminders,
+                    trigger=DateTrigger(run_date=run_date),
+                    args=[job_id, reminder_type],
+                    id=job_id,
                     replace_existing=True
                 )
-            
-            # Schedule overdue check (daily)
-            self.scheduler.add_job(
-                func=self._check_overdue_tasks,
-                trigger=IntervalTrigger(days=1),
-                id=f"overdue_check_{task_id}",
-                replace_existing=True
-            )
-            
-        except Exception as e:
-            logger.error(f"Error scheduling reminders for task {task_id}: {e}")
+            except Exception as e:
+                logger.error(f"Error scheduling reminder job {job_id}: {e}")
     
     def _reschedule_task_reminders(self, task_id: str):
         """Reschedule reminders when task deadline changes"""
@@ -307,21 +389,38 @@ class TaskManager:
     def _cancel_task_reminders(self, task_id: str):
         """Cancel all reminders for a task"""
         try:
-            job_ids = [
-                f"reminder_1day_{task_id}",
-                f"reminder_deadline_{task_id}",
-                f"overdue_check_{task_id}"
-            ]
+            with self._reminder_lock:
+                job_ids = self._task_reminders.pop(str(task_id), set())
+                empty_jobs = []
+                for job_id in job_ids:
+                    group = self._reminder_groups.get(job_id, set())
+                    group.discard(str(task_id))
+                    if not group:
+                        self._reminder_groups.pop(job_id, None)
+                        empty_jobs.append(job_id)
             
-            for job_id in job_ids:
+            for job_id in empty_jobs:
                 try:
                     self.scheduler.remove_job(job_id)
                 except:
-                    pass  # Job might not exist
+                    pass  # Job might have run already
                     
         except Exception as e:
             logger.error(f"Error canceling reminders for task {task_id}: {e}")
     
+    def _send_group_reminders(self, job_id: str, reminder_type: str):
+        """Send the reminders of every task sharing a reminder job"""
+        with self._reminder_lock:
+            task_ids = self._reminder_groups.pop(job_id, set())
+            for task_id in task_ids:
+                reminders = self._task_reminders.get(task_id)
+                if reminders is not None:
+                    reminders.discard(job_id)
+                    if not reminders:
+                        del self._task_reminders[task_id]
+        for task_id in task_ids:
+            self._send_task_reminder(task_id, reminder_type)
+    
     def _send_task_reminder(self, task_id: str, reminder_type: str):
         """Send a task reminder (currently logs to console)"""
         try:
@@ -346,20 +445,21 @@ class TaskManager:
         except Exception as e:
             logger.error(f"Error checking overdue tasks: {e}")
     
-    def get_task_statistics(self) -> Dict:
-        """Get task statistics"""
-        collection = self.db_manager.get_collection('tasks')
-        
-        stats = {
-            'total_tasks': collection.count_documents({}),
-            'pending_tasks': collection.count_documents({'status': 'pending'}),
-            'in_progress_tasks': collection.count_documents({'status': 'in_progress'}),
-            'completed_tasks': collection.count_documents({'status': 'completed'}),
-            'overdue_tasks': len(self.get_overdue_tasks()),
-            'upcoming_tasks': len(self.get_upcoming_tasks())
-        }
-        
-        return stats
+    def _reconcile_task_stats(self):
+        """Scheduled recount of the task counters"""
+        try:
+            if self.db_manager._connected:
+                self.db_manager.reconcile_task_stats()
+        except Exception as e:
+            logger.error(f"Error reconciling task counters: {e}")
+    
+    def get_assignee_workload(self, operation: Optional[str] = None) -> List[Dict]:
+        """Get pending, in-progress and completed counts per assignee"""
+        return self.db_manager.get_assignee_workload(operation)
+    
+    def get_task_statistics(self, days_ahead: int = 7, operation: Optional[str] = None) -> Dict:
+        """Get task statistics (see DatabaseManager.get_task_statistics)"""
+        return self.db_manager.get_task_statistics(days_ahead, operation)
     
     def shutdown(self):
         """Shutdown the task manager and scheduler"""
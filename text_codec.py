@@ -0,0 +1,76 @@
+"""
+Compression of transcript bodies for storage
+Uses zstd when the zstandard package is installed, zlib otherwise
+"""
+import os
+import zlib
+import logging
+from typing import Dict, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Transcripts compress well at moderate levels; higher levels mostly cost CPU
+ZSTD_LEVEL = int(os.getenv('TRANSCRIPT_ZSTD_LEVEL', '9'))
+ZLIB_LEVEL = 6
+
+
+def default_codec() -> str:
+    """Codec for new bodies: $TRANSCRIPT_CODEC, else zstd if installed, else zlib"""
+    codec = os.getenv('TRANSCRIPT_CODEC', 'zstd' if zstandard is not None else 'zlib').lower()
+    if codec == 'zstd' and zstandard is None:
+        logger.warning("TRANSCRIPT_CODEC=zstd needs the zstandard package; using zlib")
+        return 'zlib'
+    if codec not in ('zstd', 'zlib', 'none'):
+        logger.warning(f"Unknown transcript codec {codec}; using zlib")
+        return 'zlib'
+    return codec
+
+
+def compress_text(text: str, codec: Optional[str] = None) -> Dict:
+    """
+    Compress a transcript body
+
+    Args:
+        text: Transcript text
+        codec: 'zstd', 'zlib' or 'none' (defaults to default_codec())
+
+    Returns:
+        Dictionary with 'codec', 'data' (bytes), 'text_bytes' (UTF-8 size)
+        and 'stored_bytes' (compressed size)
+    """
+    codec = codec or default_codec()
+    raw = text.encode('utf-8')
+    if codec == 'zstd':
+        data = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+    elif codec == 'zlib':
+        data = zlib.compress(raw, ZLIB_LEVEL)
+    else:
+        data = raw
+    return {'codec': codec, 'data': data, 'text_bytes': len(raw), 'stored_bytes': len(data)}
+
+
+def decompress_text(body: Dict) -> str:
+    """
+    Text of a body written by compress_text
+
+    Raises:
+        ValueError: If the body uses a codec this process cannot read
+    """
+    codec, data = body['codec'], bytes(body['data'])
+    if codec == 'zstd':
+        if zstandard is None:
+            raise ValueError("Transcript body is zstd-compressed; install zstandard to read it")
+        # Frames written by compress() carry their content size
+        return zstandard.ZstdDecompressor().decompress(data).decode('utf-8')
+    if codec == 'zlib':
+        return zlib.decompress(data).decode('utf-8')
+    if codec == 'none':
+        return data.decode('utf-8')
+    raise ValueError(f"Unknown transcript codec: {codec}")
@@ -3,16 +3,28 @@ Transcript loader for handling different file types and converting them to text
 Supports JSON, TXT, audio files (WAV, MP3), and video files (MP4, MKV)
 """
 import os
-import json
+import time
+import shutil
 import tempfile
 import logging
-from typing import Dict, List, Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Tuple
 from pathlib import Path
 import speech_recognition as sr
-import whisper
 from moviepy.editor import VideoFileClip
 from pydub import AudioSegment
 import streamlit as st
+import numpy as np
+from json_stream import load_json_transcript
+from segment_store import SegmentStore
+from asr_backends import DEFAULT_PRESET, ASRBackend, get_asr_backend
+from asr_server import BatchedASRServer
+from admission import get_admission_controller, get_processing_estimator, model_family
+from audio_utils import SAMPLE_RATE, PCMScratchFile, decode_audio_to_scratch, decode_channels_to_scratch, probe_media
+from audio_cache import content_hash, get_audio_cache
+from media_store import MEDIA_CHUNK_SIZE, MediaStore, get_media_store
+from vad import compact_speech, detect_speech_regions, frame_features
 
 # Configure FFmpeg path for pydub
 ffmpeg_path = r"C:\FFmpeg\ffmpeg-master-latest-win64-gpl-shared\bin\ffmpeg.exe"
@@ -25,26 +37,240 @@ if os.path.exists(ffmpeg_path):
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Audio containers FFmpeg can decode from a non-seekable pipe
+PIPE_DECODABLE_FORMATS = ['.wav', '.mp3', '.flac', '.aac']
+
+# Long recordings are transcribed in windows of this length, read from a memory-mapped scratch file
+TRANSCRIBE_WINDOW_SECONDS = 600.0
+
+# Window boundaries move back to the quietest frame within this many seconds
+WINDOW_SPLIT_SEARCH_SECONDS = 5.0
+
+# Multi-channel files with up to this many channels are transcribed one channel per speaker
+MAX_SPLIT_CHANNELS = 16
+
+# Channels more correlated than this carry the same mix (ordinary stereo), not separate speakers
+CHANNEL_CORRELATION_LIMIT = 0.5
+
 class TranscriptLoader:
     """Handles loading and processing of different file types to extract text"""
     
     def __init__(self):
         """Initialize the transcript loader"""
         self.recognizer = sr.Recognizer()
+        # Admission of the job running on this thread, so nested calls are not admitted twice
+        self._job = threading.local()
+        self.asr_backend: Optional[ASRBackend] = None
+        self._tier_backends: Dict[str, ASRBackend] = {}
         self.whisper_model = None
+        # Concurrent uploads share this instance: one lock guards model loading,
+        # the other serializes inference (Whisper installs decode hooks on the model)
+        self._model_lock = threading.RLock()
+        self._inference_lock = threading.Lock()
+        self.batching_enabled = os.getenv('ASR_BATCHING', 'false').lower() == 'true'
+        # Speed preset: fast, balanced or accurate
+        self.speed_preset = os.getenv('SPEED_PRESET', DEFAULT_PRESET)
+        self.asr_server: Optional[BatchedASRServer] = None
+        self.vad_enabled = os.getenv('VAD_ENABLED', 'true').lower() != 'false'
+        self.window_seconds = float(os.getenv('TRANSCRIBE_WINDOW_SECONDS', TRANSCRIBE_WINDOW_SECONDS))
+        # Keep decoded PCM so re-runs with another model skip decoding
+        self.audio_cache_enabled = os.getenv('AUDIO_CACHE_ENABLED', 'true').lower() != 'false'
+        # Conference-bridge recordings: one speaker per channel
+        self.split_channels = os.getenv('SPLIT_CHANNELS', 'true').lower() != 'false'
+        self.channel_labels = [label.strip() for label in os.getenv('CHANNEL_LABELS', '').split(',') if label.strip()]
+        # Deployment-wide language; skips detection entirely when set
+        self.default_language = os.getenv('TRANSCRIPT_LANGUAGE') or None
         self.supported_audio_formats = ['.wav', '.mp3', '.m4a', '.flac', '.aac']
         self.supported_video_formats = ['.mp4', '.mkv', '.avi', '.mov', '.wmv']
         self.supported_text_formats = ['.txt', '.json']
     
-    def load_whisper_model(self, model_size: str = "base"):
-        """Load Whisper model for speech recognition"""
+    def load_whisper_model(self, model_size: str = "base", backend: Optional[str] = None,
+                           preset: Optional[str] = None, **backend_options):
+        """
+        Load a speech recognition model
+        
+        Args:
+            model_size: Model size to load
+            backend: ASR backend name ('whisper', 'faster_whisper', 'null'); defaults to $ASR_BACKEND
+            preset: Speed preset ('fast', 'balanced', 'accurate'); defaults to the loader's preset
+            **backend_options: Backend-specific options (e.g. compute_type='int8')
+        """
         try:
-            self.whisper_model = whisper.load_model(model_size)
-            logger.info(f"Loaded Whisper model: {model_size}")
+            asr_backend = get_asr_backend(backend, model_size, **backend_options)
+            asr_backend.apply_preset(preset or self.speed_preset)
+            with self._model_lock:
+                self.speed_preset = asr_backend.preset
+                current = self.asr_backend
+                if (current is not None and current.is_loaded and not backend_options
+                        and current.describe() == asr_backend.describe()):
+                    # Same model already loaded; avoid reloading weights on every status check
+                    self._apply_decode_preset(current, asr_backend.preset)
+                    return
+
+                asr_backend.load()
+                self.set_asr_backend(asr_backend)
         except Exception as e:
             logger.error(f"Failed to load Whisper model: {e}")
             raise
     
+    def set_speed_preset(self, preset: str):
+        """
+        Switch the speed preset, reloading the model only if its precision changes
+        
+        Args:
+            preset: 'fast', 'balanced' or 'accurate'
+        """
+        current = self.asr_backend
+        if current is None:
+            self.speed_preset = preset
+            return
+        self.load_whisper_model(current.model_size, current.name, preset=preset)
+    
+    def _apply_decode_preset(self, asr_backend: ASRBackend, preset: str):
+        """Update decoding options and threads of a loaded backend in place"""
+        with self._inference_lock:
+            asr_backend.apply_preset(preset)
+    
+    def set_asr_backend(self, asr_backend: ASRBackend):
+        """Use an already-constructed ASR backend for audio and video files"""
+        with self._model_lock:
+            self.asr_backend = asr_backend
+            self.whisper_model = asr_backend.model
+            self._tier_backends.clear()
+            if self.asr_server is not None:
+                self.asr_server.asr_backend = asr_backend
+        logger.info(f"Using ASR backend: {asr_backend.describe()}")
+    
+    def get_asr_server(self) -> BatchedASRServer:
+        """
+        Batched inference server shared by all jobs on this loader, started on first use
+        
+        Returns:
+            BatchedASRServer wrapping the current ASR backend
+        """
+        with self._model_lock:
+            if self.asr_server is None:
+                self.asr_server = BatchedASRServer(self.asr_backend, inference_lock=self._inference_lock)
+                self.asr_server.start()
+            return self.asr_server
+    
+    def _tier_backend(self, model_size: str) -> ASRBackend:
+        """Smaller model of the same backend for down-tiered jobs, loaded once"""
+        with self._model_lock:
+            asr_backend = self._tier_backends.get(model_size)
+            if asr_backend is None:
+                asr_backend = get_asr_backend(self.asr_backend.name, model_size)
+                asr_backend.apply_preset(self.speed_preset)
+                asr_backend.load()
+                self._tier_backends[model_size] = asr_backend
+            return asr_backend
+    
+    def estimate_processing_time(self, file_path: Optional[str] = None, duration: Optional[float] = None) -> Optional[Dict]:
+        """
+        Predict how long an audio or video file will take to transcribe
+        
+        Args:
+            file_path: Media file to probe (container headers only)
+            duration: Known duration in seconds, instead of probing
+            
+        Returns:
+            Estimate dictionary (see ProcessingEstimator.estimate), or None without an ASR backend
+        """
+        if self.asr_backend is None:
+            return None
+        if duration is None and file_path is not None:
+            duration = self._probe_duration(file_path)
+        return get_processing_estimator().estimate(duration, self.asr_backend, self.speed_preset)
+    
+    def estimate_streamlit_upload(self, uploaded_file) -> Optional[Dict]:
+        """
+        Predict processing time of an upload from its first chunk
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object
+            
+        Returns:
+            Estimate dictionary, or None for text files or without an ASR backend
+        """
+        suffix = Path(uploaded_file.name).suffix.lower()
+        if suffix in self.supported_text_formats or self.asr_backend is None:
+            return None
+        position = uploaded_file.tell()
+        uploaded_file.seek(0)
+        head = uploaded_file.read(MEDIA_CHUNK_SIZE)
+        uploaded_file.seek(position)
+        probe = self._probe_head(head, suffix, uploaded_file.size) or {}
+        return self.estimate_processing_time(duration=probe.get('duration'))
+    
+    def _probe_duration(self, file_path) -> Optional[float]:
+        """Duration from the container headers, or None if the file cannot be probed"""
+        try:
+            return probe_media(file_path)['duration']
+        except Exception as e:
+            logger.warning(f"Could not probe {file_path}: {e}")
+            return None
+    
+    def _probe_head(self, head: bytes, suffix: str, total_size: int) -> Optional[Dict]:
+        """
+        Probe a whole file from its first bytes and total size
+        
+        Returns:
+            Dictionary with the estimated 'duration' (seconds or None) and
+            'channels', or None if the head cannot be probed
+        """
+        with tempfile.NamedTemporaryFile(delete=False, suffix=suffix) as temp_file:
+            temp_file.write(head)
+        try:
+            info = probe_media(temp_file.name)
+        except Exception:
+            return None
+        finally:
+            os.unlink(temp_file.name)
+        # The head is truncated, so scale the header bit rate by the full size
+        duration = total_size * 8 / info['bit_rate'] if info.get('bit_rate') else info.get('duration')
+        return {'duration': duration, 'channels': info.get('channels', 0)}
+    
+    def _run_admitted(self, duration: Optional[float], process) -> Dict:
+        """
+        Run an ASR job under admission control and record its real-time factor
+        
+        Args:
+            duration: Recording length in seconds (None if unknown)
+            process: Callable taking the job's ASR backend (the loaded one, a
+                smaller model if admission down-tiered the job, or None without
+                a model) and returning the loader's result
+            
+        Returns:
+            The job's result with 'estimate' and 'admission' added
+        """
+        admission = getattr(self._job, 'admission', None)
+        if admission is not None:
+            # Already inside an admitted job on this thread
+            return process(self._job.asr_backend)
+        if self.asr_backend is None:
+            # No model to protect
+            return process(None)
+        estimator = get_processing_estimator()
+        estimate = estimator.estimate(duration, self.asr_backend, self.speed_preset)
+        loaded_models = {model_family(self.asr_backend.model_size), *self._tier_backends}
+        admission = get_admission_controller().admit(self.asr_backend.model_size, estimate['estimated_seconds'], loaded_models)
+        try:
+            # Resolved once here and passed down explicitly: worker threads of
+            # the job must use the same backend as the thread that admitted it
+            asr_backend = self._tier_backend(admission.model_size) if admission.down_tiered else self.asr_backend
+            self._job.admission = admission
+            self._job.asr_backend = asr_backend
+            started = time.perf_counter()
+            result = process(asr_backend)
+            estimator.record(asr_backend, self.speed_preset, duration, time.perf_counter() - started)
+        finally:
+            self._job.asr_backend = None
+            self._job.admission = None
+            admission.release()
+        result['estimate'] = estimate
+        result['admission'] = admission.to_dict()
+        return result
+    
     def process_file(self, file_path: str, file_type: str = None) -> Dict:
         """
         Process a file and extract text content
@@ -75,92 +301,357 @@ class TranscriptLoader:
         if file_type == 'text':
             return self._process_text_file(file_path)
         elif file_type == 'audio':
-            return self._process_audio_file(file_path)
+            return self._run_admitted(self._probe_duration(file_path), lambda asr_backend: self._process_audio_file(file_path, asr_backend))
         elif file_type == 'video':
-            return self._process_video_file(file_path)
+            return self._run_admitted(self._probe_duration(file_path), lambda asr_backend: self._process_video_file(file_path, asr_backend))
         else:
             raise ValueError(f"Unsupported file type: {file_type}")
     
     def _process_text_file(self, file_path: Path) -> Dict:
         """Process text files (TXT or JSON)"""
         try:
-            with open(file_path, 'r', encoding='utf-8') as file:
-                if file_path.suffix.lower() == '.json':
-                    data = json.load(file)
-                    # Handle different JSON structures
-                    if isinstance(data, dict):
-                        if 'transcript' in data:
-                            text = data['transcript']
-                        elif 'text' in data:
-                            text = data['text']
-                        elif 'content' in data:
-                            text = data['content']
-                        else:
-                            # If it's a dict but no obvious text field, convert to string
-                            text = json.dumps(data, indent=2)
-                    elif isinstance(data, list):
-                        # Handle list of messages/segments
-                        text = ' '.join([str(item) for item in data])
-                    else:
-                        text = str(data)
-                else:
+            if file_path.suffix.lower() == '.json':
+                # Stream the JSON so large segment exports are never loaded whole
+                parsed = load_json_transcript(file_path)
+                text = parsed['text']
+                segment_store = parsed['segment_store']
+            else:
+                with open(file_path, 'r', encoding='utf-8') as file:
                     text = file.read()
+                segment_store = SegmentStore.from_text(text)
             
             return {
                 'text': text,
                 'file_type': 'text',
                 'file_name': file_path.name,
                 'file_size': file_path.stat().st_size,
-                'processing_method': 'direct_read'
+                'processing_method': 'direct_read',
+                'segment_store': segment_store
             }
         except Exception as e:
             logger.error(f"Error processing text file {file_path}: {e}")
             raise
     
-    def _process_audio_file(self, file_path: Path) -> Dict:
+    def _process_audio_file(self, file_path: Path, asr_backend: Optional[ASRBackend] = None) -> Dict:
         """Process audio files using Whisper or SpeechRecognition"""
         try:
-            # Try Whisper first (more accurate)
-            if self.whisper_model is not None:
-                return self._process_audio_with_whisper(file_path)
+            # Try the local ASR backend first (more accurate, works offline)
+            asr_backend = asr_backend or self.asr_backend
+            if asr_backend is not None:
+                return self._process_audio_with_whisper(file_path, asr_backend)
             else:
                 return self._process_audio_with_speech_recognition(file_path)
         except Exception as e:
             logger.error(f"Error processing audio file {file_path}: {e}")
             raise
     
-    def _process_audio_with_whisper(self, file_path: Path) -> Dict:
-        """Process audio using Whisper"""
+    def _process_audio_with_whisper(self, file_path: Path, asr_backend: Optional[ASRBackend] = None,
+                                    language: Optional[str] = None) -> Dict:
+        """Process audio using the job's ASR backend (the loaded Whisper model by default)"""
         try:
             # Load Whisper model if not already loaded
-            if self.whisper_model is None:
+            if asr_backend is None and self.asr_backend is None:
                 self.load_whisper_model()
+            asr_backend = asr_backend or self.asr_backend
             
-            # Convert to WAV if needed for better Whisper compatibility
-            audio_file = self._convert_to_wav(file_path)
-            
-            # Transcribe audio
-            result = self.whisper_model.transcribe(audio_file)
-            text = result["text"]
-            
-            # Clean up temporary file
-            if audio_file != str(file_path):
-                os.unlink(audio_file)
+            outcome = self._transcribe_channels(file_path, asr_backend, language) if self.split_channels else None
+            if outcome is None:
+                # Decoded PCM is spilled to disk so memory stays flat for multi-hour recordings
+                with self._decode_pcm(file_path) as pcm:
+                    outcome = self._transcribe_pcm(pcm, file_path.name, asr_backend, language)
+            result, vad_report = outcome
             
-            return {
-                'text': text,
-                'file_type': 'audio',
-                'file_name': file_path.name,
-                'file_size': file_path.stat().st_size,
-                'processing_method': 'whisper',
-                'language': result.get('language', 'unknown'),
-                'segments': result.get('segments', [])
-            }
+            return self._build_audio_result(result, file_path.name, file_path.stat().st_size, vad_report, asr_backend)
         except Exception as e:
             logger.error(f"Whisper processing failed for {file_path}: {e}")
             # Don't fallback to speech recognition, just raise the error
             raise ValueError(f"Whisper processing failed: {e}")
     
+    def _transcribe_channels(self, file_path: Path, asr_backend: ASRBackend,
+                             language: Optional[str] = None) -> Optional[Tuple[Dict, Dict]]:
+        """
+        Transcribe a multi-track recording one channel per speaker
+        
+        Channels are decoded in one FFmpeg pass and transcribed in parallel
+        with silence skipped on each; with ASR_BATCHING on, their windows
+        share batched forward passes. Segments are labelled by channel and
+        merged in time order.
+        
+        Args:
+            file_path: Audio file
+            asr_backend: Backend the job was admitted with, shared by every channel
+            language: Optional language code to pin
+            
+        Returns:
+            Tuple of (merged ASR result, VAD report), or None when the file is
+            not a multi-track recording (mono, or channels carrying the same mix)
+        """
+        try:
+            channel_count = probe_media(file_path)['channels']
+        except Exception as e:
+            logger.warning(f"Could not probe {file_path.name}: {e}")
+            return None
+        if not 1 < channel_count <= MAX_SPLIT_CHANNELS:
+            return None
+        
+        channels = decode_channels_to_scratch(file_path, channel_count)
+        try:
+            if not self._channels_are_independent(channels):
+                logger.info(f"{file_path.name}: channels carry the same mix, transcribing the downmix")
+                return None
+            window_length = int(self.window_seconds * SAMPLE_RATE)
+            # Detect the language on the channel with the most signal
+            loudest = max(channels, key=lambda pcm: float(np.mean(pcm[:window_length] ** 2)))
+            language = self._resolve_language(loudest[:window_length], language, asr_backend)
+            with ThreadPoolExecutor(max_workers=channel_count) as executor:
+                outcomes = list(executor.map(
+                    lambda pcm: self._transcribe_pcm(pcm, file_path.name, asr_backend, language, vad=True),
+                    channels
+                ))
+        finally:
+            for pcm in channels:
+                pcm.close()
+        
+        segments = []
+        for channel, (result, _) in enumerate(outcomes):
+            speaker = self._channel_label(channel)
+            for segment in result['segments']:
+                text = segment['text'].strip()
+                if text:
+                    segments.append({'start': segment['start'], 'end': segment['end'], 'text': text, 'speaker': speaker, 'channel': channel})
+        segments.sort(key=lambda segment: (segment['start'], segment['channel']))
+        for index, segment in enumerate(segments):
+            segment['id'] = index
+        
+        reports = [report for _, report in outcomes]
+        vad_report = {
+            'original_seconds': reports[0]['original_seconds'],
+            'channels': channel_count,
+            **{key: round(sum(report[key] for report in reports), 2)
+               for key in ('speech_seconds', 'skipped_seconds', 'speech_regions', 'transcribe_seconds', 'estimated_seconds_saved')}
+        }
+        logger.info(f"{file_path.name}: merged {len(segments)} segments from {channel_count} channels")
+        result = {'text': '', 'segments': segments, 'language': language or outcomes[0][0]['language']}
+        return result, vad_report
+    
+    def _channels_are_independent(self, channels: List[PCMScratchFile], sample_seconds: float = 60.0) -> bool:
+        """True if no two channels are strongly correlated over the opening sample"""
+        sample_length = int(sample_seconds * SAMPLE_RATE)
+        samples = np.stack([pcm[:sample_length] for pcm in channels])
+        active = samples.std(axis=1) > 1e-4
+        if active.sum() < 2:
+            # Only one channel has signal: still one speaker per channel
+            return True
+        correlation = np.abs(np.corrcoef(samples[active]))
+        np.fill_diagonal(correlation, 0.0)
+        return float(correlation.max()) < CHANNEL_CORRELATION_LIMIT
+    
+    def _channel_label(self, channel: int) -> str:
+        """Speaker label for a channel, from CHANNEL_LABELS when configured"""
+        if channel < len(self.channel_labels):
+            return self.channel_labels[channel]
+        return f"Speaker {channel + 1}"
+    
+    def _decode_pcm(self, source, cache_key: Optional[str] = None) -> PCMScratchFile:
+        """
+        Decode media to a PCM scratch file, through the decoded-audio cache when enabled
+        
+        Args:
+            source: Media file path or iterable of encoded bytes
+            cache_key: Content hash of a streamed source
+            
+        Returns:
+            PCMScratchFile (use as a context manager)
+        """
+        if not self.audio_cache_enabled:
+            return decode_audio_to_scratch(source)
+        return get_audio_cache().get_or_decode(source, key=cache_key)
+    
+    def _build_audio_result(self, result: Dict, file_name: str, file_size: int, vad_report: Optional[Dict],
+                            asr_backend: ASRBackend) -> Dict:
+        """Shape an ASR backend result into the loader's result dictionary"""
+        text = result["text"]
+        segments = result.get('segments', [])
+        if any('speaker' in segment for segment in segments):
+            # Speaker-attributed transcript, one labelled turn per line
+            segment_store = SegmentStore.from_segments(segments, separator='\n', label_speakers=True)
+            text = segment_store.text
+        else:
+            segment_store = SegmentStore.from_segments(segments) if segments else SegmentStore.from_text(text)
+        return {
+            'text': text,
+            'file_type': 'audio',
+            'file_name': file_name,
+            'file_size': file_size,
+            'processing_method': asr_backend.name,
+            'model': asr_backend.describe(),
+            'language': result.get('language', 'unknown'),
+            'segments': segments,
+            'segment_store': segment_store,
+            'vad': vad_report
+        }
+    
+    def detect_language(self, pcm, sample_seconds: float = 30.0, speech_only: bool = False,
+                        asr_backend: Optional[ASRBackend] = None) -> str:
+        """
+        Detect the language once from a short representative sample
+        
+        The sample is taken from detected speech, skipping the first tenth of
+        it so greetings and silence at the start do not decide the language.
+        
+        Args:
+            pcm: Mono float32 PCM at 16 kHz
+            sample_seconds: Length of the sample used for detection
+            speech_only: True if `pcm` already contains only speech
+            asr_backend: Backend to detect with (defaults to the loaded one)
+            
+        Returns:
+            Language code such as 'en'
+        """
+        speech_pcm = pcm
+        if not speech_only:
+            regions = detect_speech_regions(pcm, SAMPLE_RATE)
+            if regions:
+                speech_pcm, _ = compact_speech(pcm, regions, SAMPLE_RATE)
+        sample_length = int(sample_seconds * SAMPLE_RATE)
+        offset = min(len(speech_pcm) // 10, max(len(speech_pcm) - sample_length, 0))
+        asr_backend = asr_backend or self.asr_backend
+        start = time.perf_counter()
+        with self._inference_lock:
+            language = asr_backend.detect_language(speech_pcm[offset:offset + sample_length])
+        logger.info(f"Detected language '{language}' in {time.perf_counter() - start:.2f}s")
+        return language
+    
+    def _resolve_language(self, pcm, language: Optional[str], asr_backend: ASRBackend,
+                          speech_only: bool = False) -> Optional[str]:
+        """Pick the language to pin: explicit, deployment default, or detected once"""
+        language = language or self.default_language
+        if language or len(pcm) == 0:
+            return language
+        try:
+            return self.detect_language(pcm, speech_only=speech_only, asr_backend=asr_backend)
+        except NotImplementedError:
+            return None
+    
+    def _transcribe_pcm(self, pcm, source_name: str, asr_backend: ASRBackend, language: Optional[str] = None,
+                        vad: Optional[bool] = None, batched: Optional[bool] = None) -> Tuple[Dict, Optional[Dict]]:
+        """
+        Transcribe decoded PCM window by window, sending only voiced audio when VAD is enabled
+        
+        Only one window is held in memory at a time, so a PCMScratchFile keeps
+        peak memory independent of the recording length. The language is
+        resolved once and pinned for every window.
+        
+        Args:
+            pcm: Mono float32 PCM at 16 kHz, or a PCMScratchFile
+            source_name: File name used in log messages
+            asr_backend: Backend the job was admitted with
+            language: Optional language code to pin
+            vad: Skip silence (defaults to the loader's VAD setting)
+            batched: Route windows through the batched ASR server (defaults to the loader's setting)
+            
+        Returns:
+            Tuple of (ASR result on the original timeline, VAD report or None)
+        """
+        vad = self.vad_enabled if vad is None else vad
+        batched = self.batching_enabled if batched is None else batched
+        total_samples = len(pcm)
+        window_length = max(int(self.window_seconds * SAMPLE_RATE), SAMPLE_RATE)
+        language = self._resolve_language(pcm[:window_length], language, asr_backend)
+        
+        text_parts = []
+        segments = []
+        totals = {'speech_seconds': 0.0, 'speech_regions': 0, 'transcribe_seconds': 0.0}
+        window_start = 0
+        while window_start < total_samples:
+            window_stop = self._window_stop(pcm, window_start, window_length)
+            result = self._transcribe_window(pcm[window_start:window_stop], asr_backend, language, totals, vad, batched)
+            language = language or result.get('language')
+            
+            offset = window_start / SAMPLE_RATE
+            for segment in result.get('segments', []):
+                segment['id'] = len(segments)
+                segment['start'] += offset
+                segment['end'] += offset
+                segments.append(segment)
+            if result['text'].strip():
+                text_parts.append(result['text'].strip())
+            window_start = window_stop
+        
+        result = {'text': ' '.join(text_parts), 'segments': segments, 'language': language or 'unknown'}
+        if not vad:
+            return result, None
+        
+        original_seconds = total_samples / SAMPLE_RATE
+        speech_seconds = totals['speech_seconds']
+        skipped_seconds = max(original_seconds - speech_seconds, 0.0)
+        seconds_per_audio_second = totals['transcribe_seconds'] / speech_seconds if speech_seconds else 0.0
+        vad_report = {
+            'original_seconds': round(original_seconds, 2),
+            'speech_seconds': round(speech_seconds, 2),
+            'skipped_seconds': round(skipped_seconds, 2),
+            'speech_regions': totals['speech_regions'],
+            'transcribe_seconds': round(totals['transcribe_seconds'], 2),
+            # Skipped audio would have cost the same per second as the audio we did transcribe
+            'estimated_seconds_saved': round(skipped_seconds * seconds_per_audio_second, 2)
+        }
+        logger.info(
+            f"VAD for {source_name}: skipped {skipped_seconds:.1f}s of {original_seconds:.1f}s, "
+            f"~{vad_report['estimated_seconds_saved']:.1f}s transcription time saved"
+        )
+        return result, vad_report
+    
+    def _window_stop(self, pcm, window_start: int, window_length: int) -> int:
+        """End of the window starting at `window_start`, moved to a quiet frame so words are not cut"""
+        window_stop = window_start + window_length
+        if window_stop >= len(pcm):
+            return len(pcm)
+        # Search at most the second half of the window, so short windows still advance
+        search_length = min(int(WINDOW_SPLIT_SEARCH_SECONDS * SAMPLE_RATE), window_length // 2)
+        energy_db, _ = frame_features(pcm[window_stop - search_length:window_stop], SAMPLE_RATE)
+        if len(energy_db) == 0:
+            return window_stop
+        frame_length = search_length // len(energy_db)
+        quiet_stop = window_stop - search_length + int(np.argmin(energy_db)) * frame_length
+        return quiet_stop if quiet_stop > window_start else window_stop
+    
+    def _transcribe_window(self, window, asr_backend: ASRBackend, language: Optional[str], totals: Dict,
+                           vad: bool, batched: bool) -> Dict:
+        """
+        Transcribe one in-memory window, compacting it to speech when VAD is enabled
+        
+        Args:
+            window: Mono float32 PCM at 16 kHz
+            asr_backend: Backend the job was admitted with
+            language: Language code to pin, or None
+            totals: Running speech/transcription totals, updated in place
+            vad: Compact the window to detected speech first
+            batched: Route the window through the batched ASR server
+            
+        Returns:
+            ASR result with segment times relative to the window start
+        """
+        if vad:
+            regions = detect_speech_regions(window, SAMPLE_RATE)
+            window, timeline = compact_speech(window, regions, SAMPLE_RATE)
+            totals['speech_regions'] += len(regions)
+        totals['speech_seconds'] += len(window) / SAMPLE_RATE
+        if len(window) == 0:
+            return {'text': '', 'segments': [], 'language': language}
+        
+        start = time.perf_counter()
+        if batched and asr_backend is self.asr_backend:
+            # Windows from concurrent jobs share batched forward passes;
+            # down-tiered jobs run on their own smaller model
+            result = self.get_asr_server().transcribe(window, language=language)
+        else:
+            with self._inference_lock:
+                result = asr_backend.transcribe(window, language=language)
+        totals['transcribe_seconds'] += time.perf_counter() - start
+        if vad:
+            result['segments'] = timeline.remap_segments(result.get('segments', []))
+        return result
+    
     def _process_audio_with_speech_recognition(self, file_path: Path) -> Dict:
         """Process audio using SpeechRecognition library"""
         try:
@@ -184,7 +675,8 @@ class TranscriptLoader:
                 'file_type': 'audio',
                 'file_name': file_path.name,
                 'file_size': file_path.stat().st_size,
-                'processing_method': 'speech_recognition'
+                'processing_method': 'speech_recognition',
+                'segment_store': SegmentStore.from_text(text)
             }
         except sr.UnknownValueError:
             logger.error(f"Could not understand audio in {file_path}")
@@ -193,7 +685,7 @@ class TranscriptLoader:
             logger.error(f"Speech recognition service error: {e}")
             raise ValueError("Speech recognition service unavailable. Please try again later.")
     
-    def _process_video_file(self, file_path: Path) -> Dict:
+    def _process_video_file(self, file_path: Path, asr_backend: Optional[ASRBackend] = None) -> Dict:
         """Process video files by extracting audio first"""
         try:
             # Create temporary audio file
@@ -208,7 +700,7 @@ class TranscriptLoader:
             video.close()
             
             # Process the extracted audio
-            audio_result = self._process_audio_file(Path(temp_audio_path))
+            audio_result = self._process_audio_file(Path(temp_audio_path), asr_backend)
             
             # Clean up temporary file
             os.unlink(temp_audio_path)
@@ -256,9 +748,10 @@ class TranscriptLoader:
             Dictionary containing extracted text and metadata
         """
         try:
-            # Save uploaded file to temporary location
+            # Save uploaded file to temporary location, chunk by chunk
+            uploaded_file.seek(0)
             with tempfile.NamedTemporaryFile(delete=False, suffix=Path(uploaded_file.name).suffix) as temp_file:
-                temp_file.write(uploaded_file.getvalue())
+                shutil.copyfileobj(uploaded_file, temp_file, MEDIA_CHUNK_SIZE)
                 temp_file_path = temp_file.name
             
             # Process the file
@@ -272,6 +765,95 @@ class TranscriptLoader:
             logger.error(f"Error processing uploaded file: {e}")
             raise
     
+    def store_streamlit_upload(self, uploaded_file, media_store: Optional[MediaStore] = None) -> str:
+        """
+        Stream an upload into the media store so it can be reprocessed later
+        
+        Args:
+            uploaded_file: Streamlit uploaded file object
+            media_store: Optional media store (defaults to get_media_store())
+            
+        Returns:
+            str: Media ID of the stored original
+        """
+        media_store = media_store or get_media_store()
+        uploaded_file.seek(0)
+        return media_store.save_stream(
+            uploaded_file,
+            uploaded_file.name,
+            metadata={'content_type': getattr(uploaded_file, 'type', None), 'size': uploaded_file.size}
+        )
+    
+    def process_stored_media(self, media_id: str, media_store: Optional[MediaStore] = None,
+                             language: Optional[str] = None) -> Dict:
+        """
+        Process media straight from the media store
+        
+        Pipe-decodable audio is streamed chunk by chunk into FFmpeg; formats
+        that need seeking (MP4, M4A, ...), multi-track recordings (split per
+        channel) and text files are spooled to a temporary file first.
+        
+        Args:
+            media_id: ID returned by store_streamlit_upload
+            media_store: Optional media store (defaults to get_media_store())
+            language: Optional language code to pin instead of detecting it
+            
+        Returns:
+            Dictionary containing extracted text and metadata
+        """
+        media_store = media_store or get_media_store()
+        info = media_store.get_info(media_id)
+        if info is None:
+            raise ValueError(f"Media not found: {media_id}")
+        file_name = info['filename']
+        file_extension = Path(file_name).suffix.lower()
+        
+        try:
+            if file_extension in PIPE_DECODABLE_FORMATS and self.asr_backend is not None:
+                head = next(iter(media_store.iter_chunks(media_id)), b'')
+                probe = self._probe_head(head, file_extension, info['length']) or {}
+                if self.split_channels and 1 < probe.get('channels', 0) <= MAX_SPLIT_CHANNELS:
+                    # Multi-track recordings are transcribed one channel per speaker
+                    result = self._run_admitted(probe.get('duration'), lambda asr_backend: self._process_stored_channels(
+                        media_store, media_id, info, language, asr_backend))
+                else:
+                    result = self._run_admitted(probe.get('duration'), lambda asr_backend: self._process_stored_audio(
+                        media_store, media_id, info, language, asr_backend))
+            else:
+                temp_file_path = media_store.spool_to_file(media_id, suffix=file_extension)
+                try:
+                    result = self.process_file(temp_file_path)
+                finally:
+                    os.unlink(temp_file_path)
+                result.update({'file_name': file_name, 'file_size': info['length']})
+            
+            result['media_id'] = media_id
+            result['media_store'] = media_store.name
+            return result
+        except Exception as e:
+            logger.error(f"Error processing stored media {media_id}: {e}")
+            raise
+    
+    def _process_stored_audio(self, media_store: MediaStore, media_id: str, info: Dict,
+                              language: Optional[str], asr_backend: ASRBackend) -> Dict:
+        """Transcribe pipe-decodable stored audio without spooling it to a file"""
+        # Hashing the stored chunks is far cheaper than decoding them again
+        cache_key = content_hash(media_store.iter_chunks(media_id)) if self.audio_cache_enabled else None
+        with self._decode_pcm(media_store.iter_chunks(media_id), cache_key) as pcm:
+            result, vad_report = self._transcribe_pcm(pcm, info['filename'], asr_backend, language)
+        return self._build_audio_result(result, info['filename'], info['length'], vad_report, asr_backend)
+    
+    def _process_stored_channels(self, media_store: MediaStore, media_id: str, info: Dict,
+                                 language: Optional[str], asr_backend: ASRBackend) -> Dict:
+        """Transcribe a stored multi-track recording per channel from a spooled copy"""
+        temp_file_path = Path(media_store.spool_to_file(media_id, suffix=Path(info['filename']).suffix.lower()))
+        try:
+            result = self._process_audio_with_whisper(temp_file_path, asr_backend, language)
+        finally:
+            os.unlink(temp_file_path)
+        result.update({'file_name': info['filename'], 'file_size': info['length']})
+        return result
+    
     def validate_file(self, file_path: str) -> bool:
         """
         Validate if file is supported
@@ -0,0 +1,195 @@
+"""
+Lightweight voice activity detection for skipping silence before transcription
+Vectorized energy/speech-band analysis over decoded PCM with NumPy
+"""
+import logging
+from bisect import bisect_right
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SAMPLE_RATE = 16000
+
+# Speech carries most of its energy in the telephone band
+SPEECH_BAND_HZ = (300.0, 3400.0)
+
+
+def _runs(mask: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Start (inclusive) and end (exclusive) indices of True runs in a boolean mask"""
+    padded = np.concatenate(([False], mask, [False]))
+    edges = np.flatnonzero(np.diff(padded.astype(np.int8)))
+    return edges[0::2], edges[1::2]
+
+
+def frame_features(pcm: np.ndarray, sample_rate: int = SAMPLE_RATE, frame_ms: int = 30,
+                   block_frames: int = 4096) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Per-frame loudness and speech-band energy ratio
+
+    Args:
+        pcm: Mono float32 PCM
+        sample_rate: Sample rate of `pcm`
+        frame_ms: Frame length in milliseconds
+        block_frames: Frames analysed per vectorized block
+
+    Returns:
+        Tuple of (energy_db, speech_band_ratio), one value per frame
+    """
+    frame_length = int(sample_rate * frame_ms / 1000)
+    frame_count = len(pcm) // frame_length
+    if frame_count == 0:
+        return np.empty(0, dtype=np.float32), np.empty(0, dtype=np.float32)
+
+    window = np.hanning(frame_length).astype(np.float32)
+    freqs = np.fft.rfftfreq(frame_length, 1.0 / sample_rate)
+    band = (freqs >= SPEECH_BAND_HZ[0]) & (freqs <= SPEECH_BAND_HZ[1])
+    energy_db = np.empty(frame_count, dtype=np.float32)
+    band_ratio = np.empty(frame_count, dtype=np.float32)
+
+    # Work in blocks so the FFT scratch stays small for multi-hour recordings
+    for block_start in range(0, frame_count, block_frames):
+        block_end = min(block_start + block_frames, frame_count)
+        frames = np.asarray(pcm[block_start * frame_length:block_end * frame_length], dtype=np.float32)
+        frames = frames.reshape(block_end - block_start, frame_length)
+        energy_db[block_start:block_end] = 10.0 * np.log10(np.mean(frames ** 2, axis=1) + 1e-10)
+        spectrum = np.abs(np.fft.rfft(frames * window, axis=1)) ** 2
+        band_ratio[block_start:block_end] = spectrum[:, band].sum(axis=1) / (spectrum.sum(axis=1) + 1e-10)
+
+    return energy_db, band_ratio
+
+
+def detect_speech_regions(pcm: np.ndarray, sample_rate: int = SAMPLE_RATE, frame_ms: int = 30,
+                          threshold_db: Optional[float] = None, min_band_ratio: float = 0.35,
+                          min_speech_ms: int = 250, min_silence_ms: int = 800,
+                          padding_ms: int = 200) -> List[Tuple[int, int]]:
+    """
+    Find regions of likely speech
+
+    A frame is voiced when it is louder than the adaptive threshold (noise
+    floor + 12 dB unless `threshold_db` is given) and enough of its energy is
+    in the speech band. Short gaps are bridged, short blips dropped and the
+    remaining regions padded so word edges are not clipped.
+
+    Args:
+        pcm: Mono float32 PCM
+        sample_rate: Sample rate of `pcm`
+        frame_ms: Analysis frame length
+        threshold_db: Absolute loudness threshold in dBFS (adaptive when None)
+        min_band_ratio: Minimum fraction of energy in 300-3400 Hz
+        min_speech_ms: Voiced runs shorter than this are discarded
+        min_silence_ms: Silent gaps shorter than this are bridged
+        padding_ms: Padding added on both sides of each region
+
+    Returns:
+        List of (start_sample, end_sample) tuples in ascending order
+    """
+    energy_db, band_ratio = frame_features(pcm, sample_rate, frame_ms)
+    if len(energy_db) == 0:
+        return []
+
+    if threshold_db is None:
+        noise_floor = float(np.percentile(energy_db, 10))
+        threshold_db = max(noise_floor + 12.0, -55.0)
+
+    voiced = (energy_db > threshold_db) & (band_ratio >= min_band_ratio)
+
+    # Bridge short silences inside speech
+    starts, ends = _runs(~voiced)
+    max_gap = max(1, min_silence_ms // frame_ms)
+    for start, end in zip(starts, ends):
+        if start > 0 and end < len(voiced) and end - start < max_gap:
+            voiced[start:end] = True
+
+    # Drop blips (clicks, coughs) that are too short to be words
+    starts, ends = _runs(voiced)
+    min_frames = max(1, min_speech_ms // frame_ms)
+    keep = (ends - starts) >= min_frames
+    starts, ends = starts[keep], ends[keep]
+
+    frame_length = int(sample_rate * frame_ms / 1000)
+    padding = int(sample_rate * padding_ms / 1000)
+    regions: List[Tuple[int, int]] = []
+    for start, end in zip(starts * frame_length - padding, ends * frame_length + padding):
+        start, end = max(0, int(start)), min(len(pcm), int(end))
+        if regions and start <= regions[-1][1]:
+            regions[-1] = (regions[-1][0], end)
+        else:
+            regions.append((start, end))
+    return regions
+
+
+class SpeechTimeline:
+    """Maps timestamps in compacted (speech-only) audio back to the original recording"""
+
+    def __init__(self, regions: List[Tuple[int, int]], sample_rate: int = SAMPLE_RATE, gap_samples: int = 0):
+        """
+        Initialize the mapping
+
+        Args:
+            regions: Speech regions in original samples
+            sample_rate: Sample rate of both timelines
+            gap_samples: Silence inserted between regions in the compacted audio
+        """
+        self.sample_rate = sample_rate
+        self.original_starts: List[float] = []
+        self.compact_starts: List[float] = []
+        self.lengths: List[float] = []
+        compact = 0
+        for start, end in regions:
+            self.original_starts.append(start / sample_rate)
+            self.compact_starts.append(compact / sample_rate)
+            self.lengths.append((end - start) / sample_rate)
+            compact += (end - start) + gap_samples
+
+    def to_original(self, seconds: float) -> float:
+        """Convert a compacted-audio timestamp to the original timeline"""
+        if not self.compact_starts:
+            return seconds
+        index = max(bisect_right(self.compact_starts, seconds) - 1, 0)
+        # Times that fall in an inserted gap snap to the end of the region
+        offset = min(seconds - self.compact_starts[index], self.lengths[index])
+        return self.original_starts[index] + max(offset, 0.0)
+
+    def remap_segments(self, segments: List[Dict]) -> List[Dict]:
+        """Return copies of ASR segments with start/end on the original timeline"""
+        remapped = []
+        for segment in segments:
+            segment = dict(segment)
+            start = segment.get('start', 0.0)
+            end = segment.get('end', start)
+            segment['start'] = self.to_original(start)
+            segment['end'] = self.to_original(end)
+            remapped.append(segment)
+        return remapped
+
+
+def compact_speech(pcm: np.ndarray, regions: List[Tuple[int, int]], sample_rate: int = SAMPLE_RATE,
+                   gap_ms: int = 300) -> Tuple[np.ndarray, SpeechTimeline]:
+    """
+    Concatenate speech regions into one buffer for a single ASR pass
+
+    Args:
+        pcm: Original mono PCM
+        regions: Speech regions from detect_speech_regions
+        sample_rate: Sample rate of `pcm`
+        gap_ms: Silence inserted between regions so words do not run together
+
+    Returns:
+        Tuple of (compacted PCM, SpeechTimeline for remapping timestamps)
+    """
+    gap_samples = int(sample_rate * gap_ms / 1000)
+    timeline = SpeechTimeline(regions, sample_rate, gap_samples)
+    if not regions:
+        return np.empty(0, dtype=np.float32), timeline
+
+    gap = np.zeros(gap_samples, dtype=np.float32)
+    pieces = []
+    for start, end in regions:
+        if pieces:
+            pieces.append(gap)
+        pieces.append(pcm[start:end])
+    return np.concatenate(pieces).astype(np.float32, copy=False), timeline
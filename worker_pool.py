@@ -0,0 +1,249 @@
+"""
+Pre-fork transcription worker pool
+The parent loads the ASR model once and forks workers that share the weights copy-on-write
+"""
+import os
+import gc
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from transcript_loader import get_transcript_loader
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+
+def process_memory_mb(pid: Optional[int] = None) -> Dict[str, Optional[float]]:
+    """
+    Resident, proportional and unique memory of a process in MB
+
+    USS (private pages) is what a worker adds on top of the pages it still
+    shares with the parent; PSS splits shared pages evenly between sharers.
+    Only available on Linux (values are None elsewhere).
+
+    Args:
+        pid: Process ID (defaults to the current process)
+
+    Returns:
+        Dictionary with 'rss_mb', 'pss_mb' and 'uss_mb'
+    """
+    report = {'rss_mb': None, 'pss_mb': None, 'uss_mb': None}
+    try:
+        with open(f"/proc/{pid or os.getpid()}/smaps_rollup") as smaps:
+            fields = {}
+            for line in smaps:
+                parts = line.split()
+                if len(parts) == 3 and parts[2] == 'kB':
+                    fields[parts[0].rstrip(':')] = int(parts[1]) / 1024
+    except OSError:
+        return report
+    report['rss_mb'] = fields.get('Rss')
+    report['pss_mb'] = fields.get('Pss')
+    report['uss_mb'] = fields.get('Private_Clean', 0.0) + fields.get('Private_Dirty', 0.0)
+    return report
+
+
+def _worker_main(tasks, results, threads: int):
+    """Worker body: transcribe jobs with the model inherited from the parent"""
+    if threads:
+        try:
+            import torch
+            torch.set_num_threads(threads)
+        except ImportError:
+            pass
+    transcript_loader = get_transcript_loader()
+    default_language = transcript_loader.default_language
+    while True:
+        job = tasks.get()
+        if job is None:
+            break
+        job_id, file_path, language = job
+        try:
+            transcript_loader.default_language = language or default_language
+            result = transcript_loader.process_file(file_path)
+            result['worker'] = {'pid': os.getpid(), **process_memory_mb()}
+            results.put((job_id, result, None))
+        except Exception as e:
+            results.put((job_id, None, str(e)))
+
+
+class TranscriptionWorkerPool:
+    """
+    Pool of forked transcription workers sharing one copy of the model weights
+
+    Weights are loaded in the parent before forking, so every worker maps the
+    same physical pages until it writes to them (which inference does not).
+    Requires the 'fork' start method (Linux/macOS).
+    """
+
+    def __init__(self, workers: Optional[int] = None, model_size: str = "base",
+                 backend: Optional[str] = None, threads_per_worker: Optional[int] = None,
+                 **backend_options):
+        """
+        Initialize the pool without starting workers
+
+        Args:
+            workers: Number of worker processes (defaults to $TRANSCRIBE_WORKERS or 2)
+            model_size: Model size loaded once in the parent
+            backend: ASR backend name; defaults to $ASR_BACKEND
+            threads_per_worker: Intra-op threads per worker (defaults to CPU count / workers)
+            **backend_options: Backend-specific options
+        """
+        self.workers = workers or int(os.getenv('TRANSCRIBE_WORKERS', '2'))
+        self.model_size = model_size
+        self.backend = backend
+        self.backend_options = backend_options
+        self.threads_per_worker = threads_per_worker or max((os.cpu_count() or 1) // self.workers, 1)
+        self._processes: List[multiprocessing.Process] = []
+        self._futures: Dict[int, Future] = {}
+        self._next_job_id = 0
+        self._lock = threading.Lock()
+        self._collector = None
+        self._tasks = None
+        self._results = None
+
+    def start(self):
+        """Load the model in the parent and fork the workers"""
+        if 'fork' not in multiprocessing.get_all_start_methods():
+            raise RuntimeError("Copy-on-write worker pools need the 'fork' start method (not available on Windows)")
+        context = multiprocessing.get_context('fork')
+
+        transcript_loader = get_transcript_loader()
+        transcript_loader.load_whisper_model(self.model_size, self.backend, **self.backend_options)
+        self.parent_memory = process_memory_mb()
+
+        # Move everything allocated so far out of the collector's reach so
+        # garbage collection in the workers does not dirty the shared pages
+        gc.collect()
+        gc.freeze()
+
+        self._tasks = context.Queue()
+        self._results = context.Queue()
+        for _ in range(self.workers):
+            process = context.Process(target=_worker_main, args=(self._tasks, self._results, self.threads_per_worker), daemon=True)
+            process.start()
+            self._processes.append(process)
+        gc.unfreeze()
+
+        self._collector = threading.Thread(target=self._collect_results, daemon=True)
+        self._collector.start()
+        logger.info(
+            f"Started {self.workers} transcription workers sharing {transcript_loader.asr_backend.describe()} "
+            f"(parent RSS {self.parent_memory['rss_mb'] or 0:.0f} MB)"
+        )
+
+    def _collect_results(self):
+        """Route worker results back to the futures of their jobs"""
+        while True:
+            item = self._results.get()
+            if item is None:
+                return
+            job_id, result, error = item
+            with self._lock:
+                future = self._futures.pop(job_id, None)
+            if future is None:
+                continue
+            if error is None:
+                future.set_result(result)
+            else:
+                future.set_exception(RuntimeError(error))
+
+    def submit(self, file_path: str, language: Optional[str] = None) -> Future:
+        """
+        Queue a file for transcription
+
+        Args:
+            file_path: Audio, video or text file path
+            language: Optional language code to pin
+
+        Returns:
+            Future resolving to the loader's result dictionary
+        """
+        if not self._processes:
+            raise RuntimeError("Worker pool is not started")
+        future = Future()
+        with self._lock:
+            job_id = self._next_job_id
+            self._next_job_id += 1
+            self._futures[job_id] = future
+        self._tasks.put((job_id, str(file_path), language))
+        return future
+
+    def map(self, file_paths: List[str]) -> List[Dict]:
+        """Transcribe several files and return results in input order"""
+        futures = [self.submit(file_path) for file_path in file_paths]
+        return [future.result() for future in futures]
+
+    def memory_report(self) -> Dict:
+        """
+        Memory of the parent and each worker
+
+        A worker's USS is its incremental cost: memory not shared with the
+        parent or other workers.
+
+        Returns:
+            Dictionary with 'parent', 'workers' and 'total_uss_mb'
+        """
+        workers = [{'pid': process.pid, **process_memory_mb(process.pid)} for process in self._processes if process.is_alive()]
+        uss = [worker['uss_mb'] for worker in workers if worker['uss_mb'] is not None]
+        return {
+            'parent': process_memory_mb(),
+            'workers': workers,
+            'total_uss_mb': sum(uss) if uss else None
+        }
+
+    def shutdown(self):
+        """Stop the workers after queued jobs finish"""
+        for _ in self._processes:
+            self._tasks.put(None)
+        for process in self._processes:
+            process.join()
+        self._processes = []
+        self._results.put(None)
+        self._collector.join()
+
+    def __enter__(self) -> 'TranscriptionWorkerPool':
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.shutdown()
+
+
+def main():
+    """Transcribe files in a pre-fork pool: python worker_pool.py <files...> [--workers N] [--model base]"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Pre-fork transcription worker pool")
+    parser.add_argument('files', nargs='+')
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--model', default='base')
+    parser.add_argument('--backend', default=None)
+    args = parser.parse_args()
+
+    with TranscriptionWorkerPool(args.workers, args.model, args.backend) as pool:
+        futures = {file_path: pool.submit(file_path) for file_path in args.files}
+        for file_path, future in futures.items():
+            try:
+                result = future.result()
+                worker = result['worker']
+                print(f"✅ {file_path}: {len(result['text'])} characters (worker {worker['pid']})")
+            except Exception as e:
+                print(f"❌ {file_path}: {e}")
+
+        report = pool.memory_report()
+        parent = report['parent']
+        print(f"\n🧠 Parent: RSS {parent['rss_mb'] or 0:.0f} MB")
+        for worker in report['workers']:
+            print(
+                f"   Worker {worker['pid']}: RSS {worker['rss_mb'] or 0:.0f} MB, "
+                f"PSS {worker['pss_mb'] or 0:.0f} MB, incremental (USS) {worker['uss_mb'] or 0:.0f} MB"
+            )
+
+
+if __name__ == "__main__":
+    main()